@@ -0,0 +1,38 @@
+"""
+End-to-end benchmarks for df_to_image (requires Playwright Chromium)
+"""
+
+import pytest
+
+from dataframe2image import df_to_image
+
+from conftest import make_frame
+
+
+@pytest.mark.parametrize("content", ["ascii", "cjk"])
+@pytest.mark.parametrize("theme", ["light", "dark"])
+@pytest.mark.parametrize(
+    "shape", [(20, 5), (500, 10)], ids=lambda s: f"{s[0]}x{s[1]}"
+)
+def test_df_to_image(
+    benchmark, requires_chromium, tmp_path, shape, theme, content
+):
+    df = make_frame(*shape, content=content)
+    output = tmp_path / "table.png"
+    benchmark.group = "df_to_image"
+    benchmark.pedantic(df_to_image, args=(df, output), kwargs={"style": theme},
+                       rounds=3, iterations=1)
+
+
+@pytest.mark.parametrize("offline", [False, True], ids=["default", "offline"])
+def test_offline_capture(benchmark, requires_chromium, tmp_path, offline):
+    df = make_frame(50, 8)
+    output = tmp_path / "table.png"
+    benchmark.group = "offline"
+    benchmark.pedantic(
+        df_to_image,
+        args=(df, output),
+        kwargs={"offline": offline},
+        rounds=3,
+        iterations=1,
+    )
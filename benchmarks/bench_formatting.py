@@ -0,0 +1,68 @@
+"""
+Benchmarks for the pure-Python formatting stages
+"""
+
+import pytest
+
+from dataframe2image.conditional import (
+    ColorScale,
+    Threshold,
+    evaluate_conditional_formats,
+)
+from dataframe2image.core import (
+    contains_chinese_characters,
+    preprocess_dataframe_for_formatting,
+)
+
+from conftest import make_frame
+
+
+@pytest.mark.parametrize(
+    "thousand_separator", [False, True], ids=["plain", "sep"]
+)
+@pytest.mark.parametrize("dtypes", ["numeric", "mixed"])
+@pytest.mark.parametrize(
+    "shape",
+    [(100, 5), (1_000, 10), (10_000, 10), (1_000, 100)],
+    ids=lambda s: f"{s[0]}x{s[1]}",
+)
+def test_preprocess(benchmark, shape, dtypes, thousand_separator):
+    df = make_frame(*shape, dtypes=dtypes)
+    benchmark.group = "preprocess"
+    benchmark(preprocess_dataframe_for_formatting, df, thousand_separator)
+
+
+@pytest.mark.parametrize("content", ["ascii", "cjk"])
+@pytest.mark.parametrize(
+    "shape", [(1_000, 10), (10_000, 10)], ids=lambda s: f"{s[0]}x{s[1]}"
+)
+def test_contains_chinese(benchmark, shape, content):
+    # ASCII frames are the worst case: every cell has to be scanned
+    df = make_frame(*shape, content=content)
+    benchmark.group = "contains_chinese"
+    benchmark(contains_chinese_characters, df)
+
+
+@pytest.mark.parametrize(
+    "shape", [(1_000, 10), (10_000, 10)], ids=lambda s: f"{s[0]}x{s[1]}"
+)
+def test_conditional_formats(benchmark, shape):
+    df = make_frame(*shape, dtypes="numeric")
+    rules = [ColorScale(), Threshold(">", 60_000)]
+    benchmark.group = "conditional_formats"
+    benchmark(evaluate_conditional_formats, df, rules)
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+@pytest.mark.parametrize("workers", [1, 2, 4, 8])
+@pytest.mark.parametrize(
+    "shape", [(1_000, 300), (5_000, 300)], ids=lambda s: f"{s[0]}x{s[1]}"
+)
+def test_preprocess_parallel(benchmark, shape, workers, backend):
+    # 宽表按列并行；与 workers=1 对比得到加速比（加速上限取决于 CPU 核数）
+    df = make_frame(*shape)
+    benchmark.group = f"preprocess_parallel-{shape[0]}x{shape[1]}"
+    # 预热一轮，避免把进程池的启动时间计入结果
+    benchmark.pedantic(preprocess_dataframe_for_formatting, args=(df, True),
+                       kwargs={"workers": workers, "backend": backend},
+                       rounds=3, iterations=1, warmup_rounds=1)
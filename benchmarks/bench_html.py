@@ -0,0 +1,37 @@
+"""
+Benchmarks for HTML generation
+"""
+
+import pytest
+
+from dataframe2image import df_to_html
+from dataframe2image.core import preprocess_dataframe_for_formatting
+from dataframe2image.styles import THEMES
+from dataframe2image.template import render_dataframe_html
+
+from conftest import make_frame
+
+
+@pytest.mark.parametrize("theme", sorted(THEMES))
+@pytest.mark.parametrize(
+    "shape",
+    [(100, 5), (1_000, 10), (10_000, 10)],
+    ids=lambda s: f"{s[0]}x{s[1]}",
+)
+def test_render_html(benchmark, shape, theme):
+    df = preprocess_dataframe_for_formatting(make_frame(*shape), True)
+    benchmark.group = "render_html"
+    benchmark(render_dataframe_html, df, THEMES[theme])
+
+
+@pytest.mark.parametrize("content", ["ascii", "cjk"])
+@pytest.mark.parametrize(
+    "thousand_separator", [False, True], ids=["plain", "sep"]
+)
+@pytest.mark.parametrize(
+    "shape", [(1_000, 10), (1_000, 50)], ids=lambda s: f"{s[0]}x{s[1]}"
+)
+def test_df_to_html(benchmark, shape, thousand_separator, content):
+    df = make_frame(*shape, content=content)
+    benchmark.group = "df_to_html"
+    benchmark(df_to_html, df, thousand_separator=thousand_separator)
@@ -0,0 +1,28 @@
+"""
+Benchmarks for package import time
+
+Each round starts a fresh interpreter, so the numbers include interpreter
+startup; compare them against ``test_python_startup``.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+
+def _run(code):
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_python_startup(benchmark):
+    benchmark.pedantic(_run, args=("pass",), rounds=10, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("statement", [
+    "import dataframe2image",
+    "import dataframe2image.cli",
+    "from dataframe2image import df_to_html",
+], ids=["package", "cli", "df_to_html"])
+def test_import(benchmark, statement):
+    benchmark.pedantic(_run, args=(statement,), rounds=10, warmup_rounds=1)
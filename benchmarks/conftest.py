@@ -0,0 +1,83 @@
+"""
+Shared fixtures for the benchmark suite
+
+Run with ``make bench``; see benchmarks/README.md.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+CJK_WORDS = ["产品", "销售额", "华东地区", "库存", "北京", "上海", "季度报告", "利润"]
+ASCII_WORDS = [
+    "product",
+    "revenue",
+    "east",
+    "stock",
+    "london",
+    "tokyo",
+    "report",
+    "margin",
+]
+
+
+def make_frame(
+    rows: int,
+    cols: int,
+    dtypes: str = "mixed",
+    content: str = "ascii",
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Build a deterministic DataFrame for benchmarking.
+
+    Args:
+        rows: Number of rows
+        cols: Number of columns
+        dtypes: 'numeric' (ints and floats) or 'mixed' (ints, floats, strings,
+                categories, NaN and year-like values)
+        content: 'ascii' or 'cjk' text in string columns and column names
+    """
+    rng = np.random.default_rng(seed)
+    words = CJK_WORDS if content == "cjk" else ASCII_WORDS
+    data = {}
+    for j in range(cols):
+        name = f"{words[j % len(words)]}_{j}"
+        kind = j % 6 if dtypes == "mixed" else j % 2
+        if kind == 0:
+            values = rng.integers(0, 10_000_000, rows)
+        elif kind == 1:
+            values = rng.normal(50_000, 20_000, rows).round(2)
+        elif kind == 2:
+            values = np.array(words, dtype=object)[
+                rng.integers(0, len(words), rows)
+            ]
+        elif kind == 3:
+            values = pd.Categorical(rng.choice([1500, 2500, 3500], rows))
+        elif kind == 4:
+            values = rng.normal(1_000, 5_000, rows)
+            values[rng.random(rows) < 0.2] = np.nan
+        else:
+            name = f"year_{j}"
+            values = rng.integers(1990, 2030, rows)
+        data[name] = values
+    return pd.DataFrame(data)
+
+
+def _chromium_available() -> bool:
+    try:
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as p:
+            return os.path.exists(p.chromium.executable_path)
+    except Exception:
+        return False
+
+
+@pytest.fixture(scope="session")
+def requires_chromium():
+    """Skip end-to-end benchmarks when no Playwright Chromium is installed."""
+    if not _chromium_available():
+        pytest.skip("Playwright Chromium is not installed")
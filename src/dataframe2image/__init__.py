@@ -2,8 +2,94 @@
 dataframe2image - Convert pandas DataFrame to beautiful table images
 """
 
-from .core import df_to_image, df_to_html, get_chinese_fonts
+from typing import TYPE_CHECKING, Any, List
+
+from .exceptions import (
+    BrowserCrashedError,
+    BudgetExceededError,
+    CaptureError,
+    HTMLRenderError,
+    RenderError,
+    RenderTimeoutError,
+)
+from .stats import RenderStats
 from .styles import TableStyle
 
+if TYPE_CHECKING:
+    from .conditional import ColorScale, DataBar, Threshold
+    from .core import (
+        df_to_html,
+        df_to_image,
+        df_to_pixels,
+        dfs_to_images,
+        get_chinese_fonts,
+    )
+    from .layout import layout_to_html, render_layout
+    from .outputs import OutputSpec
+    from .planning import RenderBudget, RenderPlan, plan_render
+    from .postprocess import Background, Border, Watermark
+
 __version__ = "0.1.0"
-__all__ = ["df_to_image", "df_to_html", "get_chinese_fonts", "TableStyle"]
+__all__ = [
+    "df_to_image",
+    "df_to_html",
+    "dfs_to_images",
+    "get_chinese_fonts",
+    "TableStyle",
+    "OutputSpec",
+    "ColorScale",
+    "DataBar",
+    "Threshold",
+    "RenderStats",
+    "RenderError",
+    "HTMLRenderError",
+    "CaptureError",
+    "BrowserCrashedError",
+    "RenderTimeoutError",
+    "plan_render",
+    "RenderPlan",
+    "RenderBudget",
+    "BudgetExceededError",
+    "render_layout",
+    "layout_to_html",
+    "df_to_pixels",
+    "Watermark",
+    "Border",
+    "Background",
+]
+
+# pandas/numpy、Playwright、Jinja2 和 Pillow 在首次访问时才导入，保持 import 轻量
+_LAZY_ATTRS = {
+    "df_to_image": ".core",
+    "df_to_html": ".core",
+    "dfs_to_images": ".core",
+    "get_chinese_fonts": ".core",
+    "df_to_pixels": ".core",
+    "OutputSpec": ".outputs",
+    "ColorScale": ".conditional",
+    "DataBar": ".conditional",
+    "Threshold": ".conditional",
+    "plan_render": ".planning",
+    "RenderPlan": ".planning",
+    "RenderBudget": ".planning",
+    "render_layout": ".layout",
+    "layout_to_html": ".layout",
+    "Watermark": ".postprocess",
+    "Border": ".postprocess",
+    "Background": ".postprocess",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
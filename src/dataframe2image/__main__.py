@@ -0,0 +1,9 @@
+"""
+Allow ``python -m dataframe2image`` as an alias of the console script
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,507 @@
+"""
+Command-line renderer for CSV/Parquet files
+
+Example:
+    dataframe2image data/*.csv -o images/ --style blue --jobs 4 --max-rows 50
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
+
+from .styles import THEMES
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .renderer import Renderer
+
+CSV_SUFFIXES = {".csv", ".tsv", ".txt"}
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+
+
+@dataclass
+class FileResult:
+    """
+    Outcome of rendering one image from an input file.
+
+    ``error`` is set when the input failed; ``skipped`` explains why an input
+    produced no image without failing (e.g. a header-only file).
+    """
+
+    source: str
+    output: Optional[str]
+    seconds: float
+    rows: int = 0
+    error: Optional[str] = None
+    skipped: Optional[str] = None
+
+
+def expand_inputs(
+    patterns: Sequence[str], unmatched: Optional[List[str]] = None
+) -> List[Path]:
+    """
+    Expand files, directories and glob patterns into a sorted list of inputs.
+
+    Globs and directories that yield no input file are appended to
+    ``unmatched`` when it is given.
+    """
+    paths: List[Path] = []
+    for pattern in patterns:
+        has_magic = any(ch in pattern for ch in "*?[")
+        matches = (
+            sorted(glob.glob(pattern, recursive=True))
+            if has_magic
+            else [pattern]
+        )
+        found = len(paths)
+        for match in matches:
+            path = Path(match)
+            if path.is_dir():
+                paths.extend(
+                    p for p in sorted(path.iterdir())
+                    if p.suffix.lower() in CSV_SUFFIXES | PARQUET_SUFFIXES
+                )
+            else:
+                paths.append(path)
+        if unmatched is not None and len(paths) == found:
+            unmatched.append(pattern)
+    # 去重并保持顺序
+    return list(dict.fromkeys(paths))
+
+
+def iter_frames(
+    path: Path,
+    columns: Optional[List[str]] = None,
+    max_rows: Optional[int] = None,
+    rows_per_image: Optional[int] = None,
+    sep: Optional[str] = None,
+    encoding: Optional[str] = None
+) -> Iterator["pd.DataFrame"]:
+    """
+    Stream a CSV/Parquet file as DataFrames of at most ``rows_per_image`` rows.
+
+    Only the selected ``columns`` and the first ``max_rows`` rows are read, so
+    large extracts never have to be loaded in full.
+    """
+    import pandas as pd
+
+    suffix = path.suffix.lower()
+    if suffix in PARQUET_SUFFIXES:
+        yield from _iter_parquet(path, columns, max_rows, rows_per_image)
+        return
+
+    if sep is None:
+        sep = "\t" if suffix == ".tsv" else ","
+    if rows_per_image is None:
+        yield pd.read_csv(
+            path, sep=sep, encoding=encoding, usecols=columns, nrows=max_rows
+        )
+        return
+    with pd.read_csv(
+        path, sep=sep, encoding=encoding, usecols=columns, nrows=max_rows,
+        chunksize=rows_per_image
+    ) as reader:
+        yield from reader
+
+
+def _iter_parquet(
+    path: Path,
+    columns: Optional[List[str]],
+    max_rows: Optional[int],
+    rows_per_image: Optional[int]
+) -> Iterator["pd.DataFrame"]:
+    import pandas as pd
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        # 没有 pyarrow 时退化为一次性读取
+        df = pd.read_parquet(path, columns=columns)
+        if max_rows is not None:
+            df = df.head(max_rows)
+        step = rows_per_image or max(len(df), 1)
+        for start in range(0, len(df), step):
+            yield df.iloc[start:start + step]
+        return
+
+    parquet_file = pq.ParquetFile(path)
+    remaining = max_rows
+    batch_size = rows_per_image or 65536
+    pending = []
+    for batch in parquet_file.iter_batches(
+        batch_size=batch_size, columns=columns
+    ):
+        chunk = batch.to_pandas()
+        if remaining is not None:
+            chunk = chunk.head(remaining)
+            remaining -= len(chunk)
+        if rows_per_image is None:
+            pending.append(chunk)
+        else:
+            yield chunk
+        if remaining is not None and remaining <= 0:
+            break
+    if rows_per_image is None and pending:
+        yield pd.concat(pending, ignore_index=True)
+
+
+def output_stems(sources: Sequence[Path]) -> Dict[Path, str]:
+    """
+    Pick an output file stem per input so that no two inputs share one.
+
+    Inputs are named after their stem. Inputs sharing a stem get the input
+    suffix (``x_csv``, ``x_parquet``), then their directory relative to the
+    group's common parent (``a_x``, ``b_x``), then both, whichever level first
+    tells the group apart.
+    """
+    groups: Dict[str, List[Path]] = {}
+    for source in sources:
+        groups.setdefault(source.stem, []).append(source)
+
+    stems: Dict[Path, str] = {}
+    for stem, group in groups.items():
+        if len(group) == 1:
+            stems[group[0]] = stem
+            continue
+        parents = [source.resolve().parent for source in group]
+        common = Path(os.path.commonpath(parents))
+        levels = []
+        for source, parent in zip(group, parents):
+            suffixed = f"{stem}_{source.suffix.lstrip('.')}"
+            dirs = parent.relative_to(common).parts
+            levels.append(
+                [
+                    stem,
+                    suffixed,
+                    "_".join(dirs + (stem,)),
+                    "_".join(dirs + (suffixed,)),
+                ]
+            )
+        level = next(
+            (
+                i
+                for i in range(4)
+                if len({names[i] for names in levels}) == len(group)
+            ),
+            3,
+        )
+        for source, names in zip(group, levels):
+            stems[source] = names[level]
+    return stems
+
+
+def _output_path(
+    stem: str, output_dir: Path, format: str, part: Optional[int]
+) -> Path:
+    suffix = "jpg" if format == "jpeg" else format
+    if part is not None:
+        stem = f"{stem}_part{part:03d}"
+    return output_dir / f"{stem}.{suffix}"
+
+
+async def _render_one(renderer: "Renderer", df: "pd.DataFrame", source: Path,
+                      output: Path, args: argparse.Namespace) -> FileResult:
+    start = time.perf_counter()
+    try:
+        await renderer.render(
+            df,
+            output,
+            style=args.style,
+            width=args.width,
+            height=args.height,
+            format=args.format,
+            show_index=args.index,
+            thousand_separator=args.thousand_separator,
+            device_scale_factor=args.scale,
+        )
+    except Exception as e:
+        return FileResult(
+            str(source),
+            str(output),
+            time.perf_counter() - start,
+            len(df),
+            str(e),
+        )
+    return FileResult(
+        str(source), str(output), time.perf_counter() - start, len(df)
+    )
+
+
+async def run(args: argparse.Namespace) -> List[FileResult]:
+    """Render every input file and return one result per produced image."""
+    # 延迟导入：--help 和参数错误不需要加载 pandas/Playwright
+    import pandas as pd
+
+    from .renderer import Renderer
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    columns = args.columns.split(",") if args.columns else None
+
+    results: List[FileResult] = []
+    tasks = set()
+    # 同时在途的任务数受 jobs 限制，读取下一块数据前先等待空位，保证内存有界
+    slots = asyncio.Semaphore(args.jobs)
+
+    async def _tracked(coro: Awaitable[FileResult]) -> None:
+        try:
+            results.append(await coro)
+        finally:
+            slots.release()
+
+    renderer = Renderer(
+        max_concurrency=args.jobs,
+        max_pages_per_browser=args.recycle_pages,
+        max_browser_rss_mb=args.max_rss_mb,
+        offline=args.offline,
+    )
+    unmatched: List[str] = []
+    sources = expand_inputs(args.inputs, unmatched)
+    for pattern in unmatched:
+        results.append(
+            FileResult(
+                pattern, None, 0.0, error="No input files match this pattern"
+            )
+        )
+
+    stems = output_stems(sources)
+    # 输出路径 -> 占用它的输入；剩余的重名（如 a_x.csv 与 a/x.csv）记为失败
+    claimed: Dict[Path, Path] = {}
+    loop = asyncio.get_running_loop()
+
+    async with renderer:
+        for source in sources:
+            start = time.perf_counter()
+            rendered = 0
+            try:
+                frames = iter_frames(
+                    source,
+                    columns,
+                    args.max_rows,
+                    args.rows_per_image,
+                    args.sep,
+                    args.encoding,
+                )
+                part = 0
+                while True:
+                    # 读取和解析在线程中进行，不阻塞正在进行的渲染
+                    df = await loop.run_in_executor(None, next, frames, None)
+                    if df is None:
+                        break
+                    part += 1
+                    if df.empty:
+                        continue
+                    rendered += 1
+                    output = _output_path(
+                        stems[source],
+                        output_dir,
+                        args.format,
+                        part if args.rows_per_image else None,
+                    )
+                    owner = claimed.setdefault(output, source)
+                    if owner != source:
+                        results.append(
+                            FileResult(
+                                str(source),
+                                str(output),
+                                0.0,
+                                len(df),
+                                f"Output name collides with {owner}",
+                            )
+                        )
+                        continue
+                    await slots.acquire()
+                    task = asyncio.ensure_future(
+                        _tracked(
+                            _render_one(renderer, df, source, output, args)
+                        )
+                    )
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            except pd.errors.EmptyDataError:
+                pass  # 空文件：下面记为跳过
+            except Exception as e:
+                results.append(
+                    FileResult(
+                        str(source),
+                        None,
+                        time.perf_counter() - start,
+                        error=f"Failed to read: {e}",
+                    )
+                )
+                continue
+            if not rendered:
+                results.append(
+                    FileResult(
+                        str(source),
+                        None,
+                        time.perf_counter() - start,
+                        skipped="No data rows",
+                    )
+                )
+        if tasks:
+            await asyncio.gather(*tasks)
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="dataframe2image",
+        description=(
+            "Render CSV/Parquet files to table images with a warm browser."
+        ),
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="Input files, directories or glob patterns"
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        default=".",
+        help="Directory for the images (default: .)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        default="png",
+        choices=["png", "jpeg", "webp", "pdf", "svg"],
+    )
+    parser.add_argument(
+        "-s",
+        "--style",
+        default="light",
+        choices=sorted(THEMES),
+        help="Theme name",
+    )
+    parser.add_argument("--width", type=int, help="Image width in pixels")
+    parser.add_argument("--height", type=int, help="Image height in pixels")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Device scale factor (2 for HiDPI)",
+    )
+    parser.add_argument(
+        "--no-index",
+        dest="index",
+        action="store_false",
+        help="Hide the DataFrame index",
+    )
+    parser.add_argument(
+        "--thousand-separator",
+        action="store_true",
+        default=None,
+        help="Add thousand separators to numbers",
+    )
+    parser.add_argument(
+        "--columns", help="Comma-separated list of columns to read"
+    )
+    parser.add_argument(
+        "--max-rows", type=int, help="Read at most this many rows per file"
+    )
+    parser.add_argument(
+        "--rows-per-image",
+        type=int,
+        help="Split each file into images of at most this many rows",
+    )
+    parser.add_argument(
+        "--sep", help="CSV field separator (default: ',' or tab for .tsv)"
+    )
+    parser.add_argument("--encoding", help="CSV file encoding")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=4,
+        help="Parallel renders (default: 4)",
+    )
+    parser.add_argument(
+        "--recycle-pages",
+        type=int,
+        help="Restart the browser after this many pages",
+    )
+    parser.add_argument(
+        "--max-rss-mb",
+        type=float,
+        help="Restart the browser above this memory use (MB)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Capture without network access and with lean Chromium flags",
+    )
+    parser.add_argument(
+        "--report", help="Write per-image results as JSON to this file"
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Only print failures"
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Console entry point.
+
+    Returns 1 if any input failed or a pattern matched no files.
+    """
+    args = build_parser().parse_args(argv)
+    if args.jobs < 1:
+        print("error: --jobs must be at least 1", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        results = asyncio.run(run(args))
+    except Exception as e:
+        # 浏览器无法启动等全局错误
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+
+    failures = [r for r in results if r.error]
+    skipped = [r for r in results if r.skipped]
+    for result in results:
+        if result.error:
+            print(f"FAIL {result.source}: {result.error}", file=sys.stderr)
+        elif result.skipped:
+            print(f"SKIP {result.source}: {result.skipped}", file=sys.stderr)
+        elif not args.quiet:
+            print(
+                f"OK   {result.source} -> {result.output} "
+                f"({result.rows} rows, {result.seconds:.2f}s)"
+            )
+    if not args.quiet:
+        succeeded = len(results) - len(failures) - len(skipped)
+        print(
+            f"{succeeded} succeeded, {len(failures)} failed, "
+            f"{len(skipped)} skipped in {elapsed:.2f}s"
+        )
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(
+                [asdict(r) for r in results], f, ensure_ascii=False, indent=2
+            )
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
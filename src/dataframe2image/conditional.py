@@ -0,0 +1,278 @@
+"""
+Conditional formatting rules (color scales, data bars, thresholds)
+
+Rules are evaluated per column with NumPy and mapped to a small, fixed set of
+bucketed CSS classes. The CSS for a rule depends only on the rule itself, so a
+large table carries one short class name per formatted cell instead of an
+inline style, which keeps both the HTML and Chromium's style recalculation
+small.
+"""
+
+import operator
+from dataclasses import dataclass
+from typing import Any, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .styles import validate_css_value
+
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# 选择器需比斑马纹规则 (tr:nth-child(odd) td) 优先级更高
+_CELL_SELECTOR = "tbody tr td.{name}"
+
+
+def _cell_rule(name: str, declarations: str) -> str:
+    return f"{_CELL_SELECTOR.format(name=name)} {{ {declarations} }}"
+
+
+def _parse_hex_color(color: str) -> Tuple[int, int, int]:
+    value = color.lstrip("#")
+    if len(value) == 3:
+        value = "".join(ch * 2 for ch in value)
+    if len(value) != 6:
+        raise ValueError(f"Expected a hex color like '#63be7b', got {color!r}")
+    return int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)
+
+
+def _interpolate_colors(
+    colors: Sequence[str], positions: np.ndarray
+) -> List[str]:
+    """Interpolate evenly spaced hex color stops at ``positions`` in [0, 1]."""
+    stops = np.array([_parse_hex_color(c) for c in colors], dtype=float)
+    anchors = np.linspace(0.0, 1.0, len(stops))
+    channels = [np.interp(positions, anchors, stops[:, i]) for i in range(3)]
+    return [
+        "#{:02x}{:02x}{:02x}".format(*(int(round(ch[k])) for ch in channels))
+        for k in range(len(positions))
+    ]
+
+
+def _numeric_values(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series, errors="coerce").to_numpy(
+        dtype=float, na_value=np.nan
+    )
+
+
+@dataclass
+class ColorScale:
+    """
+    Heatmap-style background color scale.
+
+    Args:
+        columns: Columns to format; None applies to every numeric column
+        colors: Hex color stops from the lowest to the highest value
+        buckets: Number of discrete colors (CSS classes) the scale uses
+        vmin: Value mapped to the first color (column minimum if None)
+        vmax: Value mapped to the last color (column maximum if None)
+    """
+
+    columns: Optional[Sequence[Hashable]] = None
+    colors: Sequence[str] = ("#f8696b", "#ffeb84", "#63be7b")
+    buckets: int = 10
+    vmin: Optional[float] = None
+    vmax: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.buckets < 1:
+            raise ValueError(f"buckets must be at least 1: {self.buckets}")
+        if len(self.colors) < 2:
+            raise ValueError("A color scale needs at least two colors")
+        for color in self.colors:
+            _parse_hex_color(color)
+
+    def css(self, prefix: str) -> List[str]:
+        positions = (np.arange(self.buckets) + 0.5) / self.buckets
+        return [
+            _cell_rule(f"{prefix}-{b}", f"background-color: {color};")
+            for b, color in enumerate(
+                _interpolate_colors(self.colors, positions)
+            )
+        ]
+
+    def buckets_for(self, values: np.ndarray) -> np.ndarray:
+        return _bucketize(values, self.buckets, self.vmin, self.vmax)
+
+
+@dataclass
+class DataBar:
+    """
+    In-cell horizontal bar proportional to the value.
+
+    Args:
+        columns: Columns to format; None applies to every numeric column
+        color: Bar color (any CSS color)
+        buckets: Number of discrete bar lengths (CSS classes)
+        vmin: Value with an empty bar (column minimum if None)
+        vmax: Value with a full bar (column maximum if None)
+    """
+
+    columns: Optional[Sequence[Hashable]] = None
+    color: str = "#9ec5f0"
+    buckets: int = 20
+    vmin: Optional[float] = None
+    vmax: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.buckets < 1:
+            raise ValueError(f"buckets must be at least 1: {self.buckets}")
+        validate_css_value("color", self.color)
+
+    def css(self, prefix: str) -> List[str]:
+        rules = []
+        for b in range(self.buckets):
+            pct = round((b + 1) * 100 / self.buckets, 2)
+            gradient = (
+                f"linear-gradient(90deg, {self.color} {pct}%, "
+                f"transparent {pct}%)"
+            )
+            rules.append(
+                _cell_rule(f"{prefix}-{b}", f"background-image: {gradient};")
+            )
+        return rules
+
+    def buckets_for(self, values: np.ndarray) -> np.ndarray:
+        return _bucketize(values, self.buckets, self.vmin, self.vmax)
+
+
+@dataclass
+class Threshold:
+    """
+    Highlight cells whose value satisfies a comparison.
+
+    Args:
+        op: One of '>', '>=', '<', '<=', '==', '!='
+        value: Value compared against
+        columns: Columns to format; None applies to every numeric column
+        bg_color: Background color for matching cells
+        text_color: Text color for matching cells
+        bold: Whether matching cells are bold
+    """
+
+    op: str
+    value: float
+    columns: Optional[Sequence[Hashable]] = None
+    bg_color: Optional[str] = "#ffc7ce"
+    text_color: Optional[str] = "#9c0006"
+    bold: bool = False
+
+    def __post_init__(self) -> None:
+        if self.op not in _OPERATORS:
+            raise ValueError(f"Unsupported operator: {self.op}")
+        for name in ("bg_color", "text_color"):
+            if getattr(self, name) is not None:
+                validate_css_value(name, getattr(self, name))
+
+    def css(self, prefix: str) -> List[str]:
+        declarations = []
+        if self.bg_color:
+            declarations.append(f"background-color: {self.bg_color};")
+        if self.text_color:
+            declarations.append(f"color: {self.text_color};")
+        if self.bold:
+            declarations.append("font-weight: bold;")
+        return [_cell_rule(f"{prefix}-0", " ".join(declarations))]
+
+    def buckets_for(self, values: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            mask = _OPERATORS[self.op](values, self.value) & ~np.isnan(values)
+        return np.where(mask, 0, -1)
+
+
+def _bucketize(values: np.ndarray, buckets: int,
+               vmin: Optional[float], vmax: Optional[float]) -> np.ndarray:
+    """Map values to bucket numbers in [0, buckets); NaN maps to -1."""
+    valid = ~np.isnan(values)
+    result = np.full(values.shape, -1, dtype=np.int64)
+    if not valid.any():
+        return result
+    low = np.nanmin(values) if vmin is None else vmin
+    high = np.nanmax(values) if vmax is None else vmax
+    span = high - low
+    if span <= 0:
+        result[valid] = buckets - 1
+        return result
+    scaled = np.floor((values[valid] - low) / span * buckets)
+    result[valid] = np.clip(scaled, 0, buckets - 1).astype(np.int64)
+    return result
+
+
+def _rule_prefix(index: int) -> str:
+    return f"cf{index}"
+
+
+def conditional_css(rules: Optional[Sequence[Any]]) -> str:
+    """Return the stylesheet for a list of rules (independent of the data)."""
+    lines = []
+    for i, rule in enumerate(rules or []):
+        lines.extend(rule.css(_rule_prefix(i)))
+    return "\n".join(lines)
+
+
+def evaluate_conditional_formats(
+    df: pd.DataFrame,
+    rules: Optional[Sequence[Any]]
+) -> Optional[List[List[str]]]:
+    """
+    Compute the CSS classes of every data cell.
+
+    Each rule is evaluated once per target column on a float NumPy array, and
+    the bucket numbers are turned into class names with a single lookup-table
+    indexing operation.
+
+    Args:
+        df: The DataFrame with raw (unformatted) values
+        rules: ColorScale / DataBar / Threshold rules
+
+    Returns:
+        A row-major list of class strings (one per cell, names separated by
+        spaces, '' for unformatted cells), or None if no rule applies.
+    """
+    if not rules:
+        return None
+
+    n_rows, n_cols = df.shape
+    classes = np.full((n_rows, n_cols), "", dtype=object)
+    numeric_cols = [
+        pd.api.types.is_numeric_dtype(dtype)
+        and not pd.api.types.is_bool_dtype(dtype)
+        for dtype in df.dtypes
+    ]
+    applied = False
+
+    for i, rule in enumerate(rules):
+        prefix = _rule_prefix(i)
+        targets = None if rule.columns is None else set(rule.columns)
+        for j, column in enumerate(df.columns):
+            if targets is None:
+                if not numeric_cols[j]:
+                    continue
+            elif column not in targets:
+                continue
+
+            buckets = rule.buckets_for(_numeric_values(df.iloc[:, j]))
+            matched = buckets >= 0
+            if not matched.any():
+                continue
+            names = np.array(
+                [f"{prefix}-{b}" for b in range(buckets.max() + 1)],
+                dtype=object,
+            )
+            current = classes[matched, j]
+            added = names[buckets[matched]]
+            classes[matched, j] = np.where(
+                current == "", added, current + " " + added
+            )
+            applied = True
+
+    if not applied:
+        return None
+    return classes.tolist()
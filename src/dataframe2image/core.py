@@ -3,17 +3,79 @@ Core functionality for converting DataFrames to images
 """
 
 import asyncio
+import atexit
+import dataclasses
+import io
+import multiprocessing
+import os
 import re
 import tempfile
+import threading
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from pathlib import Path
-from typing import Optional, Union, Dict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 import numpy as np
 
 import pandas as pd
-from playwright.async_api import async_playwright
 
+from .conditional import evaluate_conditional_formats
+from .exceptions import (
+    BudgetExceededError,
+    CaptureError,
+    HTMLRenderError,
+    RenderTimeoutError,
+    classify_capture_error,
+)
+from .outputs import (
+    OutputSpec,
+    convert_image_bytes,
+    decode_screenshot,
+    image_to_array,
+    normalize_outputs,
+    required_scale,
+    save_image,
+    write_outputs,
+)
+from .postprocess import apply_postprocess
+from .stats import RenderStats, measure_render, measure_stage
 from .styles import TableStyle, THEMES
-from .template import render_dataframe_html
+from .template import (
+    build_table_context,
+    render_dataframe_html,
+    render_page_html,
+)
+from .vector import VECTOR_FORMATS, export_svg, print_pdf
+
+if TYPE_CHECKING:
+    from .warm import WarmPagePool
+
+
+def _async_playwright() -> Any:
+    """
+    Start Playwright, importing it on first use.
+
+    Playwright is only needed for captures, so HTML-only callers and
+    ``import dataframe2image`` do not pay for loading it.
+    """
+    from playwright.async_api import async_playwright
+
+    return async_playwright()
 
 
 def get_chinese_fonts() -> Dict[str, str]:
@@ -30,6 +92,20 @@ def get_chinese_fonts() -> Dict[str, str]:
     return fonts
 
 
+def _index_labels(index: pd.Index) -> List:
+    """Flat labels of an index; MultiIndex labels are taken from its levels."""
+    if isinstance(index, pd.MultiIndex):
+        return [label for level in index.levels for label in level]
+    return list(index)
+
+
+# Chinese character unicode ranges
+_CHINESE_PATTERN = re.compile(
+    r'[\u4e00-\u9fff\u3400-\u4dbf\U00020000-\U0002a6df\U0002a700-\U0002b73f'
+    r'\U0002b740-\U0002b81f\U0002b820-\U0002ceaf]'
+)
+
+
 def contains_chinese_characters(df: pd.DataFrame) -> bool:
     """
     Check if the DataFrame contains Chinese characters.
@@ -40,23 +116,20 @@ def contains_chinese_characters(df: pd.DataFrame) -> bool:
     Returns:
         bool: True if Chinese characters are found, False otherwise
     """
-    # Chinese character unicode ranges
-    chinese_pattern = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf\u20000-\u2a6df\u2a700-\u2b73f\u2b740-\u2b81f\u2b820-\u2ceaf]')
-    
     # Check column names
-    for col in df.columns:
-        if isinstance(col, str) and chinese_pattern.search(col):
+    for col in _index_labels(df.columns):
+        if isinstance(col, str) and _CHINESE_PATTERN.search(col):
             return True
     
     # Check index values
-    for idx in df.index:
-        if isinstance(idx, str) and chinese_pattern.search(idx):
+    for idx in _index_labels(df.index):
+        if isinstance(idx, str) and _CHINESE_PATTERN.search(idx):
             return True
     
     # Check cell values
     for col in df.columns:
         for value in df[col]:
-            if isinstance(value, str) and chinese_pattern.search(value):
+            if isinstance(value, str) and _CHINESE_PATTERN.search(value):
                 return True
     
     return False
@@ -171,28 +244,360 @@ def format_number_with_thousand_separator(value, column_name: str = "") -> str:
         return str(value) if value is not None else ""
 
 
-def preprocess_dataframe_for_formatting(df: pd.DataFrame, add_thousand_separator: bool = False) -> pd.DataFrame:
+# 日期时间列的默认格式：全部为零点时只显示日期
+DATE_FORMAT = "%Y-%m-%d"
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _format_unique(values: Any, formatter: Any) -> np.ndarray:
+    """
+    Format each distinct value once and map the results back to every row.
+
+    Missing values (NaT) become empty strings.
+    """
+    codes, uniques = pd.factorize(values)
+    formatted = np.asarray(formatter(uniques), dtype=object)
+    # factorize 把缺失值编码为 -1，正好取到末尾追加的空字符串
+    return np.append(formatted, "")[codes]
+
+
+def _strftime(uniques: pd.DatetimeIndex, fmt: Optional[str]) -> pd.Index:
+    if fmt is None:
+        if (uniques == uniques.normalize()).all():
+            fmt = DATE_FORMAT
+        else:
+            fmt = DATETIME_FORMAT
+            if (uniques.microsecond != 0).any():
+                fmt += ".%f"
+            if uniques.tz is not None:
+                fmt += " %Z"
+    return uniques.strftime(fmt)
+
+
+def _format_timedeltas(
+    uniques: pd.TimedeltaIndex, fmt: Optional[str]
+) -> List[str]:
+    negative = (uniques < pd.Timedelta(0)).tolist()
+    components = pd.Series(uniques).abs().dt.components
+    if fmt is None:
+        fmt = "{hours:02d}:{minutes:02d}:{seconds:02d}"
+        if (components["days"] != 0).any():
+            fmt = "{days} days " + fmt
+        # 小数部分取到最细的非零单位：毫秒、微秒或纳秒
+        if (components["nanoseconds"] != 0).any():
+            fmt += ".{milliseconds:03d}{microseconds:03d}{nanoseconds:03d}"
+        elif (components["microseconds"] != 0).any():
+            fmt += ".{milliseconds:03d}{microseconds:03d}"
+        elif (components["milliseconds"] != 0).any():
+            fmt += ".{milliseconds:03d}"
+    # components 的列名都是字符串
+    records = cast(List[Dict[str, Any]], components.to_dict("records"))
+    formatted = []
+    for sign, fields in zip(negative, records):
+        fields["total_hours"] = fields["days"] * 24 + fields["hours"]
+        formatted.append(("-" if sign else "") + fmt.format(**fields))
+    return formatted
+
+
+def format_datetime_values(
+    values: Union[pd.Series, pd.Index],
+    fmt: Optional[str] = None,
+    timezone: Optional[str] = None
+) -> np.ndarray:
+    """
+    Format datetime64 or timedelta64 values as display strings.
+
+    Every distinct value is formatted once, so the cost grows with the number
+    of unique timestamps rather than the number of rows.
+
+    Args:
+        values: Series or Index with a datetime64 (naive or tz-aware) or
+                timedelta64 dtype
+        fmt: ``strftime`` format for datetimes, or a ``str.format`` template
+             for timedeltas with the fields ``days``, ``hours``, ``minutes``,
+             ``seconds``, ``milliseconds``, ``microseconds``, ``nanoseconds``
+             and ``total_hours``. If None, datetimes whose times are all
+             midnight are shown as dates (``2024-01-01``), other datetimes as
+             ``2024-01-01 08:30:00`` (plus the zone name when tz-aware), and
+             timedeltas as ``[D days ]HH:MM:SS``.
+        timezone: Convert tz-aware datetimes to this zone before formatting.
+                  Naive datetimes are left as they are.
+
+    Returns:
+        Object array of strings, with "" for missing values
+    """
+    if pd.api.types.is_timedelta64_dtype(values.dtype):
+        return _format_unique(
+            values,
+            lambda uniques: _format_timedeltas(
+                pd.TimedeltaIndex(uniques), fmt
+            ),
+        )
+
+    index = pd.DatetimeIndex(values)
+    if timezone is not None and index.tz is not None:
+        index = index.tz_convert(timezone)
+    return _format_unique(
+        index, lambda uniques: _strftime(pd.DatetimeIndex(uniques), fmt)
+    )
+
+
+def _is_datetime_like(dtype: Any) -> bool:
+    return (
+        pd.api.types.is_datetime64_any_dtype(dtype)
+        or pd.api.types.is_timedelta64_dtype(dtype)
+    )
+
+
+def _column_format(
+    datetime_format: Optional[Union[str, Dict[Any, str]]], label: Any
+) -> Optional[str]:
+    if isinstance(datetime_format, dict):
+        return datetime_format.get(label)
+    return datetime_format
+
+
+def _format_columns(
+    df: pd.DataFrame,
+    add_thousand_separator: bool,
+    datetime_format: Optional[Union[str, Dict[Any, str]]],
+    timezone: Optional[str]
+) -> pd.DataFrame:
+    """Format the columns of ``df`` in place (not the index) and return it."""
+    if add_thousand_separator:
+        _add_thousand_separators(df)
+
+    # 日期时间列最后处理，避免格式化后的字符串（如 20240101）再被加上千分位
+    for position, (column, dtype) in enumerate(df.dtypes.items()):
+        if _is_datetime_like(dtype):
+            df.isetitem(
+                position,
+                format_datetime_values(
+                    df.iloc[:, position],
+                    _column_format(datetime_format, column),
+                    timezone,
+                ),
+            )
+    return df
+
+
+def format_datetime_columns(
+    df: pd.DataFrame,
+    datetime_format: Optional[Union[str, Dict[Any, str]]] = None,
+    timezone: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Replace the datetime/timedelta columns and index of ``df`` with strings.
+
+    Args:
+        df: DataFrame to update
+        datetime_format: One format for every datetime column, or a dict of
+                         formats by column label (the index is looked up by
+                         its name); see ``format_datetime_values``
+        timezone: Zone tz-aware datetimes are converted to
+
+    Returns:
+        ``df`` itself
+    """
+    _format_columns(df, False, datetime_format, timezone)
+    _format_datetime_index(df, datetime_format, timezone)
+    return df
+
+
+def _format_datetime_index(
+    df: pd.DataFrame,
+    datetime_format: Optional[Union[str, Dict[Any, str]]],
+    timezone: Optional[str]
+) -> None:
+    index = df.index
+    if not isinstance(index, pd.MultiIndex) and _is_datetime_like(index.dtype):
+        df.index = pd.Index(
+            format_datetime_values(
+                index, _column_format(datetime_format, index.name), timezone
+            ),
+            name=index.name,
+        )
+
+
+# 列并行预处理：单元格数低于该阈值时，分发列的开销大于收益，保持串行
+PARALLEL_MIN_CELLS = 200_000
+PARALLEL_BACKENDS = ("thread", "process")
+
+_preprocess_executors: Dict[Tuple[str, int], Executor] = {}
+_preprocess_executors_lock = threading.Lock()
+
+
+def _preprocess_executor(backend: str, workers: int) -> Executor:
+    """Shared pool per (backend, size), created on first use, then reused."""
+    with _preprocess_executors_lock:
+        executor = _preprocess_executors.get((backend, workers))
+        if executor is None:
+            if backend == "thread":
+                executor = ThreadPoolExecutor(
+                    workers, thread_name_prefix="dataframe2image-preprocess"
+                )
+            else:
+                # spawn 启动的子进程不会继承父进程中的线程（Playwright、SyncRenderer 的事件循环）
+                executor = ProcessPoolExecutor(
+                    workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            _preprocess_executors[(backend, workers)] = executor
+        return executor
+
+
+def shutdown_preprocess_executors() -> None:
+    """
+    Shut down the shared preprocessing pools (they are recreated on next use).
+
+    Runs automatically at interpreter exit; call it earlier to release the
+    worker processes of the 'process' backend, e.g. before forking.
+    """
+    with _preprocess_executors_lock:
+        executors = list(_preprocess_executors.values())
+        _preprocess_executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+
+atexit.register(shutdown_preprocess_executors)
+
+
+def _format_columns_parallel(
+    df: pd.DataFrame,
+    workers: int,
+    backend: str,
+    *options: Any
+) -> None:
+    """Format the columns of ``df`` in place, ``workers`` chunks at a time."""
+    chunks = [
+        positions
+        for positions in np.array_split(np.arange(df.shape[1]), workers)
+        if len(positions)
+    ]
+    executor = _preprocess_executor(backend, workers)
+    futures = [
+        executor.submit(_format_columns, df.iloc[:, positions], *options)
+        for positions in chunks
+    ]
+    for positions, future in zip(chunks, futures):
+        formatted = future.result()
+        for offset, position in enumerate(positions.tolist()):
+            df.isetitem(position, formatted.iloc[:, offset].array)
+
+
+def preprocess_dataframe_for_formatting(
+    df: pd.DataFrame,
+    add_thousand_separator: bool = False,
+    datetime_format: Optional[Union[str, Dict[Any, str]]] = None,
+    timezone: Optional[str] = None,
+    workers: Optional[int] = None,
+    backend: str = "thread"
+) -> pd.DataFrame:
     """
-    预处理DataFrame，处理数值格式化。
+    预处理DataFrame，处理数值和日期时间格式化。
     
     Args:
         df: 原始DataFrame
         add_thousand_separator: 是否添加千分位分隔符
+        datetime_format: 日期时间格式（统一格式或按列名指定的字典）
+        timezone: 带时区的日期时间转换到该时区
+        workers: 并行格式化列的工作线程/进程数；None 或 1 表示串行。
+                 单元格数少于 PARALLEL_MIN_CELLS 时始终串行。
+        backend: 'thread'（默认）或 'process'。千分位格式化受 GIL 限制，
+                 'process' 在多核上更快，但 spawn 子进程会重新导入调用方的
+                 ``__main__``，脚本须有 ``if __name__ == "__main__"`` 保护。
     
     Returns:
         处理后的DataFrame
     """
-    if not add_thousand_separator:
-        return df.copy()
+    if backend not in PARALLEL_BACKENDS:
+        raise ValueError(
+            f"Unknown preprocess backend: {backend} "
+            f"(expected one of {PARALLEL_BACKENDS})"
+        )
     
     df_formatted = df.copy()
+    options = (add_thousand_separator, datetime_format, timezone)
+    has_work = add_thousand_separator or any(
+        _is_datetime_like(dtype) for dtype in df.dtypes
+    )
+    if (
+        has_work
+        and workers is not None
+        and workers > 1
+        and df.size >= PARALLEL_MIN_CELLS
+    ):
+        _format_columns_parallel(
+            df_formatted, min(workers, df.shape[1]), backend, *options
+        )
+    else:
+        _format_columns(df_formatted, *options)
     
+    _format_datetime_index(df_formatted, datetime_format, timezone)
+    return df_formatted
+
+
+_YEAR_KEYWORDS = ('年', 'year', '年份', '年度')
+
+
+def _format_thousands(values: pd.Series, column_name: Any) -> Any:
+    """
+    Vectorized ``format_number_with_thousand_separator`` for one column.
+
+    Integer and float columns are classified with NumPy (missing, year-like,
+    at least 1000, integral) and each distinct value is formatted once with a
+    plain f-string. Other dtypes, and floats with infinities, go through the
+    per-value function. The result matches the per-value function exactly.
+    """
+    dtype = values.dtype
+    if not isinstance(dtype, np.dtype) or dtype.kind not in "iuf":
+        return values.apply(
+            lambda x: format_number_with_thousand_separator(x, column_name)
+        )
+    array = values.to_numpy()
+    if dtype.kind == "f" and np.isinf(array).any():
+        return values.apply(
+            lambda x: format_number_with_thousand_separator(x, column_name)
+        )
+
+    # 与逐值版本一致：非字符串列名（如整数）不加千分位
+    year_column = not isinstance(column_name, str) or any(
+        keyword in column_name.lower() for keyword in _YEAR_KEYWORDS
+    )
+
+    def format_uniques(uniques: Any) -> List[str]:
+        uniques = np.asarray(uniques)
+        integral = (
+            uniques == np.floor(uniques)
+            if dtype.kind == "f"
+            else np.ones(len(uniques), dtype=bool)
+        )
+        year_like = integral & (uniques >= 1000) & (uniques <= 2100)
+        separate = ~year_like & (np.abs(uniques) >= 1000) & (not year_column)
+        if dtype.kind != "f":
+            return [
+                f"{value:,}" if sep else str(value)
+                for value, sep in zip(uniques.tolist(), separate.tolist())
+            ]
+        return [
+            (f"{int(value):,}" if whole else f"{value:,.2f}")
+            if sep
+            else (str(int(value)) if whole else f"{value:.2f}")
+            for value, sep, whole in zip(
+                uniques.tolist(), separate.tolist(), integral.tolist()
+            )
+        ]
+
+    return _format_unique(array, format_uniques)
+
+
+def _add_thousand_separators(df_formatted: pd.DataFrame) -> None:
     for column in df_formatted.columns:
         # 检查列的数据类型
         col_data = df_formatted[column]
         
         # 处理category类型的数据
-        if pd.api.types.is_categorical_dtype(col_data):
+        if isinstance(col_data.dtype, pd.CategoricalDtype):
             # 尝试将category转换为数值
             try:
                 # 先转换为字符串，再尝试转换为数值
@@ -204,144 +609,1128 @@ def preprocess_dataframe_for_formatting(df: pd.DataFrame, add_thousand_separator
         
         # 应用千分位格式化
         if pd.api.types.is_numeric_dtype(col_data) or col_data.dtype == 'object':
-            df_formatted[column] = col_data.apply(
-                lambda x: format_number_with_thousand_separator(x, column)
+            # MultiIndex 列名是元组，拼接各层名称用于年份列判断
+            column_name = (
+                " ".join(map(str, column))
+                if isinstance(column, tuple)
+                else column
             )
-    
-    return df_formatted
+            df_formatted[column] = _format_thousands(col_data, column_name)
 
 
-async def _capture_table_screenshot(
-    html_content: str,
-    output_path: Union[str, Path],
-    width: Optional[int] = None,
-    height: Optional[int] = None,
-    format: str = "png"
-) -> None:
-    """Capture screenshot of HTML table using Playwright."""
-    
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        
-        # Set a larger default viewport to ensure all content is visible
-        if width:
-            viewport_height = height or 1200  # 增大默认高度
-            await page.set_viewport_size({"width": width, "height": viewport_height})
+def _resolve_style(
+    style: Optional[Union[str, TableStyle]],
+    thousand_separator: Optional[bool] = None,
+    conditional_formats: Optional[Sequence[Any]] = None
+) -> TableStyle:
+    """
+    Turn a theme name, TableStyle or None into a TableStyle for one render.
+
+    A copy is returned so per-render adjustments (thousand separators, the
+    Chinese font family) never leak into ``THEMES`` or the caller's object.
+    """
+    if isinstance(style, str):
+        if style in THEMES:
+            style = THEMES[style]
         else:
-            # 如果没有指定宽度，设置一个较大的默认视窗
-            await page.set_viewport_size({"width": 1200, "height": 1200})
-        
-        # Load HTML content
+            raise ValueError(f"Unknown theme: {style}")
+    elif style is None:
+        style = TableStyle()
+    style = dataclasses.replace(style)
+
+    # 处理千分位分隔符设置
+    if thousand_separator is not None:
+        style.thousand_separator = thousand_separator
+    if conditional_formats is not None:
+        style.conditional_formats = list(conditional_formats)
+    return style
+
+
+def _chinese_font_family(font_files: Dict[str, str]) -> str:
+    # 使用方正兰亭圆字体作为主要字体
+    chinese_font_names = list(font_files.keys())
+    return (
+        f"'{chinese_font_names[0]}', 'Microsoft YaHei', 'SimHei', sans-serif"
+    )
+
+
+def _prepare_dataframe(
+    df: pd.DataFrame,
+    style: TableStyle,
+    stats: Optional[RenderStats] = None
+) -> Tuple[pd.DataFrame, Optional[Dict[str, str]], Optional[List[List[str]]]]:
+    """
+    Apply value formatting and Chinese font detection for one DataFrame.
+
+    Updates ``style.font_family`` when Chinese fonts are used and returns the
+    processed DataFrame, the font files to embed (or None) and the
+    conditional-formatting classes of every cell (or None).
+    """
+    # 条件格式基于原始数值计算，必须在千分位格式化之前
+    with measure_stage(stats, "conditional_formats"):
+        cell_classes = evaluate_conditional_formats(
+            df, style.conditional_formats
+        )
+
+    # 预处理DataFrame以应用格式化
+    with measure_stage(stats, "preprocess"):
+        df_processed = preprocess_dataframe_for_formatting(
+            df,
+            style.thousand_separator,
+            style.datetime_format,
+            style.timezone,
+            workers=style.preprocess_workers,
+            backend=style.preprocess_backend,
+        )
+
+    # 自动检测中文字符并设置字体
+    font_files = None
+    with measure_stage(stats, "detect_chinese"):
+        has_chinese = contains_chinese_characters(df_processed)
+    if has_chinese:
+        font_files = get_chinese_fonts()
+        if font_files:
+            style.font_family = _chinese_font_family(font_files)
+
+    return df_processed, font_files, cell_classes
+
+
+# Default layout viewport. Widths below 768px would trigger the template's
+# responsive rules, so the auto-sized viewport never goes narrower than this.
+DEFAULT_VIEWPORT_WIDTH = 1200
+DEFAULT_VIEWPORT_HEIGHT = 1200
+# Chromium 单张纹理的上限，更高的表格交给元素截图自行滚动拼接
+MAX_VIEWPORT_HEIGHT = 16384
+
+# 截图目标：组合布局截取整个面板，否则截取第一个表格容器（面板在文档中先出现）
+_CAPTURE_SELECTOR = ".layout-grid, .table-container"
+
+# 测量整页内容尺寸（包含 body 的内边距和超出视窗的部分）
+_CONTENT_SIZE_JS = """
+() => [
+    document.documentElement.scrollWidth,
+    document.documentElement.scrollHeight
+]
+"""
+
+
+async def _fit_viewport(
+    page: Any,
+    width: Optional[int] = None,
+    height: Optional[int] = None
+) -> Tuple[int, int]:
+    """
+    Resize the viewport to the laid-out content size.
+
+    The table is laid out once, its scroll size is read in a single
+    ``page.evaluate`` and the viewport is set to fit it exactly. Explicit
+    ``width``/``height`` values are kept. Because the table container is
+    shrink-wrapped, widening the viewport does not change the table layout.
+
+    Returns:
+        The final viewport size as ``(width, height)``
+    """
+    content_width, content_height = await page.evaluate(_CONTENT_SIZE_JS)
+    viewport_width = width or max(DEFAULT_VIEWPORT_WIDTH, content_width)
+    viewport_height = height or min(
+        max(1, content_height), MAX_VIEWPORT_HEIGHT
+    )
+
+    current = page.viewport_size or {}
+    if (
+        current.get("width") != viewport_width
+        or current.get("height") != viewport_height
+    ):
+        await page.set_viewport_size(
+            {"width": viewport_width, "height": viewport_height}
+        )
+    return viewport_width, viewport_height
+
+
+# 离线模式的 Chromium 启动参数：面向无头容器，关闭 GPU、扩展和各类后台任务
+OFFLINE_CHROMIUM_ARGS = (
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-breakpad",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-dev-shm-usage",
+    "--disable-domain-reliability",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,"
+    "AutofillServerCommunication",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-default-browser-check",
+    "--no-first-run",
+    "--no-pings",
+)
+
+# Schemes a table page may load in offline mode (fonts are file:// URLs)
+_OFFLINE_SCHEMES = ("file:", "data:", "about:")
+
+# 等待两帧，确保样式计算和首次绘制已完成
+_NEXT_FRAME_JS = """
+() => new Promise(resolve => requestAnimationFrame(
+    () => requestAnimationFrame(() => resolve(true))
+))
+"""
+
+
+# 超过该长度（字符数）的 HTML 写入临时文件并通过 file:// 导航加载，
+# 避免把大字符串整个经 CDP 管道发送
+FILE_NAVIGATION_THRESHOLD = 1024 * 1024
+
+
+async def _load_html(page: Any, html_content: str) -> None:
+    """
+    Load ``html_content`` into ``page``.
+
+    Small documents are sent with ``page.set_content``. Documents of at least
+    ``FILE_NAVIGATION_THRESHOLD`` characters are written to a temporary file
+    with ``save_temp_html`` and opened with ``page.goto``, so the browser reads
+    them from disk instead of receiving one huge CDP message. The file is
+    removed once the page has loaded, or if loading fails.
+    """
+    if len(html_content) < FILE_NAVIGATION_THRESHOLD:
         await page.set_content(html_content)
-        
-        # Wait for content to load and ensure all elements are rendered
+        return
+
+    path = save_temp_html(html_content)
+    try:
+        await page.goto(Path(path).as_uri())
+    finally:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+async def _launch_browser(playwright: Any, offline: bool = False) -> Any:
+    """Launch Chromium, with ``OFFLINE_CHROMIUM_ARGS`` in offline mode."""
+    if offline:
+        return await playwright.chromium.launch(
+            args=list(OFFLINE_CHROMIUM_ARGS)
+        )
+    return await playwright.chromium.launch()
+
+
+async def _block_network(route: Any) -> None:
+    """Route handler that only lets local resources through."""
+    if route.request.url.startswith(_OFFLINE_SCHEMES):
+        await route.continue_()
+    else:
+        await route.abort()
+
+
+async def _prepare_page(page: Any, offline: bool = False) -> None:
+    """Isolate ``page`` from the network in offline mode."""
+    if offline:
+        await page.route("**/*", _block_network)
+
+
+async def _wait_until_settled(page: Any, offline: bool = False) -> None:
+    """
+    Wait until the loaded page is ready to be captured.
+
+    Offline pages cannot have requests in flight, so instead of waiting for
+    ``networkidle`` plus a fixed delay they only wait for the next painted
+    frame.
+    """
+    if offline:
+        await page.evaluate(_NEXT_FRAME_JS)
+    else:
         await page.wait_for_load_state('networkidle')
         await page.wait_for_timeout(1000)  # 额外等待确保渲染完成
-        
-        # Find the table container element
-        table_element = await page.query_selector('.table-container')
-        
+
+
+async def _capture_loaded_page(
+    page: Any,
+    output_path: Optional[Union[str, Path]],
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    format: str = "png",
+    stats: Optional[RenderStats] = None
+) -> bytes:
+    """Fit the viewport to the table on a settled page and capture it."""
+    # Size the viewport to the measured table so nothing is cropped or scrolled
+    with measure_stage(stats, "measure"):
+        await _fit_viewport(page, width, height)
+
+    # 矢量格式不截图：PDF 由打印生成，SVG 由测得的单元格布局生成
+    if format == "pdf":
+        with measure_stage(stats, "pdf"):
+            return await print_pdf(page, output_path)
+    if format == "svg":
+        with measure_stage(stats, "svg"):
+            return await export_svg(page, output_path)
+
+    # Find the table container element (or the panel of a grid layout)
+    table_element = await page.query_selector(_CAPTURE_SELECTOR)
+
+    screenshot_options = {}
+    if output_path is not None:
+        screenshot_options["path"] = str(output_path)
+    if format in ["png", "jpeg"]:
+        screenshot_options["type"] = format
+
+    with measure_stage(stats, "screenshot"):
         if table_element:
             # Screenshot just the table
-            screenshot_options = {"path": str(output_path)}
-            if format in ["png", "jpeg"]:
-                screenshot_options["type"] = format
-            await table_element.screenshot(**screenshot_options)
+            screenshot: bytes = await table_element.screenshot(
+                **screenshot_options
+            )
         else:
             # Fallback: screenshot the entire page
-            screenshot_options = {"path": str(output_path), "full_page": True}
-            if format in ["png", "jpeg"]:
-                screenshot_options["type"] = format
-            await page.screenshot(**screenshot_options)
+            screenshot = await page.screenshot(
+                full_page=True, **screenshot_options
+            )
+    return screenshot
+
+
+async def _screenshot_in_new_page(
+    browser: Any,
+    html_content: str,
+    output_path: Optional[Union[str, Path]],
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    format: str = "png",
+    device_scale_factor: float = 1.0,
+    stats: Optional[RenderStats] = None,
+    offline: bool = False
+) -> bytes:
+    """Open a page on ``browser``, capture the table and close the page."""
+    with measure_stage(stats, "new_page"):
+        page = await browser.new_page(device_scale_factor=device_scale_factor)
+    
+    try:
+        await _prepare_page(page, offline)
+
+        # Lay out with the requested width (or the default) first
+        await page.set_viewport_size({
+            "width": width or DEFAULT_VIEWPORT_WIDTH,
+            "height": height or DEFAULT_VIEWPORT_HEIGHT,
+        })
+        
+        # Load HTML content
+        with measure_stage(stats, "set_content"):
+            await _load_html(page, html_content)
+        
+        # Wait for content to load and ensure all elements are rendered
+        with measure_stage(stats, "font_loading"):
+            await page.evaluate("document.fonts.ready.then(() => true)")
+        with measure_stage(stats, "settle"):
+            await _wait_until_settled(page, offline)
         
-        await browser.close()
+        return await _capture_loaded_page(
+            page, output_path, width, height, format, stats
+        )
+    finally:
+        await page.close()
+
+
+async def _capture_table_screenshot(
+    html_content: str,
+    output_path: Optional[Union[str, Path]],
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    format: str = "png",
+    device_scale_factor: float = 1.0,
+    stats: Optional[RenderStats] = None,
+    browser: Any = None,
+    offline: bool = False,
+    pages: Optional["WarmPagePool"] = None
+) -> bytes:
+    """
+    Capture screenshot of HTML table using Playwright.
+
+    Returns the encoded screenshot bytes. When ``output_path`` is None the
+    image is only returned, which lets callers post-process it in memory.
+    A running ``browser`` is reused if given; otherwise one is launched for
+    this capture and closed afterwards. ``offline`` blocks every request that
+    is not ``file://``/``data:``, skips the network waits and launches with
+    ``OFFLINE_CHROMIUM_ARGS``. ``pages`` is an optional ``WarmPagePool`` of
+    ``browser`` whose pre-loaded pages are used when the capture fits them.
+    """
+    capture_args = (
+        html_content,
+        output_path,
+        width,
+        height,
+        format,
+        device_scale_factor,
+        stats,
+        offline,
+    )
+
+    if browser is not None:
+        if stats is not None:
+            stats.browser_reused = True
+        if pages is not None and pages.accepts(
+            html_content, device_scale_factor
+        ):
+            return await pages.capture(
+                html_content, output_path, width, height, format, stats
+            )
+        return await _screenshot_in_new_page(browser, *capture_args)
+
+    async with _async_playwright() as p:
+        with measure_stage(stats, "browser_launch"):
+            browser = await _launch_browser(p, offline)
+        try:
+            return await _screenshot_in_new_page(browser, *capture_args)
+        finally:
+            await browser.close()
+
+
+def _validate_image_args(
+    df: pd.DataFrame,
+    output_path: Optional[Union[str, Path]],
+    format: str,
+    device_scale_factor: float,
+    outputs: Optional[Sequence[Union[OutputSpec, Dict[str, Any]]]],
+    require_output: bool = True,
+    postprocess: Optional[Sequence[Any]] = None
+) -> List[OutputSpec]:
+    """
+    Check the arguments shared by all image renders; return the output specs.
+
+    ``require_output=False`` allows renders that only return the image bytes.
+    """
+    if df.empty:
+        raise ValueError("DataFrame is empty")
+
+    if format.lower() not in ["png", "jpeg", "webp", *VECTOR_FORMATS]:
+        raise ValueError(f"Unsupported format: {format}")
+
+    if device_scale_factor <= 0:
+        raise ValueError(
+            f"device_scale_factor must be positive: {device_scale_factor}"
+        )
+
+    specs = normalize_outputs(outputs)
+    if specs and format.lower() in VECTOR_FORMATS:
+        raise ValueError(f"outputs cannot be combined with format={format!r}")
+    if postprocess and format.lower() in VECTOR_FORMATS:
+        raise ValueError(
+            f"postprocess cannot be combined with format={format!r}"
+        )
+    if require_output and output_path is None and not specs:
+        raise ValueError("Either output_path or outputs must be given")
+    return specs
+
+
+def _build_table_html(
+    df: pd.DataFrame,
+    style: Optional[Union[str, TableStyle]],
+    show_index: bool,
+    thousand_separator: Optional[bool],
+    conditional_formats: Optional[Sequence[Any]],
+    stats: Optional[RenderStats] = None
+) -> str:
+    """Resolve the style, preprocess the DataFrame and render the HTML page."""
+    style = _resolve_style(style, thousand_separator, conditional_formats)
+    df_processed, font_files, cell_classes = _prepare_dataframe(
+        df, style, stats
+    )
+
+    with measure_stage(stats, "render_html"):
+        html_content = render_dataframe_html(
+            df_processed, style, show_index, font_files, cell_classes
+        )
+
+    if stats is not None:
+        stats.html_bytes = len(html_content.encode("utf-8"))
+    return html_content
+
+
+async def _capture_image(
+    html_content: str,
+    output_path: Optional[Union[str, Path]],
+    specs: List[OutputSpec],
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    format: str = "png",
+    device_scale_factor: float = 1.0,
+    stats: Optional[RenderStats] = None,
+    browser: Any = None,
+    offline: bool = False,
+    pages: Optional["WarmPagePool"] = None,
+    postprocess: Optional[Sequence[Any]] = None
+) -> bytes:
+    """
+    Capture the table and write ``output_path`` plus any derived outputs.
+
+    ``postprocess`` hooks are applied to the decoded capture before the files
+    are encoded. Returns the screenshot bytes as captured (PNG when ``specs``
+    or ``postprocess`` are given), re-encoded when Chromium cannot produce
+    ``format`` itself.
+    """
+    # Playwright only encodes png and jpeg; WebP is captured as PNG and
+    # re-encoded with Pillow before it is written or returned
+    actual_format = (
+        format.lower()
+        if format.lower() in ["png", "jpeg", *VECTOR_FORMATS]
+        else "png"
+    )
+    reencode = actual_format != format.lower()
+
+    # 多尺寸输出：按最高倍率截图一次，其余尺寸在内存中用 Pillow 重采样
+    specs = list(specs)
+    if (specs or postprocess) and output_path is not None:
+        specs.insert(
+            0,
+            OutputSpec(
+                output_path, scale=device_scale_factor, format=format.lower()
+            ),
+        )
+    capture_scale = required_scale(specs, device_scale_factor)
+
+    # Convert to image
+    try:
+        screenshot = await _capture_table_screenshot(
+            html_content,
+            None if specs or reencode else output_path,
+            width,
+            height,
+            "png" if specs else actual_format,
+            capture_scale,
+            stats,
+            browser,
+            offline,
+            pages
+        )
+    except Exception as e:
+        raise classify_capture_error(e, browser) from e
+
+    if specs:
+        with measure_stage(stats, "write_outputs"):
+            write_outputs(screenshot, specs, capture_scale, postprocess)
+    elif reencode:
+        with measure_stage(stats, "write_outputs"):
+            screenshot = convert_image_bytes(screenshot, format)
+            if output_path is not None:
+                Path(output_path).write_bytes(screenshot)
+
+    if stats is not None:
+        stats.output_bytes = (
+            sum(Path(spec.path).stat().st_size for spec in specs)
+            if specs
+            else len(screenshot)
+        )
+    return screenshot
+
+
+async def _with_timeout(awaitable: Any, timeout: Optional[float]) -> Any:
+    """
+    Await ``awaitable``, cancelling it after ``timeout`` seconds.
+
+    Cancellation closes the page (and a browser launched for the render), so
+    a hung capture does not outlive its deadline.
+
+    Raises:
+        RenderTimeoutError: If the deadline passes first
+    """
+    if timeout is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError as e:
+        raise RenderTimeoutError(
+            f"Render did not finish within {timeout:g}s"
+        ) from e
 
 
 def df_to_image(
     df: pd.DataFrame,
-    output_path: Union[str, Path],
+    output_path: Optional[Union[str, Path]],
     style: Optional[Union[str, TableStyle]] = None,
     width: Optional[int] = None,
     height: Optional[int] = None,
     format: str = "png",
     show_index: bool = True,
-    thousand_separator: Optional[bool] = None
+    thousand_separator: Optional[bool] = None,
+    device_scale_factor: float = 1.0,
+    outputs: Optional[Sequence[Union[OutputSpec, Dict[str, Any]]]] = None,
+    conditional_formats: Optional[Sequence[Any]] = None,
+    stats: Optional[RenderStats] = None,
+    offline: bool = False,
+    budget: Optional[Any] = None,
+    postprocess: Optional[Sequence[Any]] = None,
+    timeout: Optional[float] = None
 ) -> None:
     """
     Convert a pandas DataFrame to a table image.
     
     Args:
         df: The pandas DataFrame to convert
-        output_path: Path where the image will be saved
+        output_path: Path where the image will be saved. May be None when
+                     ``outputs`` is given.
         style: Either a TableStyle object or theme name string
         width: Image width in pixels (optional)
         height: Image height in pixels (optional)
-        format: Image format ('png', 'jpeg', 'webp')
+        format: Image format ('png', 'jpeg', 'webp'), or 'pdf' / 'svg' for
+                vector output. PDF is paginated with the header repeated on
+                every page; SVG is built from the measured cell layout.
+                Vector formats cannot be combined with ``outputs``.
         show_index: Whether to show the DataFrame index
         thousand_separator: Whether to add thousand separators to numbers.
                           If None, will use the style's thousand_separator setting.
+        device_scale_factor: Pixel density of the capture (2.0 for HiDPI)
+        outputs: Additional images to derive from the same capture, as
+                 OutputSpec objects or dicts with the same fields, e.g.
+                 ``[{"path": "t@2x.png", "scale": 2},
+                 {"path": "t_thumb.jpg", "width": 200}]``.
+                 The table is captured once at the highest scale needed and
+                 the other sizes/formats are resampled with Pillow.
+        conditional_formats: ColorScale / DataBar / Threshold rules. If None,
+                             will use the style's conditional_formats setting.
+        stats: Optional RenderStats filled with per-stage timings, sizes and
+               (if enabled) peak memory of this render
+        offline: Block all network requests (only ``file://``/``data:`` are
+                 allowed), skip the network-idle waits and launch Chromium
+                 with flags tuned for headless containers. Faster and
+                 isolated; the table page itself never needs the network.
+        budget: Optional RenderBudget checked against ``plan_render`` before
+                any HTML is generated. Depending on its action an oversized
+                render is rejected, truncated to the rows that fit, or split
+                into ``<stem>_part001<suffix>``, ``<stem>_part002<suffix>``,
+                ...
+        postprocess: Hooks run on the decoded capture before it is encoded,
+                     e.g. ``[Background("white", padding=16),
+                     Watermark("draft")]``
+                     (see ``dataframe2image.postprocess``); also applied to
+                     every derived output. Not available for vector formats.
+        timeout: Seconds the capture (browser launch, load and screenshot) may
+                 take before it is aborted with RenderTimeoutError
     
     Raises:
         ValueError: If the DataFrame is empty or invalid format specified
-        RuntimeError: If screenshot capture fails
+        BudgetExceededError: If ``budget`` rejects the render (a ValueError)
+        HTMLRenderError: If the HTML cannot be generated
+        CaptureError: If screenshot capture fails (BrowserCrashedError and
+                      RenderTimeoutError for crashes and timeouts). All of
+                      these are RuntimeError subclasses.
     """
     
-    if df.empty:
-        raise ValueError("DataFrame is empty")
-    
-    if format.lower() not in ["png", "jpeg", "webp"]:
-        raise ValueError(f"Unsupported format: {format}")
-    
-    # Note: Playwright only supports png and jpeg for element screenshots
-    # WebP format will be saved as PNG with webp extension for compatibility
-    actual_format = format.lower() if format.lower() in ["png", "jpeg"] else "png"
-    
-    # Handle style parameter
-    if isinstance(style, str):
-        if style in THEMES:
-            style = THEMES[style]
-        else:
-            raise ValueError(f"Unknown theme: {style}")
-    elif style is None:
-        style = TableStyle()
-    
-    # 处理千分位分隔符设置
-    if thousand_separator is not None:
-        style.thousand_separator = thousand_separator
-    
-    # 预处理DataFrame以应用格式化
-    df_processed = preprocess_dataframe_for_formatting(df, style.thousand_separator)
-    
-    # 自动检测中文字符并设置字体
-    font_files = None
-    if contains_chinese_characters(df_processed):
-        font_files = get_chinese_fonts()
-        if font_files:
-            # 使用方正兰亭圆字体作为主要字体
-            chinese_font_names = list(font_files.keys())
-            style.font_family = f"'{chinese_font_names[0]}', 'Microsoft YaHei', 'SimHei', sans-serif"
+    specs = _validate_image_args(
+        df,
+        output_path,
+        format,
+        device_scale_factor,
+        outputs,
+        postprocess=postprocess,
+    )
     
-    # Render HTML
+    # 预算检查只做估算，在生成 HTML 和启动浏览器之前完成
+    frames = [(df, output_path)]
+    if budget is not None:
+        frames = _apply_budget(
+            df,
+            output_path,
+            specs,
+            budget,
+            style,
+            show_index,
+            thousand_separator,
+            device_scale_factor,
+        )
+
+    with measure_render(stats):
+        if len(frames) > 1:
+            asyncio.run(
+                _with_timeout(
+                    _capture_tiles(
+                        frames,
+                        style,
+                        show_index,
+                        thousand_separator,
+                        conditional_formats,
+                        width,
+                        height,
+                        format,
+                        device_scale_factor,
+                        stats,
+                        offline,
+                        postprocess,
+                    ),
+                    timeout,
+                )
+            )
+            return
+
+        # Render HTML
+        html_content = _render_html(
+            frames[0][0],
+            style,
+            show_index,
+            thousand_separator,
+            conditional_formats,
+            stats,
+        )
+
+        asyncio.run(
+            _with_timeout(
+                _capture_image(
+                    html_content,
+                    frames[0][1],
+                    specs,
+                    width,
+                    height,
+                    format,
+                    device_scale_factor,
+                    stats,
+                    offline=offline,
+                    postprocess=postprocess,
+                ),
+                timeout,
+            )
+        )
+
+
+PIXEL_KINDS = ("image", "array")
+
+
+def df_to_pixels(
+    df: pd.DataFrame,
+    kind: str = "image",
+    style: Optional[Union[str, TableStyle]] = None,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    show_index: bool = True,
+    thousand_separator: Optional[bool] = None,
+    device_scale_factor: float = 1.0,
+    conditional_formats: Optional[Sequence[Any]] = None,
+    postprocess: Optional[Sequence[Any]] = None,
+    mode: str = "RGBA",
+    memmap_path: Optional[Union[str, Path]] = None,
+    stats: Optional[RenderStats] = None,
+    offline: bool = False
+) -> Any:
+    """
+    Render a DataFrame and return the decoded pixels instead of writing a file.
+
+    The screenshot stays in memory and is decoded exactly once; post-processing
+    hooks run on that image and nothing is re-encoded, so the result can go
+    straight into a Pillow or NumPy pipeline.
+
+    Example:
+        image = df_to_pixels(df, postprocess=[Watermark("internal")])
+        canvas.paste(image, (0, 0), image)
+
+    Args:
+        df: The pandas DataFrame to convert
+        kind: 'image' for a ``PIL.Image.Image``, 'array' for a NumPy array of
+              shape (height, width, channels)
+        style: Either a TableStyle object or theme name string
+        width: Viewport width in pixels (optional)
+        height: Viewport height in pixels (optional)
+        show_index: Whether to show the DataFrame index
+        thousand_separator: Whether to add thousand separators to numbers.
+                          If None, the style's setting is used.
+        device_scale_factor: Pixel density of the capture
+        conditional_formats: ColorScale / DataBar / Threshold rules
+        postprocess: Hooks run on the decoded image (see ``df_to_image``)
+        mode: Pillow mode of the result, e.g. 'RGBA' or 'RGB'
+        memmap_path: With ``kind='array'``, write the pixels into a
+                     ``numpy.memmap`` backed by this file and return it
+        stats: Optional RenderStats filled with per-stage timings and sizes
+        offline: Capture without network access (see ``df_to_image``)
+
+    Returns:
+        PIL.Image.Image, numpy.ndarray (read-only) or numpy.memmap
+
+    Raises:
+        ValueError: If the DataFrame is empty or ``kind`` is invalid
+        HTMLRenderError: If the HTML cannot be generated
+        CaptureError: If screenshot capture fails
+    """
+    if kind not in PIXEL_KINDS:
+        raise ValueError(
+            f"Unknown pixel kind: {kind} (expected one of {PIXEL_KINDS})"
+        )
+    if memmap_path is not None and kind != "array":
+        raise ValueError("memmap_path requires kind='array'")
+    _validate_image_args(
+        df, None, "png", device_scale_factor, None, require_output=False
+    )
+
+    with measure_render(stats):
+        html_content = _render_html(
+            df,
+            style,
+            show_index,
+            thousand_separator,
+            conditional_formats,
+            stats,
+        )
+        screenshot = asyncio.run(
+            _capture_image(
+                html_content,
+                None,
+                [],
+                width,
+                height,
+                "png",
+                device_scale_factor,
+                stats,
+                offline=offline,
+            )
+        )
+        with measure_stage(stats, "decode"):
+            image = decode_screenshot(screenshot, mode)
+        if postprocess:
+            with measure_stage(stats, "postprocess"):
+                image = apply_postprocess(
+                    image, postprocess, device_scale_factor
+                )
+                if image.mode != mode:
+                    image = image.convert(mode)
+        if kind == "image":
+            return image
+        with measure_stage(stats, "to_array"):
+            return image_to_array(image, memmap_path)
+
+
+def _render_html(
+    df: pd.DataFrame,
+    style: Optional[Union[str, TableStyle]],
+    show_index: bool,
+    thousand_separator: Optional[bool],
+    conditional_formats: Optional[Sequence[Any]],
+    stats: Optional[RenderStats] = None
+) -> str:
+    """``_build_table_html``, wrapping unexpected errors in HTMLRenderError."""
     try:
-        html_content = render_dataframe_html(df_processed, style, show_index, font_files)
+        return _build_table_html(
+            df,
+            style,
+            show_index,
+            thousand_separator,
+            conditional_formats,
+            stats,
+        )
+    except ValueError:
+        raise
     except Exception as e:
-        raise RuntimeError(f"Failed to render HTML: {e}")
-    
-    # Convert to image
+        raise HTMLRenderError(f"Failed to render HTML: {e}") from e
+
+
+def _apply_budget(
+    df: pd.DataFrame,
+    output_path: Optional[Union[str, Path]],
+    specs: List[OutputSpec],
+    budget: Any,
+    style: Optional[Union[str, TableStyle]],
+    show_index: bool,
+    thousand_separator: Optional[bool],
+    device_scale_factor: float
+) -> List[Tuple[pd.DataFrame, Optional[Union[str, Path]]]]:
+    """
+    Check ``df`` against a RenderBudget; return the ``(frame, path)`` pairs.
+
+    Raises:
+        BudgetExceededError: If the action is 'reject', or not even one row
+            fits
+    """
+    from .planning import plan_render
+
+    plan = plan_render(
+        df, style, show_index, thousand_separator, device_scale_factor
+    )
+    violations = budget.violations(plan)
+    if not violations:
+        return [(df, output_path)]
+
+    rows = budget.max_rows_within(plan)
+    if budget.action == "reject" or rows == 0:
+        raise BudgetExceededError(plan, violations)
+    if budget.action == "truncate":
+        return [(df.iloc[:rows], output_path)]
+
+    if output_path is None or specs:
+        raise ValueError(
+            "Budget action 'tile' needs output_path and cannot be combined "
+            "with outputs"
+        )
+    path = Path(output_path)
+    return [
+        (
+            df.iloc[start:start + rows],
+            path.with_name(f"{path.stem}_part{part:03d}{path.suffix}"),
+        )
+        for part, start in enumerate(range(0, len(df), rows), start=1)
+    ]
+
+
+async def _capture_tiles(
+    frames: Sequence[Tuple[pd.DataFrame, Optional[Union[str, Path]]]],
+    style: Optional[Union[str, TableStyle]],
+    show_index: bool,
+    thousand_separator: Optional[bool],
+    conditional_formats: Optional[Sequence[Any]],
+    width: Optional[int],
+    height: Optional[int],
+    format: str,
+    device_scale_factor: float,
+    stats: Optional[RenderStats],
+    offline: bool,
+    postprocess: Optional[Sequence[Any]] = None
+) -> None:
+    """Render the tiles in turn on one browser, building each HTML lazily."""
+    async with _async_playwright() as p:
+        with measure_stage(stats, "browser_launch"):
+            browser = await _launch_browser(p, offline)
+        try:
+            for frame, path in frames:
+                html_content = _render_html(
+                    frame,
+                    style,
+                    show_index,
+                    thousand_separator,
+                    conditional_formats,
+                    stats,
+                )
+                await _capture_image(
+                    html_content,
+                    path,
+                    [],
+                    width,
+                    height,
+                    format,
+                    device_scale_factor,
+                    stats,
+                    browser=browser,
+                    offline=offline,
+                    postprocess=postprocess,
+                )
+        finally:
+            await browser.close()
+
+
+# 一次性读取页面内所有表格的包围盒（文档坐标）
+_TABLE_BOXES_JS = """
+() => Array.from(document.querySelectorAll('.table-container')).map(el => {
+    const r = el.getBoundingClientRect();
+    return [
+        r.left + window.scrollX, r.top + window.scrollY, r.width, r.height
+    ];
+})
+"""
+
+
+async def _capture_batch_screenshot(
+    browser: Any,
+    html_content: str,
+    width: Optional[int] = None,
+    device_scale_factor: float = 1.0,
+    offline: bool = False
+) -> Tuple[bytes, List[List[float]]]:
+    """
+    Capture a page of tiled tables with one full-page screenshot.
+
+    Returns the PNG bytes and the CSS-pixel bounding box ``[x, y, w, h]`` of
+    every table, gathered with a single ``page.evaluate`` call. The page is
+    opened on ``browser`` and closed afterwards.
+    """
+    page = await browser.new_page(device_scale_factor=device_scale_factor)
     try:
-        asyncio.run(_capture_table_screenshot(
-            html_content, output_path, width, height, actual_format
-        ))
-    except Exception as e:
-        raise RuntimeError(f"Failed to capture screenshot: {e}")
+        await _prepare_page(page, offline)
+        await page.set_viewport_size({
+            "width": width or DEFAULT_VIEWPORT_WIDTH,
+            "height": DEFAULT_VIEWPORT_HEIGHT,
+        })
+
+        await _load_html(page, html_content)
+        await _wait_until_settled(page, offline)
+
+        boxes = await page.evaluate(_TABLE_BOXES_JS)
+        screenshot: bytes = await page.screenshot(full_page=True, type="png")
+        return screenshot, boxes
+    finally:
+        await page.close()
+
+
+async def _capture_batches(
+    batches: Iterable[Tuple[str, Sequence[Union[str, Path]]]],
+    width: Optional[int],
+    format: str,
+    device_scale_factor: float,
+    offline: bool
+) -> None:
+    """
+    Capture every batch page on one browser and save the sliced tables.
+
+    ``batches`` yields ``(html_content, output_paths)`` per page. Chromium is
+    launched once for all of them and closed even if a batch fails.
+    """
+    async with _async_playwright() as p:
+        try:
+            browser = await _launch_browser(p, offline)
+        except Exception as e:
+            raise classify_capture_error(e) from e
+        try:
+            for html_content, paths in batches:
+                try:
+                    screenshot, boxes = await _capture_batch_screenshot(
+                        browser,
+                        html_content,
+                        width,
+                        device_scale_factor,
+                        offline,
+                    )
+                except Exception as e:
+                    raise classify_capture_error(e, browser) from e
+                _save_batch_tiles(
+                    screenshot, boxes, paths, format, device_scale_factor
+                )
+        finally:
+            await browser.close()
+
+
+def _save_batch_tiles(
+    screenshot: bytes,
+    boxes: Sequence[Sequence[float]],
+    paths: Sequence[Union[str, Path]],
+    format: str,
+    device_scale_factor: float
+) -> None:
+    """Slice one batch screenshot into its tables and save each of them."""
+    if len(boxes) != len(paths):
+        raise CaptureError(
+            f"Expected {len(paths)} tables on page, found {len(boxes)}"
+        )
+
+    from PIL import Image
+
+    sheet = Image.open(io.BytesIO(screenshot))
+    sheet.load()
+    for box, path in zip(boxes, paths):
+        tile = sheet.crop(_crop_box(box, device_scale_factor, sheet.size))
+        save_image(tile, path, format)
+
+
+def _crop_box(
+    box: Sequence[float], scale: float, size: Tuple[int, int]
+) -> Tuple[int, int, int, int]:
+    """Convert a CSS-pixel ``[x, y, w, h]`` box to a pixel crop box."""
+    x, y, w, h = box
+    left = max(0, int(np.floor(x * scale)))
+    top = max(0, int(np.floor(y * scale)))
+    right = min(size[0], int(np.ceil((x + w) * scale)))
+    bottom = min(size[1], int(np.ceil((y + h) * scale)))
+    return left, top, right, bottom
+
+
+def _batch_pages(
+    tables: Sequence[Dict[str, Any]],
+    output_paths: Sequence[Union[str, Path]],
+    style: TableStyle,
+    font_files: Optional[Dict[str, str]],
+    batch_size: int
+) -> Iterator[Tuple[str, Sequence[Union[str, Path]]]]:
+    """Render the tiled page of each ``batch_size`` chunk lazily."""
+    for start in range(0, len(tables), batch_size):
+        try:
+            html_content = render_page_html(
+                tables[start:start + batch_size],
+                style,
+                font_files,
+                layout="batch",
+            )
+        except Exception as e:
+            raise HTMLRenderError(f"Failed to render HTML: {e}") from e
+        yield html_content, output_paths[start:start + batch_size]
+
+
+def dfs_to_images(
+    dfs: Sequence[pd.DataFrame],
+    output_paths: Sequence[Union[str, Path]],
+    style: Optional[Union[str, TableStyle]] = None,
+    width: Optional[int] = None,
+    format: str = "png",
+    show_index: bool = True,
+    thousand_separator: Optional[bool] = None,
+    device_scale_factor: float = 1.0,
+    batch_size: int = 50,
+    offline: bool = False
+) -> None:
+    """
+    Convert many small DataFrames to table images in sprite/atlas mode.
+
+    The tables are tiled on one page, captured with a single full-page
+    screenshot and sliced apart with Pillow, so the per-screenshot overhead is
+    paid once per ``batch_size`` tables instead of once per table. All
+    batches are captured on one Chromium instance. This pays off for small
+    tables; large ones are better served by ``df_to_image``.
+
+    Args:
+        dfs: The DataFrames to convert
+        output_paths: One output path per DataFrame
+        style: Either a TableStyle object or theme name string, shared by all
+               tables
+        width: Page width in pixels used to tile the tables (default 1200)
+        format: Image format ('png', 'jpeg', 'webp')
+        show_index: Whether to show the DataFrame index
+        thousand_separator: Whether to add thousand separators to numbers.
+                          If None, the style's setting is used.
+        device_scale_factor: Pixel density of the capture
+        batch_size: Maximum number of tables laid out on one page
+        offline: Capture without network access, as in ``df_to_image``
+
+    Raises:
+        ValueError: If inputs are inconsistent, a DataFrame is empty or the
+            format is invalid
+        HTMLRenderError: If the HTML cannot be generated
+        CaptureError: If screenshot capture fails (BrowserCrashedError and
+                      RenderTimeoutError for crashes and timeouts). All of
+                      these are RuntimeError subclasses.
+    """
+
+    if len(dfs) != len(output_paths):
+        raise ValueError("dfs and output_paths must have the same length")
+    if any(df.empty for df in dfs):
+        raise ValueError("DataFrame is empty")
+    if format.lower() not in ["png", "jpeg", "webp"]:
+        raise ValueError(f"Unsupported format: {format}")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1: {batch_size}")
+
+    style = _resolve_style(style, thousand_separator)
+
+    # 所有表格共享同一份样式；只要有一张表包含中文就加载中文字体
+    tables = []
+    font_files = None
+    for df in dfs:
+        df_processed, table_fonts, cell_classes = _prepare_dataframe(df, style)
+        font_files = font_files or table_fonts
+        tables.append(
+            build_table_context(df_processed, show_index, cell_classes)
+        )
+
+    asyncio.run(
+        _capture_batches(
+            _batch_pages(tables, output_paths, style, font_files, batch_size),
+            width,
+            format,
+            device_scale_factor,
+            offline,
+        )
+    )
 
 
 def df_to_html(
     df: pd.DataFrame,
     style: Optional[Union[str, TableStyle]] = None,
     show_index: bool = True,
-    thousand_separator: Optional[bool] = None
+    thousand_separator: Optional[bool] = None,
+    conditional_formats: Optional[Sequence[Any]] = None,
+    stats: Optional[RenderStats] = None
 ) -> str:
     """
     Convert a pandas DataFrame to styled HTML.
@@ -352,6 +1741,9 @@ def df_to_html(
         show_index: Whether to show the DataFrame index
         thousand_separator: Whether to add thousand separators to numbers.
                           If None, will use the style's thousand_separator setting.
+        conditional_formats: ColorScale / DataBar / Threshold rules. If None,
+                             will use the style's conditional_formats setting.
+        stats: Optional RenderStats filled with per-stage timings and sizes
     
     Returns:
         HTML string of the styled table
@@ -360,36 +1752,23 @@ def df_to_html(
     if df.empty:
         raise ValueError("DataFrame is empty")
     
-    # Handle style parameter
-    if isinstance(style, str):
-        if style in THEMES:
-            style = THEMES[style]
-        else:
-            raise ValueError(f"Unknown theme: {style}")
-    elif style is None:
-        style = TableStyle()
-    
-    # 处理千分位分隔符设置
-    if thousand_separator is not None:
-        style.thousand_separator = thousand_separator
-    
-    # 预处理DataFrame以应用格式化
-    df_processed = preprocess_dataframe_for_formatting(df, style.thousand_separator)
-    
-    # 自动检测中文字符并设置字体
-    font_files = None
-    if contains_chinese_characters(df_processed):
-        font_files = get_chinese_fonts()
-        if font_files:
-            # 使用方正兰亭圆字体作为主要字体
-            chinese_font_names = list(font_files.keys())
-            style.font_family = f"'{chinese_font_names[0]}', 'Microsoft YaHei', 'SimHei', sans-serif"
+    with measure_render(stats):
+        html_content = _build_table_html(
+            df,
+            style,
+            show_index,
+            thousand_separator,
+            conditional_formats,
+            stats,
+        )
     
-    return render_dataframe_html(df_processed, style, show_index, font_files)
+    return html_content
 
 
 def save_temp_html(html_content: str) -> str:
     """Save HTML content to a temporary file and return the path."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False) as f:
+    with tempfile.NamedTemporaryFile(
+        mode='w', suffix='.html', delete=False, encoding='utf-8'
+    ) as f:
         f.write(html_content)
         return f.name
@@ -0,0 +1,78 @@
+"""
+Exception types raised while rendering
+
+All of them derive from RuntimeError, which is what earlier versions raised
+for every rendering failure, so existing ``except RuntimeError`` handlers keep
+working.
+"""
+
+from typing import Any, List
+
+# Playwright 在页面/浏览器崩溃或断开时的错误信息片段
+_CRASH_MARKERS = (
+    "crash",
+    "has been closed",
+    "target closed",
+    "disconnected",
+    "browser closed",
+)
+
+
+class RenderError(RuntimeError):
+    """Base class for rendering failures."""
+
+
+class HTMLRenderError(RenderError):
+    """The HTML document could not be generated."""
+
+
+class CaptureError(RenderError):
+    """The browser failed to load or screenshot the table."""
+
+
+class BrowserCrashedError(CaptureError):
+    """The page or browser crashed or disconnected during a capture."""
+
+
+class RenderTimeoutError(CaptureError):
+    """A browser operation or the whole render exceeded its time limit."""
+
+
+def classify_capture_error(
+    error: BaseException, browser: Any = None
+) -> CaptureError:
+    """
+    Wrap an exception raised during capture in the matching CaptureError
+    subclass.
+
+    Args:
+        error: The original exception (usually a Playwright error)
+        browser: The browser used for the capture; a disconnected browser
+                 marks the failure as a crash regardless of the message
+    """
+    if isinstance(error, CaptureError):
+        return error
+    message = f"Failed to capture screenshot: {error}"
+    lowered = str(error).lower()
+    if type(error).__name__ == "TimeoutError":
+        return RenderTimeoutError(message)
+    browser_gone = browser is not None and not browser.is_connected()
+    if (browser_gone or type(error).__name__ == "TargetClosedError"
+            or any(marker in lowered for marker in _CRASH_MARKERS)):
+        return BrowserCrashedError(message)
+    return CaptureError(message)
+
+
+class BudgetExceededError(ValueError):
+    """
+    A render was rejected because its estimated cost exceeds a RenderBudget.
+
+    Attributes:
+        plan: The RenderPlan that was checked
+        violations: Descriptions of the exceeded limits
+    """
+
+    def __init__(self, plan: Any, violations: List[str]) -> None:
+        super().__init__(f"Render budget exceeded: {', '.join(violations)}")
+        self.plan = plan
+        self.violations = violations
@@ -0,0 +1,265 @@
+"""
+Compose several DataFrames into one titled grid image
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from .core import (
+    _CHINESE_PATTERN,
+    _capture_image,
+    _chinese_font_family,
+    _prepare_dataframe,
+    _resolve_style,
+    _validate_image_args,
+    get_chinese_fonts,
+)
+from .exceptions import HTMLRenderError
+from .outputs import OutputSpec
+from .stats import RenderStats, measure_render, measure_stage
+from .styles import TableStyle
+from .template import build_table_context, render_page_html
+
+Grid = Sequence[Union[pd.DataFrame, Sequence[pd.DataFrame]]]
+
+
+def _normalize_grid(grid: Grid) -> List[List[pd.DataFrame]]:
+    """A flat list of DataFrames is one row; otherwise every item is a row."""
+    if not grid:
+        raise ValueError("Layout is empty")
+    # 单元格类型在下面逐个检查
+    rows: List[List[Any]]
+    if all(isinstance(item, pd.DataFrame) for item in grid):
+        rows = [list(grid)]
+    else:
+        rows = [
+            [item] if isinstance(item, pd.DataFrame) else list(item)
+            for item in grid
+        ]
+    for row in rows:
+        if not row:
+            raise ValueError("Layout rows must not be empty")
+        for df in row:
+            if not isinstance(df, pd.DataFrame):
+                raise TypeError(
+                    f"Layout cells must be DataFrames, got {type(df).__name__}"
+                )
+            if df.empty:
+                raise ValueError("DataFrame is empty")
+    return rows
+
+
+def _normalize_titles(
+    titles: Optional[Sequence[Any]],
+    rows: List[List[pd.DataFrame]]
+) -> List[List[Optional[str]]]:
+    """Accept titles shaped like the grid or flat, in reading order."""
+    if titles is None:
+        return [[None] * len(row) for row in rows]
+    titles = list(titles)
+    if len(titles) == len(rows) and all(
+        isinstance(t, (list, tuple)) and len(t) == len(row)
+        for t, row in zip(titles, rows)
+    ):
+        return [list(t) for t in titles]
+    count = sum(len(row) for row in rows)
+    if len(titles) != count:
+        raise ValueError(
+            f"Expected {count} titles (one per table), got {len(titles)}"
+        )
+    flat = iter(titles)
+    return [[next(flat) for _ in row] for row in rows]
+
+
+def _build_layout_html(
+    grid: Grid,
+    titles: Optional[Sequence[Any]],
+    title: Optional[str],
+    style: Optional[Union[str, TableStyle]],
+    show_index: bool,
+    thousand_separator: Optional[bool],
+    conditional_formats: Optional[Sequence[Any]],
+    stats: Optional[RenderStats] = None
+) -> str:
+    rows = _normalize_grid(grid)
+    row_titles = _normalize_titles(titles, rows)
+    style = _resolve_style(style, thousand_separator, conditional_formats)
+
+    # 所有表格共用一份样式表和字体；任意一张表含中文即加载中文字体
+    font_files = None
+    cells: List[List[Dict[str, Any]]] = []
+    for row, labels in zip(rows, row_titles):
+        cells_row = []
+        for df, label in zip(row, labels):
+            df_processed, table_fonts, cell_classes = _prepare_dataframe(
+                df, style, stats
+            )
+            font_files = font_files or table_fonts
+            cells_row.append(
+                {
+                    "table": build_table_context(
+                        df_processed, show_index, cell_classes
+                    ),
+                    "title": label,
+                }
+            )
+        cells.append(cells_row)
+
+    # 标题不属于任何表格，单独检测；表格全是 ASCII 时标题中的中文也要加载中文字体
+    if font_files is None:
+        labels = [title] + [label for labels in row_titles for label in labels]
+        if any(
+            isinstance(label, str) and _CHINESE_PATTERN.search(label)
+            for label in labels
+        ):
+            font_files = get_chinese_fonts() or None
+            if font_files:
+                style.font_family = _chinese_font_family(font_files)
+
+    with measure_stage(stats, "render_html"):
+        html_content = render_page_html(
+            cells, style, font_files, layout="grid", title=title
+        )
+    if stats is not None:
+        stats.html_bytes = len(html_content.encode("utf-8"))
+    return html_content
+
+
+def layout_to_html(
+    grid: Grid,
+    titles: Optional[Sequence[Any]] = None,
+    title: Optional[str] = None,
+    style: Optional[Union[str, TableStyle]] = None,
+    show_index: bool = True,
+    thousand_separator: Optional[bool] = None,
+    conditional_formats: Optional[Sequence[Any]] = None
+) -> str:
+    """
+    Compose several DataFrames into one styled HTML page.
+
+    Takes the same layout arguments as ``render_layout``.
+
+    Returns:
+        HTML string of the composed page
+    """
+    return _build_layout_html(
+        grid,
+        titles,
+        title,
+        style,
+        show_index,
+        thousand_separator,
+        conditional_formats,
+    )
+
+
+def render_layout(
+    grid: Grid,
+    output_path: Optional[Union[str, Path]],
+    titles: Optional[Sequence[Any]] = None,
+    title: Optional[str] = None,
+    style: Optional[Union[str, TableStyle]] = None,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    format: str = "png",
+    show_index: bool = True,
+    thousand_separator: Optional[bool] = None,
+    device_scale_factor: float = 1.0,
+    outputs: Optional[Sequence[Union[OutputSpec, Dict[str, Any]]]] = None,
+    conditional_formats: Optional[Sequence[Any]] = None,
+    stats: Optional[RenderStats] = None,
+    offline: bool = False,
+    postprocess: Optional[Sequence[Any]] = None
+) -> None:
+    """
+    Render several DataFrames arranged in a grid into one image.
+
+    All tables share one HTML page (one stylesheet, one set of fonts) and are
+    captured with a single screenshot of the composed panel.
+
+    Example:
+        render_layout(
+            [[sales, costs], [summary]],
+            "daily.png",
+            titles=["Sales", "Costs", "Summary"],
+            title="Daily report",
+            style="blue",
+        )
+
+    Args:
+        grid: Rows of DataFrames, e.g. ``[[df1, df2], [df3]]``. A flat list of
+              DataFrames is laid out as a single row.
+        output_path: Path where the image will be saved. May be None when
+                     ``outputs`` is given.
+        titles: Per-table titles, shaped like ``grid`` or as a flat list in
+                reading order; None entries leave a table untitled
+        title: Optional title above the whole layout
+        style: Either a TableStyle object or theme name string, shared by all
+               tables
+        width: Viewport width in pixels (optional)
+        height: Viewport height in pixels (optional)
+        format: Image format ('png', 'jpeg', 'webp' or 'pdf')
+        show_index: Whether to show the DataFrame indexes
+        thousand_separator: Whether to add thousand separators to numbers.
+                          If None, the style's setting is used.
+        device_scale_factor: Pixel density of the capture
+        outputs: Additional images derived from the same capture (see
+                 ``df_to_image``)
+        conditional_formats: Rules applied to every table; rules naming
+                             columns only affect tables that have them
+        stats: Optional RenderStats filled with per-stage timings and sizes
+        offline: Capture without network access (see ``df_to_image``)
+        postprocess: Hooks run on the decoded capture (see ``df_to_image``)
+
+    Raises:
+        ValueError: If the layout is empty, a DataFrame is empty, the titles do
+                    not match the grid or the format is invalid
+        HTMLRenderError: If the HTML cannot be generated
+        CaptureError: If screenshot capture fails
+    """
+    rows = _normalize_grid(grid)
+    if format.lower() == "svg":
+        raise ValueError("SVG output is not supported for layouts; use 'pdf'")
+    specs = _validate_image_args(
+        rows[0][0],
+        output_path,
+        format,
+        device_scale_factor,
+        outputs,
+        postprocess=postprocess,
+    )
+
+    with measure_render(stats):
+        try:
+            html_content = _build_layout_html(
+                rows,
+                titles,
+                title,
+                style,
+                show_index,
+                thousand_separator,
+                conditional_formats,
+                stats,
+            )
+        except (ValueError, TypeError):
+            raise
+        except Exception as e:
+            raise HTMLRenderError(f"Failed to render HTML: {e}") from e
+
+        asyncio.run(
+            _capture_image(
+                html_content,
+                output_path,
+                specs,
+                width,
+                height,
+                format,
+                device_scale_factor,
+                stats,
+                offline=offline,
+                postprocess=postprocess,
+            )
+        )
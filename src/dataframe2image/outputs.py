@@ -0,0 +1,232 @@
+"""
+Derive multiple image outputs from a single screenshot capture
+"""
+
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from .postprocess import apply_postprocess
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Pillow format names for the supported image formats
+PIL_FORMATS = {"png": "PNG", "jpeg": "JPEG", "jpg": "JPEG", "webp": "WEBP"}
+
+# image_to_array 写入 memmap 时每批复制的字节数上限
+MEMMAP_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+@dataclass
+class OutputSpec:
+    """
+    One image derived from a capture.
+
+    Args:
+        path: Where the derived image is written
+        scale: Pixel density relative to CSS pixels (2.0 for HiDPI output)
+        width: Target width in pixels; height follows the aspect ratio.
+               Takes precedence over ``scale`` (useful for thumbnails)
+        height: Target height in pixels, used when ``width`` is not set
+        format: Image format ('png', 'jpeg', 'webp'); inferred from the
+                path suffix if not given
+        quality: Encoder quality for lossy formats
+    """
+
+    path: Union[str, Path]
+    scale: float = 1.0
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = None
+    quality: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.scale <= 0:
+            raise ValueError(f"Output scale must be positive: {self.scale}")
+        if self.format is None:
+            suffix = Path(self.path).suffix.lower().lstrip(".")
+            self.format = suffix if suffix in PIL_FORMATS else "png"
+        self.format = self.format.lower()
+        if self.format not in PIL_FORMATS:
+            raise ValueError(f"Unsupported format: {self.format}")
+
+
+def normalize_outputs(
+    outputs: Optional[Sequence[Union[OutputSpec, Dict[str, Any]]]]
+) -> List[OutputSpec]:
+    """Accept OutputSpec objects or plain dicts; return OutputSpec objects."""
+    specs = []
+    for spec in outputs or []:
+        if isinstance(spec, dict):
+            spec = OutputSpec(**spec)
+        elif not isinstance(spec, OutputSpec):
+            raise TypeError(f"Invalid output spec: {spec!r}")
+        specs.append(spec)
+    return specs
+
+
+def required_scale(
+    specs: Sequence[OutputSpec], device_scale_factor: float = 1.0
+) -> float:
+    """
+    Return the capture scale needed to serve every output without upsampling.
+
+    Width/height-driven outputs (thumbnails) are downsampled from whatever is
+    captured, so only ``scale``-driven outputs raise the capture scale.
+    """
+    scales = [
+        spec.scale
+        for spec in specs
+        if spec.width is None and spec.height is None
+    ]
+    return max([device_scale_factor] + scales)
+
+
+def _target_size(spec: OutputSpec, css_size: tuple) -> tuple:
+    css_width, css_height = css_size
+    if spec.width is not None:
+        ratio = spec.width / css_width
+        return spec.width, max(1, round(css_height * ratio))
+    if spec.height is not None:
+        ratio = spec.height / css_height
+        return max(1, round(css_width * ratio)), spec.height
+    return max(1, round(css_width * spec.scale)), max(
+        1, round(css_height * spec.scale)
+    )
+
+
+def save_image(
+    image: "Image.Image",
+    path: Union[str, Path, BinaryIO],
+    format: str,
+    quality: Optional[int] = None,
+) -> None:
+    """Encode a Pillow image to ``path`` (a path or binary file object)."""
+    from PIL import Image
+
+    pil_format = PIL_FORMATS[format.lower()]
+    if pil_format == "JPEG" and image.mode not in ("RGB", "L"):
+        # JPEG 不支持透明通道，铺白色背景
+        background = Image.new("RGB", image.size, "white")
+        background.paste(
+            image,
+            mask=image.getchannel("A") if "A" in image.getbands() else None,
+        )
+        image = background
+    options = {}
+    if quality is not None and pil_format in ("JPEG", "WEBP"):
+        options["quality"] = quality
+    if isinstance(path, (str, Path)):
+        path = str(path)
+    image.save(path, format=pil_format, **options)
+
+
+def convert_image_bytes(
+    data: bytes, format: str, quality: Optional[int] = None
+) -> bytes:
+    """Re-encode image bytes (e.g. a PNG screenshot) to another format."""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    if image.format == PIL_FORMATS[format.lower()] and quality is None:
+        return data
+    buffer = io.BytesIO()
+    save_image(image, buffer, format, quality)
+    return buffer.getvalue()
+
+
+def decode_screenshot(
+    data: bytes, mode: Optional[str] = "RGBA"
+) -> "Image.Image":
+    """Decode screenshot bytes into a loaded image (in ``mode`` if given)."""
+    from PIL import Image
+
+    image: "Image.Image" = Image.open(io.BytesIO(data))
+    image.load()
+    if mode is not None and image.mode != mode:
+        image = image.convert(mode)
+    return image
+
+
+def image_to_array(
+    image: "Image.Image", memmap_path: Optional[Union[str, Path]] = None
+) -> Any:
+    """
+    Pixels of ``image`` as a NumPy array of shape (height, width, channels).
+
+    With ``memmap_path`` the pixels are written into a ``numpy.memmap`` backed
+    by that file in bands of rows (about ``MEMMAP_CHUNK_BYTES`` each), so very
+    large images can be handed on without holding a second full copy in
+    memory next to the decoded image.
+    """
+    import numpy as np
+
+    if memmap_path is None:
+        return np.asarray(image)
+    channels = len(image.getbands())
+    shape = (
+        (image.height, image.width)
+        if channels == 1
+        else (image.height, image.width, channels)
+    )
+    array = np.memmap(memmap_path, dtype=np.uint8, mode="w+", shape=shape)
+    rows = max(1, MEMMAP_CHUNK_BYTES // max(1, image.width * channels))
+    for top in range(0, image.height, rows):
+        bottom = min(top + rows, image.height)
+        array[top:bottom] = np.asarray(
+            image.crop((0, top, image.width, bottom))
+        )
+    array.flush()
+    return array
+
+
+def write_outputs(
+    screenshot: bytes,
+    specs: Sequence[OutputSpec],
+    capture_scale: float,
+    postprocess: Optional[Sequence[Any]] = None,
+) -> None:
+    """
+    Write every output spec from one PNG screenshot.
+
+    The screenshot is decoded once; outputs whose size matches the capture and
+    that want PNG are written from the original bytes without re-encoding
+    (unless post-processing hooks changed the pixels).
+
+    Args:
+        screenshot: PNG bytes captured at ``capture_scale``
+        specs: Outputs to derive
+        capture_scale: Device scale factor used for the capture
+        postprocess: Hooks applied to the decoded image before encoding
+    """
+    if not specs:
+        return
+
+    # Pillow 只在需要派生图片时才导入
+    from PIL import Image
+
+    # Pillow 9.1 起重采样常量移到 Image.Resampling
+    lanczos = getattr(Image, "Resampling", Image).LANCZOS
+    image = decode_screenshot(screenshot, mode=None)
+    if postprocess:
+        image = apply_postprocess(image, postprocess, capture_scale)
+    css_size = (image.width / capture_scale, image.height / capture_scale)
+
+    for spec in specs:
+        size = _target_size(spec, css_size)
+        if size == image.size and spec.format == "png" and not postprocess:
+            Path(spec.path).write_bytes(screenshot)
+            continue
+        derived = image if size == image.size else image.resize(size, lanczos)
+        save_image(derived, spec.path, spec.format or "png", spec.quality)
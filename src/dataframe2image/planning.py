@@ -0,0 +1,297 @@
+"""
+Estimate the cost of a render before doing it, and enforce render budgets
+"""
+
+import math
+import re
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .styles import TableStyle
+
+# 估算模型的经验常数（Arial 类字体、默认模板），只求数量级准确
+CHAR_WIDTH_EM = 0.56          # 半角字符平均宽度
+WIDE_CHAR_WIDTH_EM = 1.0      # 全角（中日韩）字符宽度
+BOLD_WIDTH_FACTOR = 1.08      # 表头加粗
+LINE_HEIGHT_EM = 1.15
+MAX_CELL_TEXT_WIDTH = 200     # 模板中 td/th 的 max-width
+SAMPLE_ROWS = 500             # 头尾各取的行数
+
+HTML_BASE_BYTES = 5000        # <head> 与样式表
+HTML_ROW_BYTES = 150
+HTML_CELL_BYTES = 61
+HTML_HEADER_CELL_BYTES = 55
+
+SECONDS_FIXED = 1.6           # 启动浏览器、加载页面、等待渲染稳定
+SECONDS_PER_CELL = 2e-5       # 布局与绘制
+SECONDS_PER_MEGAPIXEL = 0.05  # 截图编码
+
+BUDGET_ACTIONS = ("reject", "truncate", "tile")
+
+_WIDE_CHARS = re.compile(
+    "[\u1100-\u115f\u2e80-\ua4cf"
+    "\uac00-\ud7a3\uf900-\ufaff\ufe30-\ufe4f\uff00-\uff60\uffe0-\uffe6]"
+)
+_PX = re.compile(r"(-?\d+(?:\.\d+)?)px")
+
+
+@dataclass
+class RenderPlan:
+    """
+    Estimated cost of rendering one DataFrame.
+
+    Sizes are estimates from the row/column counts, sampled string lengths and
+    the style's font size, padding and borders; expect them within tens of
+    percent of the real render, not pixel-exact.
+
+    Attributes:
+        rows: Data rows rendered
+        columns: Data columns rendered (index columns not included)
+        width: Estimated table width in CSS pixels
+        height: Estimated table height in CSS pixels
+        pixel_width: Output image width (``width * device_scale_factor``)
+        pixel_height: Output image height
+        html_bytes: Estimated size of the generated HTML
+        estimated_seconds: Rough expected render time
+        row_height: Estimated height of one data row in CSS pixels
+        header_height: Estimated height of the header (and table borders)
+        device_scale_factor: Pixel density used for the pixel sizes
+    """
+
+    rows: int
+    columns: int
+    width: int
+    height: int
+    pixel_width: int
+    pixel_height: int
+    html_bytes: int
+    estimated_seconds: float
+    row_height: float
+    header_height: float
+    device_scale_factor: float = 1.0
+    _row_bytes: float = field(default=0.0, repr=False)
+    _index_levels: int = field(default=0, repr=False)
+
+    @property
+    def megapixels(self) -> float:
+        return self.pixel_width * self.pixel_height / 1e6
+
+    def with_rows(self, rows: int) -> "RenderPlan":
+        """The same plan cut to the first ``rows`` rows."""
+        height = math.ceil(self.header_height + rows * self.row_height)
+        pixel_height = math.ceil(height * self.device_scale_factor)
+        html_bytes = round(
+            HTML_BASE_BYTES
+            + self.columns * HTML_HEADER_CELL_BYTES
+            + rows * self._row_bytes
+        )
+        return replace(
+            self,
+            rows=rows,
+            height=height,
+            pixel_height=pixel_height,
+            html_bytes=html_bytes,
+            estimated_seconds=_estimate_seconds(
+                rows * (self.columns + self._index_levels),
+                self.pixel_width * pixel_height,
+            ),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {k: v for k, v in asdict(self).items() if not k.startswith("_")}
+        data["megapixels"] = round(self.megapixels, 3)
+        return data
+
+
+@dataclass
+class RenderBudget:
+    """
+    Limits checked by ``df_to_image`` before any expensive work.
+
+    Args:
+        max_rows: Maximum data rows per image
+        max_pixels: Maximum output pixels (width x height) per image
+        max_height: Maximum output height in pixels per image
+        max_html_bytes: Maximum generated HTML size per image
+        max_seconds: Maximum estimated render time per image
+        action: What to do when a limit is exceeded:
+                'reject' raises BudgetExceededError, 'truncate' renders only
+                the first rows that fit, 'tile' splits the rows over several
+                images (``<stem>_part001<suffix>``, ``<stem>_part002<suffix>``,
+                ...)
+    """
+
+    max_rows: Optional[int] = None
+    max_pixels: Optional[int] = None
+    max_height: Optional[int] = None
+    max_html_bytes: Optional[int] = None
+    max_seconds: Optional[float] = None
+    action: str = "reject"
+
+    def __post_init__(self) -> None:
+        if self.action not in BUDGET_ACTIONS:
+            raise ValueError(
+                f"Unknown budget action: {self.action} "
+                f"(expected one of {BUDGET_ACTIONS})"
+            )
+
+    def violations(self, plan: RenderPlan) -> List[str]:
+        """Human-readable descriptions of every limit ``plan`` exceeds."""
+        checks = [
+            ("rows", plan.rows, self.max_rows),
+            ("pixels", plan.pixel_width * plan.pixel_height, self.max_pixels),
+            ("height", plan.pixel_height, self.max_height),
+            ("html_bytes", plan.html_bytes, self.max_html_bytes),
+            ("seconds", plan.estimated_seconds, self.max_seconds),
+        ]
+        return [
+            f"{name} {value:g} > {limit:g}" for name, value, limit in checks
+            if limit is not None and value > limit
+        ]
+
+    def max_rows_within(self, plan: RenderPlan) -> int:
+        """Largest row count of ``plan`` within the limits (0 if none fits)."""
+        low, high = 0, plan.rows
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.violations(plan.with_rows(middle)):
+                high = middle - 1
+            else:
+                low = middle
+        return low
+
+
+def _padding_px(padding: str) -> Tuple[float, float]:
+    """Vertical and horizontal padding of a CSS padding shorthand, in px."""
+    values = [float(v) for v in _PX.findall(padding)]
+    if not values:
+        return 8.0, 12.0
+    vertical = values[0]
+    horizontal = values[1] if len(values) > 1 else values[0]
+    return vertical, horizontal
+
+
+def _display_width(texts: pd.Series, font_size: float) -> float:
+    """Widest sampled text in CSS pixels, capped like the template's cells."""
+    if texts.empty:
+        return 0.0
+    lengths = texts.str.len()
+    wide = texts.str.count(_WIDE_CHARS.pattern)
+    widths = (lengths - wide) * CHAR_WIDTH_EM + wide * WIDE_CHAR_WIDTH_EM
+    return min(float(widths.max()) * font_size, MAX_CELL_TEXT_WIDTH)
+
+
+def _sample(df: pd.DataFrame) -> pd.DataFrame:
+    if len(df) <= 2 * SAMPLE_ROWS:
+        return df
+    sample: pd.DataFrame = pd.concat(
+        [df.head(SAMPLE_ROWS), df.tail(SAMPLE_ROWS)]
+    )
+    return sample
+
+
+def _estimate_seconds(cells: int, pixels: float) -> float:
+    return (
+        SECONDS_FIXED
+        + cells * SECONDS_PER_CELL
+        + pixels / 1e6 * SECONDS_PER_MEGAPIXEL
+    )
+
+
+def plan_render(
+    df: pd.DataFrame,
+    style: Optional[Union[str, TableStyle]] = None,
+    show_index: bool = True,
+    thousand_separator: Optional[bool] = None,
+    device_scale_factor: float = 1.0
+) -> RenderPlan:
+    """
+    Estimate the size and cost of rendering ``df`` without rendering it.
+
+    Only the first and last rows are formatted and measured, so planning a
+    multi-million-row frame is cheap.
+
+    Args:
+        df: The DataFrame to plan for
+        style: Either a TableStyle object or theme name string
+        show_index: Whether the index is rendered
+        thousand_separator: Whether numbers get thousand separators. If None,
+                            will use the style's thousand_separator setting.
+        device_scale_factor: Pixel density of the capture
+
+    Returns:
+        RenderPlan with the estimated dimensions, HTML size and render time
+    """
+    from .core import _resolve_style, preprocess_dataframe_for_formatting
+
+    style = _resolve_style(style, thousand_separator)
+    font_size = float(style.font_size)
+    pad_v, pad_h = _padding_px(style.cell_padding)
+    border = float(style.border_width)
+
+    sample = preprocess_dataframe_for_formatting(
+        _sample(df),
+        style.thousand_separator,
+        style.datetime_format,
+        style.timezone,
+    )
+    text_bytes = 0.0
+    column_widths = []
+    for position in range(sample.shape[1]):
+        texts = (
+            sample.iloc[:, position]
+            .astype(str)
+            .where(sample.iloc[:, position].notna(), "")
+        )
+        label = df.columns[position]
+        labels = pd.Series(
+            [
+                str(part)
+                for part in (label if isinstance(label, tuple) else (label,))
+            ]
+        )
+        width = max(_display_width(texts, font_size),
+                    _display_width(labels, font_size) * BOLD_WIDTH_FACTOR)
+        column_widths.append(width + 2 * pad_h)
+        if len(texts):
+            text_bytes += texts.str.encode("utf-8").map(len).mean()
+
+    index_levels = df.index.nlevels if show_index else 0
+    if show_index:
+        index_frame = sample.index.to_frame(index=False)
+        for position in range(index_levels):
+            texts = index_frame.iloc[:, position].astype(str)
+            column_widths.append(
+                _display_width(texts, font_size) * BOLD_WIDTH_FACTOR
+                + 2 * pad_h
+                + 2
+            )
+            text_bytes += texts.str.encode("utf-8").map(len).mean()
+
+    row_height = math.ceil(font_size * LINE_HEIGHT_EM) + 2 * pad_v + border
+    header_rows = df.columns.nlevels
+    header_height = header_rows * row_height + 2 * border
+    rows = len(df)
+    columns = df.shape[1]
+
+    plan = RenderPlan(
+        rows=rows,
+        columns=columns,
+        width=math.ceil(sum(column_widths) + 2 * border),
+        height=0,
+        pixel_width=0,
+        pixel_height=0,
+        html_bytes=0,
+        estimated_seconds=0.0,
+        row_height=row_height,
+        header_height=header_height,
+        device_scale_factor=device_scale_factor,
+        _row_bytes=HTML_ROW_BYTES
+        + (columns + index_levels) * HTML_CELL_BYTES
+        + text_bytes,
+        _index_levels=index_levels,
+    )
+    plan.pixel_width = math.ceil(plan.width * device_scale_factor)
+    return plan.with_rows(rows)
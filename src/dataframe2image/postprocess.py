@@ -0,0 +1,183 @@
+"""
+Post-processing hooks applied to the decoded screenshot (watermark, border,
+background)
+
+Hooks run on the Pillow image decoded once from the capture, before any
+output is encoded. Sizes are given in CSS pixels and multiplied by the
+capture's device scale factor, so a hook looks the same at every density.
+Any callable taking and returning a ``PIL.Image`` can be used as a hook too.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+WATERMARK_POSITIONS = (
+    "top-left",
+    "top-right",
+    "bottom-left",
+    "bottom-right",
+    "center",
+)
+
+
+def _scaled(value: float, scale: float) -> int:
+    return max(0, round(value * scale))
+
+
+@dataclass
+class Background:
+    """
+    Flatten transparency onto a solid color, optionally with a margin around
+    the table.
+
+    Args:
+        color: Any Pillow color, e.g. ``"white"`` or ``"#f0f0f0"``
+        padding: Margin around the image in CSS pixels
+    """
+
+    color: str = "white"
+    padding: float = 0
+
+    def apply(self, image: "Image.Image", scale: float = 1.0) -> "Image.Image":
+        from PIL import Image
+
+        pad = _scaled(self.padding, scale)
+        canvas = Image.new(
+            "RGBA", (image.width + 2 * pad, image.height + 2 * pad), self.color
+        )
+        canvas.alpha_composite(image.convert("RGBA"), (pad, pad))
+        return canvas
+
+
+@dataclass
+class Border:
+    """
+    Solid border drawn around the image (the image grows by twice the width).
+
+    Args:
+        width: Border width in CSS pixels
+        color: Any Pillow color
+    """
+
+    width: float = 1
+    color: str = "#dddddd"
+
+    def __post_init__(self) -> None:
+        if self.width < 0:
+            raise ValueError(
+                f"Border width must not be negative: {self.width}"
+            )
+
+    def apply(self, image: "Image.Image", scale: float = 1.0) -> "Image.Image":
+        from PIL import Image
+
+        width = _scaled(self.width, scale)
+        if width == 0:
+            return image
+        canvas = Image.new(
+            "RGBA",
+            (image.width + 2 * width, image.height + 2 * width),
+            self.color,
+        )
+        canvas.paste(image.convert("RGBA"), (width, width))
+        return canvas
+
+
+@dataclass
+class Watermark:
+    """
+    Semi-transparent text stamped onto the image.
+
+    Args:
+        text: Watermark text
+        position: One of ``WATERMARK_POSITIONS``
+        opacity: 0 (invisible) to 1 (opaque)
+        color: Any Pillow color
+        font_size: Text size in CSS pixels
+        margin: Distance from the image edges in CSS pixels
+        font_path: TrueType font file; Pillow's default font if None (use a
+                   CJK font here for Chinese text)
+    """
+
+    text: str
+    position: str = "bottom-right"
+    opacity: float = 0.3
+    color: str = "black"
+    font_size: float = 14
+    margin: float = 8
+    font_path: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.position not in WATERMARK_POSITIONS:
+            raise ValueError(
+                f"Unknown watermark position: {self.position} "
+                f"(expected one of {WATERMARK_POSITIONS})"
+            )
+        if not 0 <= self.opacity <= 1:
+            raise ValueError(
+                f"opacity must be between 0 and 1: {self.opacity}"
+            )
+
+    def _font(self, size: int) -> Any:
+        from PIL import ImageFont
+
+        if self.font_path is not None:
+            return ImageFont.truetype(self.font_path, size)
+        try:
+            return ImageFont.load_default(size)
+        except TypeError:  # Pillow < 10.1 只有固定大小的默认字体
+            return ImageFont.load_default()
+
+    def _origin(
+        self,
+        image_size: Tuple[int, int],
+        text_size: Tuple[float, float],
+        margin: int,
+    ) -> Tuple[float, float]:
+        (width, height), (text_width, text_height) = image_size, text_size
+        if self.position == "center":
+            return (width - text_width) // 2, (height - text_height) // 2
+        vertical, horizontal = self.position.split("-")
+        x = margin if horizontal == "left" else width - text_width - margin
+        y = margin if vertical == "top" else height - text_height - margin
+        return x, y
+
+    def apply(self, image: "Image.Image", scale: float = 1.0) -> "Image.Image":
+        from PIL import Image, ImageColor, ImageDraw
+
+        font = self._font(max(1, _scaled(self.font_size, scale)))
+        overlay = Image.new("RGBA", image.size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(overlay)
+        left, top, right, bottom = draw.textbbox((0, 0), self.text, font=font)
+        x, y = self._origin(
+            image.size,
+            (right - left, bottom - top),
+            _scaled(self.margin, scale),
+        )
+        fill = ImageColor.getrgb(self.color)[:3] + (round(255 * self.opacity),)
+        draw.text((x - left, y - top), self.text, font=font, fill=fill)
+        return Image.alpha_composite(image.convert("RGBA"), overlay)
+
+
+def apply_postprocess(
+    image: "Image.Image",
+    hooks: Optional[Sequence[Any]],
+    scale: float = 1.0
+) -> "Image.Image":
+    """
+    Run ``hooks`` on ``image`` in order and return the result.
+
+    Built-in hooks (Background, Border, Watermark) get the capture ``scale``;
+    plain callables are called with the image only.
+    """
+    for hook in hooks or ():
+        if hasattr(hook, "apply"):
+            image = hook.apply(image, scale)
+        elif callable(hook):
+            image = hook(image)
+        else:
+            raise TypeError(f"Invalid post-processing hook: {hook!r}")
+    return image
@@ -0,0 +1,923 @@
+"""
+Long-lived renderer that keeps a Chromium instance warm across captures
+"""
+
+import asyncio
+import inspect
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Sized,
+    Union,
+)
+
+import pandas as pd
+
+from .core import (
+    _async_playwright,
+    _capture_image,
+    _launch_browser,
+    _render_html,
+    _validate_image_args,
+    _with_timeout,
+)
+from .exceptions import BrowserCrashedError
+from .outputs import OutputSpec
+from .stats import RenderStats, measure_render
+from .styles import TableStyle
+from .warm import WarmPagePool
+
+
+def _process_rss(pid: int) -> Optional[int]:
+    """Resident set size of one process in bytes, or None if unavailable."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        try:
+            return int(psutil.Process(pid).memory_info().rss)
+        except psutil.Error:
+            return None
+    # 没有 psutil 时在 Linux 上读取 /proc
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+async def browser_rss_bytes(browser: Any) -> Optional[int]:
+    """
+    Total RSS of a Chromium browser and its child processes.
+
+    The process ids are read over CDP (``SystemInfo.getProcessInfo``), so
+    only this browser's processes are counted even when several browsers run
+    side by side. Returns None if the information is not available.
+    """
+    try:
+        session = await browser.new_browser_cdp_session()
+        try:
+            info = await session.send("SystemInfo.getProcessInfo")
+        finally:
+            await session.detach()
+    except Exception:
+        return None
+    sizes = [
+        size
+        for size in (
+            _process_rss(int(p["id"])) for p in info.get("processInfo", [])
+        )
+        if size is not None
+    ]
+    return sum(sizes) if sizes else None
+
+
+@dataclass
+class RenderJob:
+    """
+    One render of a batch: the DataFrame, where to write it and
+    ``Renderer.render`` options.
+    """
+
+    df: pd.DataFrame
+    output_path: Optional[Union[str, Path]] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RenderResult:
+    """
+    Outcome of one job of a batch.
+
+    Attributes:
+        index: Position of the job in the submitted jobs
+        job: The job itself
+        data: Captured bytes (None unless the job succeeded)
+        error: Exception the job failed with (RenderTimeoutError past its
+               deadline)
+        cancelled: Whether the job was aborted by ``RenderBatch.cancel``
+        seconds: Wall time of the job
+    """
+
+    index: int
+    job: RenderJob
+    data: Optional[bytes] = None
+    error: Optional[BaseException] = None
+    cancelled: bool = False
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.cancelled
+
+
+def _as_job(item: Any) -> RenderJob:
+    """
+    Accept RenderJob objects, DataFrames, ``(df, path[, options])`` tuples and
+    dicts.
+    """
+    if isinstance(item, RenderJob):
+        return item
+    if isinstance(item, pd.DataFrame):
+        return RenderJob(item)
+    if isinstance(item, dict):
+        return RenderJob(**item)
+    if isinstance(item, tuple):
+        return RenderJob(*item)
+    raise TypeError(f"Invalid render job: {item!r}")
+
+
+_BATCH_DONE = object()
+
+
+class RenderBatch:
+    """
+    Jobs running on a Renderer (or RendererPool), started by ``render_batch``.
+
+    ``concurrency`` workers take jobs from the input one at a time, so HTML is
+    only built for jobs about to render and lazy iterables work. Iterate with
+    ``async for`` to receive RenderResults in completion order, or ``await
+    wait()`` for all of them in submission order. A failed or timed-out job
+    is reported in its result and does not stop the batch.
+
+    At most ``concurrency`` finished results wait to be consumed; a worker
+    takes its next job only once its result has been queued, so a consumer
+    that falls behind pauses the batch instead of piling up image bytes.
+
+    ``cancel()`` stops the batch cooperatively: no further jobs are started
+    and running ones are aborted (their pages are closed) and reported with
+    ``cancelled=True``. Leaving ``async with`` cancels an unfinished batch and
+    discards the results nobody consumed.
+
+    Attributes:
+        total: Number of jobs if the input has a length, else None
+        started: Jobs taken from the input so far
+        done: Jobs finished (succeeded, failed or cancelled)
+        failed: Jobs that failed or were cancelled
+    """
+
+    def __init__(
+        self,
+        renderer: Any,
+        jobs: Iterable[Any],
+        concurrency: int,
+        timeout: Optional[float] = None,
+        on_result: Optional[Callable[[RenderResult], Any]] = None
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1: {concurrency}")
+        self.total: Optional[int] = (
+            len(jobs) if isinstance(jobs, Sized) else None
+        )
+        self.started = 0
+        self.done = 0
+        self.failed = 0
+        self.cancelled = False
+        self._renderer = renderer
+        self._jobs = enumerate(jobs)
+        self._timeout = timeout
+        self._on_result = on_result
+        self._results: "asyncio.Queue[Any]" = asyncio.Queue(concurrency)
+        self._discard = False
+        self._running: Set["asyncio.Future[bytes]"] = set()
+        self._error: Optional[BaseException] = None
+        self._exhausted = False
+        self._live_workers = concurrency
+        self._workers = [
+            asyncio.ensure_future(self._work()) for _ in range(concurrency)
+        ]
+
+    def cancel(self) -> None:
+        """Start no further jobs and abort the running ones."""
+        self.cancelled = True
+        for task in list(self._running):
+            task.cancel()
+
+    async def _work(self) -> None:
+        try:
+            for index, item in self._jobs:
+                if self.cancelled:
+                    break
+                self.started += 1
+                await self._run(index, _as_job(item))
+        except BaseException as e:
+            cancelled = isinstance(e, asyncio.CancelledError)
+            if self._error is None and not cancelled:
+                self._error = e
+            self.cancel()
+        finally:
+            self._live_workers -= 1
+            if self._live_workers == 0:
+                await self._emit(_BATCH_DONE)
+
+    async def _emit(self, item: Any) -> None:
+        # 队列有界：结果未被取走时等待，退出 async with 后直接丢弃
+        if not self._discard:
+            await self._results.put(item)
+
+    async def _run(self, index: int, job: RenderJob) -> None:
+        result = RenderResult(index, job)
+        options = dict(job.options)
+        if self._timeout is not None:
+            options.setdefault("timeout", self._timeout)
+        start = time.perf_counter()
+        task = asyncio.ensure_future(
+            self._renderer.render(job.df, job.output_path, **options)
+        )
+        self._running.add(task)
+        try:
+            result.data = await task
+        except asyncio.CancelledError:
+            # 只有 cancel() 取消的任务记为已取消；工作协程自身被取消时继续向上抛出
+            if not (self.cancelled and task.cancelled()):
+                raise
+            result.cancelled = True
+        except Exception as e:
+            result.error = e
+        finally:
+            self._running.discard(task)
+        result.seconds = time.perf_counter() - start
+
+        self.done += 1
+        if not result.ok:
+            self.failed += 1
+        if self._on_result is not None:
+            value = self._on_result(result)
+            if inspect.isawaitable(value):
+                await value
+        await self._emit(result)
+
+    def __aiter__(self) -> AsyncIterator[RenderResult]:
+        return self
+
+    async def __anext__(self) -> RenderResult:
+        if self._exhausted:
+            raise StopAsyncIteration
+        item = await self._results.get()
+        if item is _BATCH_DONE:
+            self._exhausted = True
+            if self._error is not None:
+                raise self._error
+            raise StopAsyncIteration
+        result: RenderResult = item
+        return result
+
+    async def wait(self) -> List[RenderResult]:
+        """Wait for every job and return the results in submission order."""
+        results = [result async for result in self]
+        return sorted(results, key=lambda result: result.index)
+
+    async def __aenter__(self) -> "RenderBatch":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.cancel()
+        self._discard = True
+        # 清空队列，放行因队列已满而等待的工作协程
+        while not self._results.empty():
+            self._results.get_nowait()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+
+class Renderer:
+    """
+    Render many DataFrames on one warm browser.
+
+    ``df_to_image`` launches and closes Chromium on every call. A Renderer
+    launches it once and opens a fresh page per render, with at most
+    ``max_concurrency`` pages rendering at the same time.
+
+    For long-running processes the browser is managed: it is recycled after
+    ``max_pages_per_browser`` pages or once its processes use more than
+    ``max_browser_rss_mb`` MB, relaunched transparently after a crash or
+    disconnect, and a render that fails because the browser crashed is retried
+    ``retries`` times on a fresh browser. Renders still running on a recycled
+    browser finish before it is closed. Each RSS sample opens a CDP session,
+    so the memory is only sampled every ``rss_check_interval`` renders.
+
+    ``offline=True`` launches with ``OFFLINE_CHROMIUM_ARGS`` and captures every
+    page without network access (see ``df_to_image``).
+
+    ``warm_styles`` (theme names or TableStyle objects, e.g. ``list(THEMES)``)
+    pre-creates ``warm_pages_per_style`` pages per style whenever a browser is
+    launched, with the stylesheet and fonts already loaded. Renders in those
+    styles then only swap in the table markup, so the first render after
+    startup is as fast as the steady state. Other styles get warm pages after
+    their first render.
+
+    ``job_timeout`` is the default deadline in seconds of every render (see
+    ``render``). ``render_batch`` runs many jobs and streams their results.
+
+    Example:
+        async with Renderer(max_concurrency=4) as renderer:
+            await asyncio.gather(*(
+                renderer.render(df, f"{i}.png") for i, df in enumerate(dfs)
+            ))
+    """
+
+    rss_check_interval = 10  # 两次内存采样之间的渲染数
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_pages_per_browser: Optional[int] = None,
+        max_browser_rss_mb: Optional[float] = None,
+        retries: int = 1,
+        offline: bool = False,
+        warm_styles: Optional[Sequence[Union[str, TableStyle]]] = None,
+        warm_pages_per_style: int = 1,
+        job_timeout: Optional[float] = None
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1: {max_concurrency}"
+            )
+        if max_pages_per_browser is not None and max_pages_per_browser < 1:
+            raise ValueError(
+                "max_pages_per_browser must be at least 1: "
+                f"{max_pages_per_browser}"
+            )
+        if retries < 0:
+            raise ValueError(f"retries must not be negative: {retries}")
+        self.max_concurrency = max_concurrency
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_browser_rss_mb = max_browser_rss_mb
+        self.retries = retries
+        self.offline = offline
+        self.warm_styles = (
+            list(warm_styles) if warm_styles is not None else None
+        )
+        self.warm_pages_per_style = warm_pages_per_style
+        self.job_timeout = job_timeout
+        self._playwright = None
+        self._browser = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self._browser_active: Dict[Any, int] = {}  # 每个浏览器上正在渲染的页面数
+        self._warm_pools: Dict[Any, WarmPagePool] = {}
+        self._pages_served = 0
+        self._renders_since_rss = 0
+        self.active = 0  # 正在进行（含排队）的渲染数
+        self.launches = 0
+        self.crashes = 0
+        self.recycles = 0
+        self.retried = 0
+
+    def counters(self) -> Dict[str, int]:
+        """Lifecycle counters, e.g. for a metrics endpoint."""
+        return {
+            "browser_launches": self.launches,
+            "browser_crashes": self.crashes,
+            "browser_recycles": self.recycles,
+            "renders_retried": self.retried,
+        }
+
+    async def start(self) -> "Renderer":
+        """Launch the browser. Called automatically by ``async with``."""
+        if self._playwright is None:
+            self._playwright = await _async_playwright().start()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._launch_lock = asyncio.Lock()
+        await self._ensure_browser()
+        return self
+
+    async def close(self) -> None:
+        """Close all browsers and stop Playwright."""
+        browsers = list(self._browser_active)
+        if (
+            self._browser is not None
+            and self._browser not in self._browser_active
+        ):
+            browsers.append(self._browser)
+        self._browser = None
+        self._browser_active.clear()
+        self._warm_pools.clear()
+        for browser in browsers:
+            await self._close_quietly(browser)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self) -> "Renderer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @staticmethod
+    async def _close_quietly(browser: Any) -> None:
+        try:
+            await browser.close()
+        except Exception:
+            pass  # 已崩溃或已断开的浏览器关闭时会报错
+
+    def _on_disconnected(self, browser: Any) -> None:
+        if browser is self._browser:
+            self._browser = None
+
+    async def _ensure_browser(self) -> Any:
+        if self._launch_lock is None:
+            raise RuntimeError("Renderer is not started")
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                browser = await _launch_browser(self._playwright, self.offline)
+                browser.on("disconnected", self._on_disconnected)
+                if self.warm_styles is not None:
+                    pool = WarmPagePool(
+                        browser,
+                        offline=self.offline,
+                        max_idle=self.max_concurrency,
+                    )
+                    try:
+                        await pool.warm(
+                            self.warm_styles, self.warm_pages_per_style
+                        )
+                    except BaseException:
+                        await self._close_quietly(browser)
+                        raise
+                    self._warm_pools[browser] = pool
+                self._browser = browser
+                self._browser_active[browser] = 0
+                self._pages_served = 0
+                self._renders_since_rss = 0
+                self.launches += 1
+            return self._browser
+
+    async def _acquire_browser(self) -> Any:
+        browser = await self._ensure_browser()
+        self._browser_active[browser] = (
+            self._browser_active.get(browser, 0) + 1
+        )
+        self._pages_served += 1
+        return browser
+
+    async def _needs_recycle(self, browser: Any) -> bool:
+        if (
+            self.max_pages_per_browser is not None
+            and self._pages_served >= self.max_pages_per_browser
+        ):
+            return True
+        if self.max_browser_rss_mb is not None:
+            self._renders_since_rss += 1
+            if self._renders_since_rss < self.rss_check_interval:
+                return False
+            self._renders_since_rss = 0
+            rss = await browser_rss_bytes(browser)
+            if rss is not None and rss > self.max_browser_rss_mb * 1024 * 1024:
+                return True
+        return False
+
+    async def _release_browser(
+        self, browser: Any, crashed: bool = False
+    ) -> None:
+        """
+        Return a browser after a render and retire it if needed.
+
+        Crashed browsers are dropped at once; recycled ones are closed when
+        their last running render releases them.
+        """
+        remaining = self._browser_active.get(browser, 1) - 1
+        self._browser_active[browser] = remaining
+
+        if crashed:
+            self.crashes += 1
+            if browser is self._browser:
+                self._browser = None
+        elif browser is self._browser and await self._needs_recycle(browser):
+            self.recycles += 1
+            self._browser = None
+
+        if browser is not self._browser and (crashed or remaining <= 0):
+            self._browser_active.pop(browser, None)
+            self._warm_pools.pop(browser, None)
+            await self._close_quietly(browser)
+
+    async def render(
+        self,
+        df: pd.DataFrame,
+        output_path: Optional[Union[str, Path]] = None,
+        style: Optional[Union[str, TableStyle]] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        format: str = "png",
+        show_index: bool = True,
+        thousand_separator: Optional[bool] = None,
+        device_scale_factor: float = 1.0,
+        outputs: Optional[Sequence[Union[OutputSpec, Dict[str, Any]]]] = None,
+        conditional_formats: Optional[Sequence[Any]] = None,
+        stats: Optional[RenderStats] = None,
+        timeout: Optional[float] = None
+    ) -> bytes:
+        """
+        Render a DataFrame to an image on the shared browser.
+
+        Takes the same arguments as ``df_to_image`` and returns the captured
+        screenshot bytes (PNG when ``outputs`` is given). ``output_path`` may
+        be None to only get the bytes back.
+
+        ``timeout`` (default ``job_timeout``) bounds the whole render including
+        the wait for a free page; when it passes, the render is cancelled, its
+        page is closed and RenderTimeoutError is raised. Cancelling the calling
+        task aborts the render the same way. The HTML is built in the loop's
+        default executor so the loop stays responsive; a build still running
+        at the deadline finishes in its thread and is discarded.
+
+        Raises:
+            ValueError: If the DataFrame is empty or invalid format specified
+            HTMLRenderError: If the HTML cannot be generated
+            BrowserCrashedError: If the browser crashed on every attempt
+            RenderTimeoutError: If a browser operation or the render timed out
+            CaptureError: For other capture failures
+            RuntimeError: If the renderer is not started
+        """
+        if self._playwright is None:
+            raise RuntimeError("Renderer is not started")
+
+        specs = _validate_image_args(
+            df,
+            output_path,
+            format,
+            device_scale_factor,
+            outputs,
+            require_output=False,
+        )
+
+        self.active += 1
+        try:
+            return await _with_timeout(
+                self._render(
+                    df,
+                    output_path,
+                    specs,
+                    style,
+                    width,
+                    height,
+                    format,
+                    show_index,
+                    thousand_separator,
+                    device_scale_factor,
+                    conditional_formats,
+                    stats,
+                ),
+                self.job_timeout if timeout is None else timeout,
+            )
+        finally:
+            self.active -= 1
+
+    def render_batch(
+        self,
+        jobs: Iterable[Any],
+        timeout: Optional[float] = None,
+        on_result: Optional[Callable[[RenderResult], Any]] = None,
+        concurrency: Optional[int] = None
+    ) -> RenderBatch:
+        """
+        Start rendering many jobs; must be called from a running event loop.
+
+        Example:
+            async with renderer.render_batch(
+                [(df, f"{i}.png") for i, df in enumerate(dfs)], timeout=30
+            ) as batch:
+                async for result in batch:
+                    print(f"{batch.done}/{batch.total}", result.ok)
+
+        Args:
+            jobs: RenderJob objects, DataFrames, ``(df, output_path[,
+                  options])`` tuples or dicts with the RenderJob fields; may
+                  be a lazy iterable
+            timeout: Deadline in seconds of each job (default ``job_timeout``);
+                     a job's own ``options["timeout"]`` takes precedence
+            on_result: Called with every RenderResult as it finishes (may be a
+                       coroutine function), e.g. to report progress
+            concurrency: Jobs in flight at once (default ``max_concurrency``)
+
+        Returns:
+            RenderBatch to iterate, wait for or cancel
+        """
+        return RenderBatch(
+            self, jobs, concurrency or self.max_concurrency, timeout, on_result
+        )
+
+    async def _render(
+        self,
+        df: pd.DataFrame,
+        output_path: Optional[Union[str, Path]],
+        specs: List[OutputSpec],
+        style: Optional[Union[str, TableStyle]],
+        width: Optional[int],
+        height: Optional[int],
+        format: str,
+        show_index: bool,
+        thousand_separator: Optional[bool],
+        device_scale_factor: float,
+        conditional_formats: Optional[Sequence[Any]],
+        stats: Optional[RenderStats]
+    ) -> bytes:
+        with measure_render(stats):
+            # 预处理与 HTML 生成较耗 CPU，放到默认线程池执行，避免阻塞事件循环
+            html_content = await asyncio.get_running_loop().run_in_executor(
+                None,
+                _render_html,
+                df,
+                style,
+                show_index,
+                thousand_separator,
+                conditional_formats,
+                stats,
+            )
+
+            if self._semaphore is None:
+                raise RuntimeError("Renderer is not started")
+            async with self._semaphore:
+                attempt = 0
+                while True:
+                    browser = await self._acquire_browser()
+                    crashed = False
+                    try:
+                        return await _capture_image(
+                            html_content,
+                            output_path,
+                            specs,
+                            width,
+                            height,
+                            format,
+                            device_scale_factor,
+                            stats,
+                            browser=browser,
+                            offline=self.offline,
+                            pages=self._warm_pools.get(browser),
+                        )
+                    except BrowserCrashedError:
+                        crashed = True
+                        if attempt >= self.retries:
+                            raise
+                        attempt += 1
+                        self.retried += 1
+                    finally:
+                        await self._release_browser(browser, crashed)
+
+
+class RendererPool:
+    """
+    Spread renders over several warm browsers.
+
+    Each render goes to the browser with the fewest active renders. Takes the
+    same keyword arguments as ``Renderer.render``; extra constructor keywords
+    (``max_pages_per_browser``, ``max_browser_rss_mb``, ``retries``,
+    ``offline``, ``warm_styles``, ``warm_pages_per_style``, ``job_timeout``)
+    are passed to every Renderer.
+    """
+
+    def __init__(
+        self, size: int = 2, max_concurrency: int = 4, **renderer_options: Any
+    ) -> None:
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1: {size}")
+        self.renderers = [
+            Renderer(max_concurrency, **renderer_options) for _ in range(size)
+        ]
+
+    @property
+    def capacity(self) -> int:
+        """Number of renders that can run at the same time."""
+        return sum(renderer.max_concurrency for renderer in self.renderers)
+
+    @property
+    def active(self) -> int:
+        return sum(renderer.active for renderer in self.renderers)
+
+    def counters(self) -> Dict[str, int]:
+        """Lifecycle counters summed over all renderers."""
+        totals: Dict[str, int] = {}
+        for renderer in self.renderers:
+            for name, value in renderer.counters().items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    async def start(self) -> "RendererPool":
+        await asyncio.gather(
+            *(renderer.start() for renderer in self.renderers)
+        )
+        return self
+
+    async def close(self) -> None:
+        await asyncio.gather(
+            *(renderer.close() for renderer in self.renderers)
+        )
+
+    async def __aenter__(self) -> "RendererPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def render(
+        self,
+        df: pd.DataFrame,
+        output_path: Optional[Union[str, Path]] = None,
+        **options: Any,
+    ) -> bytes:
+        renderer = min(self.renderers, key=lambda r: r.active)
+        return await renderer.render(df, output_path, **options)
+
+    def render_batch(
+        self,
+        jobs: Iterable[Any],
+        timeout: Optional[float] = None,
+        on_result: Optional[Callable[[RenderResult], Any]] = None,
+        concurrency: Optional[int] = None
+    ) -> RenderBatch:
+        """
+        Like ``Renderer.render_batch``, spreading the jobs over the pool.
+
+        ``concurrency`` defaults to the pool's ``capacity``.
+        """
+        return RenderBatch(
+            self, jobs, concurrency or self.capacity, timeout, on_result
+        )
+
+
+class SyncRenderer:
+    """
+    Thread-safe blocking API over a warm Renderer.
+
+    One background thread owns an event loop and the Renderer (and with it
+    the browser). Any thread can submit renders; they run on the shared
+    browser with at most ``max_concurrency`` pages at a time. ``max_pending``
+    bounds the renders submitted but not yet finished: ``submit`` blocks the
+    calling thread while the limit is reached.
+
+    Example:
+        # e.g. one per gunicorn worker
+        renderer = SyncRenderer(max_concurrency=4)
+
+        @app.route("/report.png")
+        def report():
+            png = renderer.render(build_frame(), format="png")
+            return png, {"Content-Type": "image/png"}
+
+    Args:
+        max_concurrency: Pages rendering at the same time
+        max_pending: Maximum submitted renders not yet finished (None =
+                     unbounded)
+        **renderer_options: Passed to Renderer (``max_pages_per_browser``,
+                            ``max_browser_rss_mb``, ``retries``, ``offline``,
+                            ``warm_styles``, ``warm_pages_per_style``,
+                            ``job_timeout``)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_pending: Optional[int] = None,
+        **renderer_options: Any,
+    ) -> None:
+        if max_pending is not None and max_pending < 1:
+            raise ValueError(f"max_pending must be at least 1: {max_pending}")
+        self._renderer = Renderer(max_concurrency, **renderer_options)
+        self._pending = (
+            threading.BoundedSemaphore(max_pending) if max_pending else None
+        )
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def renderer(self) -> Renderer:
+        return self._renderer
+
+    def start(self) -> "SyncRenderer":
+        """Start the loop thread and launch the browser (on first submit)."""
+        with self._lock:
+            if self._thread is not None:
+                return self
+            loop = asyncio.new_event_loop()
+            # 守护线程：忘记 close() 时不会阻塞解释器退出
+            thread = threading.Thread(
+                target=self._run_loop,
+                args=(loop,),
+                name="dataframe2image-renderer",
+                daemon=True,
+            )
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self._renderer.start(), loop
+                ).result()
+            except BaseException:
+                self._stop_loop(loop, thread)
+                raise
+            self._loop, self._thread = loop, thread
+        return self
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    @staticmethod
+    def _stop_loop(
+        loop: asyncio.AbstractEventLoop, thread: threading.Thread
+    ) -> None:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def close(self) -> None:
+        """
+        Close the browser and stop the loop thread.
+
+        Pending renders finish first.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None:
+                return
+            self._loop = self._thread = None
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self._close_when_idle(), loop
+                ).result()
+            finally:
+                self._stop_loop(loop, thread)
+
+    async def _close_when_idle(self) -> None:
+        while self._renderer.active:
+            await asyncio.sleep(0.05)
+        await self._renderer.close()
+
+    def __enter__(self) -> "SyncRenderer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def submit(
+        self,
+        df: pd.DataFrame,
+        output_path: Optional[Union[str, Path]] = None,
+        **options: Any,
+    ) -> "Future[bytes]":
+        """
+        Queue a render and return a ``concurrent.futures.Future`` of its bytes.
+
+        Takes the same arguments as ``Renderer.render``. Safe to call from any
+        thread except the renderer's own loop thread.
+        """
+        self.start()
+        loop, pending = self._loop, self._pending
+        if loop is None:
+            raise RuntimeError("SyncRenderer is closed")
+        if threading.current_thread() is self._thread:
+            raise RuntimeError(
+                "SyncRenderer.submit cannot be called from its own loop thread"
+            )
+        if pending is not None:
+            pending.acquire()
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                self._renderer.render(df, output_path, **options), loop
+            )
+        except BaseException:
+            if pending is not None:
+                pending.release()
+            raise
+        if pending is not None:
+            future.add_done_callback(lambda _: pending.release())
+        return future
+
+    def render(
+        self,
+        df: pd.DataFrame,
+        output_path: Optional[Union[str, Path]] = None,
+        timeout: Optional[float] = None,
+        **options: Any,
+    ) -> bytes:
+        """
+        Render and wait for the result; see ``submit``.
+
+        Raises:
+            concurrent.futures.TimeoutError: If ``timeout`` seconds pass first;
+                the render is cancelled and its page closed
+        """
+        future = self.submit(df, output_path, **options)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
@@ -0,0 +1,443 @@
+"""
+Local HTTP render service backed by a shared browser pool
+
+Run with:
+    python -m dataframe2image.serve --port 8080 --browsers 2 --pages 4
+
+Endpoints:
+    POST /render   Render a table; returns the image bytes
+    GET  /healthz  Liveness/readiness
+    GET  /metrics  Throughput and queue metrics as JSON
+
+``POST /render`` accepts:
+    application/json     {"data": ..., "options": {...}} where data is a list
+                         of records or a pandas "split" dict
+                         ({"columns", "data", "index"})
+    text/csv             CSV body, options in the query string
+    application/vnd.apache.arrow.stream
+                         Arrow IPC stream, options in the query string
+"""
+
+import argparse
+import asyncio
+import io
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+try:
+    from aiohttp import web
+except ImportError as e:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "The render service needs aiohttp: "
+        "pip install 'dataframe2image[serve]'"
+    ) from e
+
+from .exceptions import RenderTimeoutError
+from .outputs import convert_image_bytes
+from .renderer import RendererPool
+from .styles import THEMES, TableStyle
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "pdf": "application/pdf",
+    "svg": "image/svg+xml",
+}
+ARROW_CONTENT_TYPES = {
+    "application/vnd.apache.arrow.stream",
+    "application/vnd.apache.arrow.file",
+}
+
+_BOOL_OPTIONS = {"show_index", "thousand_separator"}
+_INT_OPTIONS = {"width", "height", "quality"}
+_FLOAT_OPTIONS = {"device_scale_factor"}
+_STR_OPTIONS = {"format"}
+_STYLE_FIELDS = {f.name for f in fields(TableStyle)}
+
+
+class BadRequest(ValueError):
+    """The request payload or options are invalid."""
+
+
+@dataclass
+class ServiceMetrics:
+    """Counters exposed on ``/metrics``."""
+
+    started_at: float = field(default_factory=time.time)
+    requests: int = 0
+    rendered: int = 0
+    failed: int = 0
+    rejected: int = 0
+    timeouts: int = 0
+    render_seconds: float = 0.0
+    output_bytes: int = 0
+
+    def snapshot(
+        self, in_flight: int, capacity: int, max_queue: int
+    ) -> Dict[str, Any]:
+        uptime = max(time.time() - self.started_at, 1e-9)
+        return {
+            "uptime_seconds": round(uptime, 3),
+            "requests_total": self.requests,
+            "rendered_total": self.rendered,
+            "failed_total": self.failed,
+            "rejected_total": self.rejected,
+            "timeouts_total": self.timeouts,
+            "in_flight": in_flight,
+            "queued": max(0, in_flight - capacity),
+            "capacity": capacity,
+            "max_queue": max_queue,
+            "renders_per_second": round(self.rendered / uptime, 4),
+            "avg_render_seconds": (
+                round(self.render_seconds / self.rendered, 4)
+                if self.rendered
+                else None
+            ),
+            "output_bytes_total": self.output_bytes,
+        }
+
+
+@dataclass
+class ServiceState:
+    """Mutable per-application state shared by the handlers."""
+
+    pool: Any
+    max_queue: int
+    timeout: float
+    metrics: ServiceMetrics = field(default_factory=ServiceMetrics)
+    in_flight: int = 0
+
+
+STATE = web.AppKey("state", ServiceState)
+
+
+def _parse_option(name: str, value: Any) -> Any:
+    if isinstance(value, str):
+        if name in _BOOL_OPTIONS:
+            return value.lower() in ("1", "true", "yes", "on")
+        if name in _INT_OPTIONS:
+            return int(value)
+        if name in _FLOAT_OPTIONS:
+            return float(value)
+    return value
+
+
+def parse_options(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate render options from JSON or a query string.
+
+    ``style`` may be a theme name or a dict of TableStyle fields.
+    """
+    options: Dict[str, Any] = {}
+    for name, value in raw.items():
+        if name == "style":
+            if isinstance(value, dict):
+                unknown = set(value) - _STYLE_FIELDS
+                if unknown:
+                    raise BadRequest(
+                        f"Unknown style fields: {sorted(unknown)}"
+                    )
+                try:
+                    value = TableStyle(**value)
+                except (TypeError, ValueError) as e:
+                    raise BadRequest(f"Invalid style: {e}")
+            options["style"] = value
+        elif (
+            name
+            in _BOOL_OPTIONS | _INT_OPTIONS | _FLOAT_OPTIONS | _STR_OPTIONS
+        ):
+            try:
+                options[name] = _parse_option(name, value)
+            except ValueError:
+                raise BadRequest(f"Invalid value for {name}: {value!r}")
+        else:
+            raise BadRequest(f"Unknown option: {name}")
+    options.setdefault("format", "png")
+    if options["format"] not in CONTENT_TYPES:
+        raise BadRequest(f"Unsupported format: {options['format']}")
+    return options
+
+
+def _frame_from_json(data: Any) -> pd.DataFrame:
+    frame: pd.DataFrame
+    if isinstance(data, list):
+        frame = pd.DataFrame.from_records(data)
+    elif isinstance(data, dict) and "data" in data:
+        frame = pd.DataFrame(
+            data["data"], columns=data.get("columns"), index=data.get("index")
+        )
+    elif isinstance(data, dict):
+        frame = pd.DataFrame(data)
+    else:
+        raise BadRequest("'data' must be a list of records or a dict")
+    return frame
+
+
+def _frame_from_body(content_type: str, body: bytes) -> pd.DataFrame:
+    """Parse a CSV or Arrow request body (CPU-bound; run off the loop)."""
+    if content_type in ("text/csv", "application/csv"):
+        return pd.read_csv(io.BytesIO(body))
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise BadRequest("Arrow payloads need pyarrow installed on the server")
+    if content_type.endswith(".file"):
+        table = pa.ipc.open_file(pa.BufferReader(body)).read_all()
+    else:
+        table = pa.ipc.open_stream(pa.BufferReader(body)).read_all()
+    frame: pd.DataFrame = table.to_pandas()
+    return frame
+
+
+async def read_payload(
+    request: web.Request,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Parse the table and options from a ``/render`` request.
+
+    Building the DataFrame runs in the loop's default executor, so a large
+    upload does not stall ``/healthz``, ``/metrics`` or other renders.
+    """
+    content_type = request.content_type
+    loop = asyncio.get_running_loop()
+    try:
+        if content_type == "application/json":
+            body = await request.json()
+            if not isinstance(body, dict) or "data" not in body:
+                raise BadRequest("JSON body must contain 'data'")
+            options = parse_options(body.get("options", {}))
+            df = await loop.run_in_executor(
+                None, _frame_from_json, body["data"]
+            )
+            return df, options
+
+        if (
+            content_type not in ("text/csv", "application/csv")
+            and content_type not in ARROW_CONTENT_TYPES
+        ):
+            raise BadRequest(f"Unsupported content type: {content_type}")
+        options = parse_options(dict(request.query))
+        body = await request.read()
+        return (
+            await loop.run_in_executor(
+                None, _frame_from_body, content_type, body
+            ),
+            options,
+        )
+    except BadRequest:
+        raise
+    except Exception as e:
+        raise BadRequest(f"Invalid payload: {e}")
+
+
+def _json_error(status: int, message: str, **headers: str) -> web.Response:
+    return web.json_response(
+        {"error": message}, status=status, headers=headers
+    )
+
+
+async def handle_render(request: web.Request) -> web.Response:
+    state = request.app[STATE]
+    metrics = state.metrics
+    metrics.requests += 1
+
+    # 背压：在途请求（运行中 + 排队）超过上限时直接拒绝
+    if state.in_flight >= state.pool.capacity + state.max_queue:
+        metrics.rejected += 1
+        return _json_error(429, "Render queue is full", **{"Retry-After": "1"})
+
+    state.in_flight += 1
+    try:
+        try:
+            df, options = await read_payload(request)
+        except BadRequest as e:
+            metrics.failed += 1
+            return _json_error(400, str(e))
+
+        format = options.pop("format")
+        quality = options.pop("quality", None)
+        start = time.perf_counter()
+        try:
+            # webp 由 Pillow 在内存中从 PNG 转码
+            image = await asyncio.wait_for(
+                state.pool.render(
+                    df,
+                    None,
+                    format="png" if format == "webp" else format,
+                    **options,
+                ),
+                timeout=state.timeout,
+            )
+            if format == "webp" or (quality is not None and format == "jpeg"):
+                image = convert_image_bytes(image, format, quality)
+        except (asyncio.TimeoutError, RenderTimeoutError):
+            metrics.timeouts += 1
+            return _json_error(504, f"Render timed out after {state.timeout}s")
+        except ValueError as e:
+            metrics.failed += 1
+            return _json_error(400, str(e))
+        except Exception as e:
+            metrics.failed += 1
+            return _json_error(500, str(e))
+
+        metrics.rendered += 1
+        metrics.render_seconds += time.perf_counter() - start
+        metrics.output_bytes += len(image)
+        return web.Response(body=image, content_type=CONTENT_TYPES[format])
+    finally:
+        state.in_flight -= 1
+
+
+async def handle_health(request: web.Request) -> web.Response:
+    state = request.app[STATE]
+    return web.json_response({
+        "status": "ok",
+        "browsers": len(getattr(state.pool, "renderers", [])),
+        "in_flight": state.in_flight,
+    })
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    state = request.app[STATE]
+    snapshot = state.metrics.snapshot(
+        state.in_flight, state.pool.capacity, state.max_queue
+    )
+    if hasattr(state.pool, "counters"):
+        snapshot.update(state.pool.counters())
+    return web.json_response(snapshot)
+
+
+def create_app(
+    pool: Optional[RendererPool] = None,
+    browsers: int = 2,
+    pages_per_browser: int = 4,
+    max_queue: int = 32,
+    timeout: float = 30.0,
+    max_body_mb: float = 64,
+    max_pages_per_browser: Optional[int] = None,
+    max_browser_rss_mb: Optional[float] = None,
+    offline: bool = True,
+    warm_styles: Optional[Sequence[Union[str, TableStyle]]] = None
+) -> web.Application:
+    """
+    Build the aiohttp application.
+
+    Args:
+        pool: Renderer pool to use; one is created (and started/closed with
+              the app) if not given
+        browsers: Number of browsers in the created pool
+        pages_per_browser: Concurrent pages per browser
+        max_queue: Requests allowed to wait beyond the pool capacity before
+                   new requests get 429
+        timeout: Per-request render timeout in seconds
+        max_body_mb: Maximum request body size
+        max_pages_per_browser: Recycle each browser after this many pages
+        max_browser_rss_mb: Recycle a browser once its processes exceed this
+                            RSS
+        offline: Capture without network access and with lean Chromium flags
+                 (default). The payloads are untrusted, so only turn this off
+                 when the service is not reachable by untrusted clients.
+        warm_styles: Styles to pre-load pages for on every browser at startup
+                     (see ``Renderer``)
+    """
+    app = web.Application(client_max_size=int(max_body_mb * 1024 * 1024))
+    owns_pool = pool is None
+    app[STATE] = ServiceState(
+        pool=pool or RendererPool(
+            browsers,
+            pages_per_browser,
+            max_pages_per_browser=max_pages_per_browser,
+            max_browser_rss_mb=max_browser_rss_mb,
+            offline=offline,
+            warm_styles=warm_styles,
+        ),
+        max_queue=max_queue,
+        timeout=timeout,
+    )
+
+    if owns_pool:
+        async def _start(app: web.Application) -> None:
+            await app[STATE].pool.start()
+
+        async def _stop(app: web.Application) -> None:
+            await app[STATE].pool.close()
+
+        app.on_startup.append(_start)
+        app.on_cleanup.append(_stop)
+
+    app.router.add_post("/render", handle_render)
+    app.router.add_get("/healthz", handle_health)
+    app.router.add_get("/metrics", handle_metrics)
+    return app
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m dataframe2image.serve",
+        description=(
+            "Serve table rendering over HTTP with a shared browser pool."
+        ),
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--browsers", type=int, default=2, help="Browsers in the pool"
+    )
+    parser.add_argument(
+        "--pages", type=int, default=4, help="Concurrent pages per browser"
+    )
+    parser.add_argument(
+        "--queue", type=int, default=32, help="Queued requests before 429"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Per-request timeout (s)"
+    )
+    parser.add_argument(
+        "--max-body-mb", type=float, default=64, help="Maximum request size"
+    )
+    parser.add_argument(
+        "--recycle-pages",
+        type=int,
+        help="Recycle each browser after this many pages",
+    )
+    parser.add_argument(
+        "--max-rss-mb",
+        type=float,
+        help="Recycle a browser above this memory use (MB)",
+    )
+    parser.add_argument(
+        "--allow-network",
+        dest="offline",
+        action="store_false",
+        help=(
+            "Let pages load network resources (by default captures run "
+            "offline with lean Chromium flags)"
+        ),
+    )
+    parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="Pre-load pages for every built-in theme at startup",
+    )
+    args = parser.parse_args(argv)
+
+    app = create_app(
+        browsers=args.browsers,
+        pages_per_browser=args.pages,
+        max_queue=args.queue,
+        timeout=args.timeout,
+        max_body_mb=args.max_body_mb,
+        max_pages_per_browser=args.recycle_pages,
+        max_browser_rss_mb=args.max_rss_mb,
+        offline=args.offline,
+        warm_styles=list(THEMES) if args.warm else None,
+    )
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
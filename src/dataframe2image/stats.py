@@ -0,0 +1,100 @@
+"""
+Opt-in per-stage timing and memory instrumentation for renders
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+
+@dataclass
+class RenderStats:
+    """
+    Measurements collected during one render.
+
+    Pass an instance as ``stats=`` to ``df_to_image``/``df_to_html``; it is
+    filled in place and can be shipped to a metrics system with ``to_dict()``.
+
+    Attributes:
+        trace_memory: Track peak Python memory with tracemalloc (adds overhead)
+        stages: Wall time in seconds per stage, in execution order
+        total_seconds: Wall time of the whole call
+        html_bytes: Size of the generated HTML document (UTF-8)
+        output_bytes: Total size of the written image(s)
+        peak_memory_bytes: Peak traced Python memory, if ``trace_memory`` is
+                           set
+        browser_reused: Whether an already running browser was used
+        page_reused: Whether a warm page (see ``Renderer(warm_styles=...)``)
+                     was used
+    """
+
+    trace_memory: bool = False
+    stages: Dict[str, float] = field(default_factory=dict)
+    total_seconds: float = 0.0
+    html_bytes: int = 0
+    output_bytes: int = 0
+    peak_memory_bytes: Optional[int] = None
+    browser_reused: bool = False
+    page_reused: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Flatten into scalar metrics (stage times as ``stage.<name>``)."""
+        metrics: Dict[str, Any] = {
+            "total_seconds": self.total_seconds,
+            "html_bytes": self.html_bytes,
+            "output_bytes": self.output_bytes,
+            "browser_reused": self.browser_reused,
+            "page_reused": self.page_reused,
+        }
+        if self.peak_memory_bytes is not None:
+            metrics["peak_memory_bytes"] = self.peak_memory_bytes
+        for name, seconds in self.stages.items():
+            metrics[f"stage.{name}"] = seconds
+        return metrics
+
+
+@contextmanager
+def measure_stage(stats: Optional[RenderStats], name: str) -> Iterator[None]:
+    """Add the block's wall time to ``stats.stages[name]`` (if stats given)."""
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.stages[name] = (
+            stats.stages.get(name, 0.0) + time.perf_counter() - start
+        )
+
+
+@contextmanager
+def measure_render(stats: Optional[RenderStats]) -> Iterator[None]:
+    """
+    Record total wall time and, if requested, peak Python memory of a render.
+
+    tracemalloc is only stopped again if this call started it, so an
+    application that already traces memory keeps its tracing state.
+    """
+    if stats is None:
+        yield
+        return
+    started_tracing = False
+    if stats.trace_memory:
+        if tracemalloc.is_tracing():
+            if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+                tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            started_tracing = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.total_seconds = time.perf_counter() - start
+        if stats.trace_memory:
+            stats.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
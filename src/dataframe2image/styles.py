@@ -2,8 +2,31 @@
 Style configuration for table rendering
 """
 
+import re
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
+
+# 写入样式表的字段；其值不得跳出所在的 CSS 声明或 <style> 块，也不得加载外部资源
+CSS_FIELDS = (
+    "font_family",
+    "border_color",
+    "header_bg_color",
+    "header_text_color",
+    "row_text_color",
+    "cell_padding",
+    "table_border_radius",
+    "box_shadow",
+)
+_UNSAFE_CSS = re.compile(r"[{}<>;\\]|/\*|url\(|@import", re.IGNORECASE)
+
+
+def validate_css_value(name: str, value: Any) -> None:
+    """
+    Raise ValueError unless ``value`` is a string that is safe to embed as a
+    CSS property value.
+    """
+    if not isinstance(value, str) or _UNSAFE_CSS.search(value):
+        raise ValueError(f"Invalid CSS value for {name}: {value!r}")
 
 
 @dataclass
@@ -23,9 +46,17 @@ class TableStyle:
     table_border_radius: str = "6px"
     box_shadow: str = "0 2px 8px rgba(0,0,0,0.1)"
     thousand_separator: bool = False  # 是否添加千分位分隔符
+    conditional_formats: Optional[List[Any]] = None  # 条件格式规则
+    datetime_format: Optional[Union[str, Dict[Any, str]]] = None  # 可按列指定
+    timezone: Optional[str] = None  # 带时区的日期时间转换到该时区显示
+    preprocess_workers: Optional[int] = None  # 宽表按列并行格式化的线程/进程数，None 为串行
+    preprocess_backend: str = "thread"  # 或 'process'，见文档
     
     def __post_init__(self) -> None:
-        """Set default row background colors if not provided."""
+        """
+        Set default row background colors if not provided and reject values
+        that cannot be embedded in the stylesheet.
+        """
         if self.row_bg_colors is None:
             if self.theme == "dark":
                 self.row_bg_colors = ["#2d3748", "#4a5568"]
@@ -40,6 +71,15 @@ class TableStyle:
             else:  # light theme
                 self.row_bg_colors = ["#ffffff", "#f8f9fa"]
 
+        for name in CSS_FIELDS:
+            validate_css_value(name, getattr(self, name))
+        for color in self.row_bg_colors:
+            validate_css_value("row_bg_colors", color)
+        for name in ("font_size", "border_width"):
+            value = getattr(self, name)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"{name} must be a number: {value!r}")
+
 
 # Predefined themes
 THEMES = {
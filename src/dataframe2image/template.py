@@ -2,9 +2,50 @@
 HTML template for rendering DataFrame tables
 """
 
-from jinja2 import Template
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
-TABLE_TEMPLATE = Template("""
+from .conditional import conditional_css
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+    from .styles import TableStyle
+
+# 每层索引的游程：(起始位置, 长度)
+LevelRuns = List[Tuple["np.ndarray", "np.ndarray"]]
+
+_TABLE_SOURCE = """{% macro render_table(table) %}
+    <div class="table-container">
+        <table>
+            <thead>
+                {% for header_row in table.header_rows %}
+                <tr>
+                    {% for cell in header_row %}
+                    <th{% if cell.cls %} class="{{ cell.cls }}"{% endif %}{% if cell.rowspan > 1 %} rowspan="{{ cell.rowspan }}"{% endif %}{% if cell.colspan > 1 %} colspan="{{ cell.colspan }}"{% endif %}>{{ cell.label }}</th>
+                    {% endfor %}
+                </tr>
+                {% endfor %}
+            </thead>
+            <tbody>
+                {% for index_cells, row, row_classes in table.data %}
+                <tr>
+                    {% if table.show_index %}
+                    {% for label, rowspan in index_cells %}
+                    <td class="index-col"{% if rowspan > 1 %} rowspan="{{ rowspan }}"{% endif %}>{{ label }}</td>
+                    {% endfor %}
+                    {% endif %}
+                    {% for value in row %}
+                    {% set extra = row_classes[loop.index0] if row_classes else "" %}
+                    <td{% if value is number %} class="{{ ('numeric ' ~ extra) | trim }}"{% elif extra %} class="{{ extra }}"{% endif %}>{{ value }}</td>
+                    {% endfor %}
+                </tr>
+                {% endfor %}
+            </tbody>
+        </table>
+    </div>
+{% endmacro %}
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -12,6 +53,8 @@ TABLE_TEMPLATE = Template("""
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>DataFrame Table</title>
     <style>
+        {# 样式值在 TableStyle 中校验；HTML 转义对 <style> 内的 CSS 无效 #}
+        {% autoescape false %}
         {% if font_files %}
         {% for font_name, font_path in font_files.items() %}
         @font-face {
@@ -91,6 +134,15 @@ TABLE_TEMPLATE = Template("""
             background-color: {{ style.row_bg_colors[1] if style.row_bg_colors|length > 1 else style.row_bg_colors[0] }};
         }
         
+        /* Merged MultiIndex headers */
+        th[colspan] {
+            text-align: center;
+        }
+
+        .index-col[rowspan] {
+            vertical-align: top;
+        }
+
         /* Numeric alignment */
         .numeric {
             text-align: right;
@@ -104,6 +156,74 @@ TABLE_TEMPLATE = Template("""
             white-space: nowrap;
         }
         
+        /* Batch layout: many small tables tiled on one page */
+        body.batch {
+            display: flex;
+            flex-wrap: wrap;
+            align-items: flex-start;
+            gap: 20px;
+        }
+
+        .table-slot {
+            flex: none;
+        }
+
+        /* Grid layout: several titled tables composed into one image */
+        .layout-grid {
+            display: inline-flex;
+            flex-direction: column;
+            gap: 24px;
+            padding: 20px;
+            background-color: {{ style.row_bg_colors[0] }};
+            color: {{ style.row_text_color }};
+        }
+
+        .layout-title {
+            font-size: {{ style.font_size + 6 }}px;
+            font-weight: bold;
+        }
+
+        .layout-row {
+            display: flex;
+            align-items: flex-start;
+            gap: 24px;
+        }
+
+        .table-title {
+            font-size: {{ style.font_size + 2 }}px;
+            font-weight: bold;
+            margin-bottom: 8px;
+        }
+
+        /* PDF output: break the table across pages, repeating its header */
+        @media print {
+            body {
+                padding: 0 20px;
+                -webkit-print-color-adjust: exact;
+                print-color-adjust: exact;
+            }
+
+            .table-container {
+                display: block;
+                width: fit-content;
+                overflow: visible;
+                box-shadow: none;
+            }
+
+            thead {
+                display: table-header-group;
+            }
+
+            tr {
+                break-inside: avoid;
+            }
+        }
+
+        {% if conditional_css %}
+        /* Conditional formatting */
+        {{ conditional_css }}
+
+        {% endif %}
         /* Responsive design */
         @media (max-width: 768px) {
             .table-container {
@@ -114,48 +234,178 @@ TABLE_TEMPLATE = Template("""
                 padding: 6px 8px;
             }
         }
+        {% endautoescape %}
     </style>
 </head>
-<body>
-    <div class="table-container">
-        <table>
-            <thead>
-                <tr>
-                    {% if show_index %}
-                    <th class="index-header">{{ index_name or '' }}</th>
-                    {% endif %}
-                    {% for col in columns %}
-                    <th>{{ col }}</th>
-                    {% endfor %}
-                </tr>
-            </thead>
-            <tbody>
-                {% for row_idx, row in data %}
-                <tr>
-                    {% if show_index %}
-                    <td class="index-col">{{ row_idx }}</td>
-                    {% endif %}
-                    {% for value in row %}
-                    <td class="{% if value is number %}numeric{% endif %}">{{ value }}</td>
-                    {% endfor %}
-                </tr>
-                {% endfor %}
-            </tbody>
-        </table>
+<body{% if layout == "batch" %} class="batch"{% endif %}>
+    {% if layout == "grid" %}
+    <div class="layout-grid">
+        {% if title %}
+        <div class="layout-title">{{ title }}</div>
+        {% endif %}
+        {% for row in tables %}
+        <div class="layout-row">
+            {% for cell in row %}
+            <div class="layout-cell">
+                {% if cell.title %}
+                <div class="table-title">{{ cell.title }}</div>
+                {% endif %}
+                {{ render_table(cell.table) }}
+            </div>
+            {% endfor %}
+        </div>
+        {% endfor %}
     </div>
+    {% else %}
+    {% for table in tables %}
+    {% if layout == "batch" %}
+    <div class="table-slot">{{ render_table(table) }}</div>
+    {% else %}
+    {{ render_table(table) }}
+    {% endif %}
+    {% endfor %}
+    {% endif %}
 </body>
 </html>
-""")
+"""
 
 
-def render_dataframe_html(df, style, show_index=True, font_files=None):
-    """Render DataFrame as HTML using the template."""
-    import pandas as pd
+@lru_cache(maxsize=None)
+def get_table_template() -> Any:
+    """
+    Compile the table template on first use (Jinja2 is imported lazily).
+
+    Autoescaping is on, so cell values, labels and titles are HTML-escaped;
+    only the stylesheet is rendered verbatim.
+    """
+    from jinja2 import Template
+
+    return Template(_TABLE_SOURCE, autoescape=True)
+
+
+def __getattr__(name: str) -> Any:
+    # TABLE_TEMPLATE 保留为模块属性，访问时才编译
+    if name == "TABLE_TEMPLATE":
+        return get_table_template()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _level_runs(codes_per_level: Sequence[Any]) -> LevelRuns:
+    """
+    Run lengths of a hierarchical index, one ``(starts, lengths)`` per level.
+
+    A run at level k ends wherever any of the codes of levels 0..k change, so
+    a label never spans across a parent boundary. Each level is one vectorized
+    comparison over its integer codes, keeping the whole pass linear.
+    """
     import numpy as np
+
+    n = len(codes_per_level[0]) if codes_per_level else 0
+    changed = np.zeros(n, dtype=bool)
+    if n:
+        changed[0] = True
+    runs = []
+    for codes in codes_per_level:
+        codes = np.asarray(codes)
+        changed[1:] |= codes[1:] != codes[:-1]
+        starts = np.flatnonzero(changed)
+        lengths = np.diff(np.append(starts, n))
+        runs.append((starts, lengths))
+    return runs
+
+
+def _level_labels(index: "pd.MultiIndex") -> List["np.ndarray"]:
+    """String label of every position, per level of a MultiIndex."""
+    import numpy as np
+
+    labels = []
+    for level, codes in zip(index.levels, index.codes):
+        # 每个唯一值只转换一次字符串，再按 codes 取值；缺失值的 code 为 -1
+        names = np.append(np.asarray(level.map(str), dtype=object), "")
+        labels.append(names[np.asarray(codes)])
+    return labels
+
+
+def _header_rows(
+    df: "pd.DataFrame", show_index: bool
+) -> List[List[Dict[str, Any]]]:
+    """Header rows with colspan-merged MultiIndex column labels."""
+    import pandas as pd
+
+    columns = df.columns
+    if isinstance(columns, pd.MultiIndex):
+        labels = _level_labels(columns)
+        rows = []
+        for level_labels, (starts, lengths) in zip(
+            labels, _level_runs(columns.codes)
+        ):
+            rows.append(
+                [
+                    {
+                        "label": level_labels[start],
+                        "colspan": int(length),
+                        "rowspan": 1,
+                    }
+                    for start, length in zip(starts, lengths)
+                ]
+            )
+    else:
+        rows = [
+            [
+                {"label": col, "colspan": 1, "rowspan": 1}
+                for col in columns.tolist()
+            ]
+        ]
+
+    if show_index:
+        index_headers = [
+            {
+                "label": name or '',
+                "colspan": 1,
+                "rowspan": len(rows),
+                "cls": "index-header",
+            }
+            for name in df.index.names
+        ]
+        rows[0] = index_headers + rows[0]
+    return rows
+
+
+def _index_cells(index: "pd.Index") -> List[List[Tuple[str, int]]]:
+    """Index cells of every row as ``(label, rowspan)`` pairs."""
+    import pandas as pd
+
+    if not isinstance(index, pd.MultiIndex):
+        return [[(str(idx), 1)] for idx in index]
+
+    cells: List[List[Tuple[str, int]]] = [[] for _ in range(len(index))]
+    for level_labels, (starts, lengths) in zip(
+        _level_labels(index), _level_runs(index.codes)
+    ):
+        for start, length in zip(starts.tolist(), lengths.tolist()):
+            cells[start].append((level_labels[start], length))
+    return cells
+
+
+def build_table_context(
+    df: "pd.DataFrame",
+    show_index: bool = True,
+    cell_classes: Optional[List[List[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Collect the values the table macro needs for one DataFrame.
+
+    MultiIndex rows and columns are rendered as merged ``rowspan``/``colspan``
+    headers. ``cell_classes`` is an optional row-major list of extra CSS
+    classes per cell, as produced by ``evaluate_conditional_formats``.
+    """
+    import pandas as pd
     
+    index_cells = _index_cells(df.index)
+
     # Prepare data
     data = []
-    for idx, row in df.iterrows():
+    for i, (_, row) in enumerate(df.iterrows()):
         row_data = []
         for value in row:
             if pd.isna(value):
@@ -163,14 +413,50 @@ def render_dataframe_html(df, style, show_index=True, font_files=None):
             else:
                 # 值已经在预处理阶段格式化了，直接转为字符串
                 row_data.append(str(value))
-        data.append((str(idx), row_data))
+        row_classes = cell_classes[i] if cell_classes is not None else None
+        data.append((index_cells[i], row_data, row_classes))
     
-    # Render template
-    return TABLE_TEMPLATE.render(
+    return {
+        "header_rows": _header_rows(df, show_index),
+        "data": data,
+        "show_index": show_index,
+    }
+
+
+def render_page_html(
+    tables: Sequence[Any],
+    style: "TableStyle",
+    font_files: Optional[Dict[str, str]] = None,
+    layout: str = "single",
+    title: Optional[str] = None
+) -> str:
+    """
+    Render one HTML page containing the given table contexts.
+
+    ``layout="batch"`` wraps every table in its own slot and tiles the slots,
+    so many small tables can be captured with a single screenshot.
+    ``layout="grid"`` takes rows of ``{"table": context, "title": str}`` cells
+    and composes them, with an optional page ``title``, into one panel.
+    """
+    html: str = get_table_template().render(
         style=style,
-        columns=df.columns.tolist(),
-        data=data,
-        show_index=show_index,
-        index_name=df.index.name,
-        font_files=font_files
+        conditional_css=conditional_css(style.conditional_formats),
+        tables=tables,
+        layout=layout,
+        font_files=font_files,
+        title=title
+    )
+    return html
+
+
+def render_dataframe_html(
+    df: "pd.DataFrame",
+    style: "TableStyle",
+    show_index: bool = True,
+    font_files: Optional[Dict[str, str]] = None,
+    cell_classes: Optional[List[List[str]]] = None
+) -> str:
+    """Render DataFrame as HTML using the template."""
+    return render_page_html(
+        [build_table_context(df, show_index, cell_classes)], style, font_files
     )
@@ -0,0 +1,250 @@
+"""
+Vector (PDF and SVG) export of a laid-out table page
+"""
+
+import math
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Formats exported as vector documents instead of screenshots
+VECTOR_FORMATS = ("pdf", "svg")
+
+# PDF 页面至少为 A4 宽度（96 dpi 下 794px），更宽的表格按表格宽度排版
+PDF_MIN_PAGE_WIDTH = 794
+PDF_PAGE_ASPECT = 297 / 210
+PDF_MARGIN = {"top": "24px", "bottom": "24px", "left": "0px", "right": "0px"}
+
+_PAGE_WIDTH_JS = "() => document.documentElement.scrollWidth"
+
+# 一次 evaluate 读取所有背景块和单元格的位置与计算样式（相对于表格容器）
+_SVG_LAYOUT_JS = """
+() => {
+    const container =
+        document.querySelector('.table-container') || document.body;
+    const origin = container.getBoundingClientRect();
+    const transparent = 'rgba(0, 0, 0, 0)';
+    const box = r => [
+        r.left - origin.left, r.top - origin.top, r.width, r.height
+    ];
+    // 边框顺序与 CSS 简写一致：上、右、下、左
+    const sides = ['Top', 'Right', 'Bottom', 'Left'];
+    const fills = [];
+    const cells = [];
+    for (const el of container.querySelectorAll('thead, tbody, tr, th, td')) {
+        const s = getComputedStyle(el);
+        if (s.backgroundColor !== transparent) {
+            const rect = el.getBoundingClientRect();
+            fills.push([...box(rect), s.backgroundColor]);
+        }
+        if (el.tagName !== 'TH' && el.tagName !== 'TD') continue;
+        cells.push([
+            ...box(el.getBoundingClientRect()), el.innerText,
+            s.color, s.fontSize, s.fontFamily, s.fontWeight, s.textAlign,
+            parseFloat(s.paddingLeft), parseFloat(s.paddingRight),
+            sides.map(side => [
+                s[`border${side}Color`], parseFloat(s[`border${side}Width`])
+            ]),
+            el.scrollWidth > el.clientWidth,
+        ]);
+    }
+    const style = getComputedStyle(container);
+    return {
+        width: origin.width,
+        height: origin.height,
+        background: style.backgroundColor,
+        border: [style.borderTopColor, parseFloat(style.borderTopWidth)],
+        radius: parseFloat(style.borderTopLeftRadius) || 0,
+        fills: fills,
+        cells: cells,
+    };
+}
+"""
+
+
+def _num(value: float) -> str:
+    """Compact number formatting for SVG attributes."""
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _text_anchor(
+    align: str, x: float, width: float, pad_left: float, pad_right: float
+) -> Tuple[str, float]:
+    if align in ("right", "end"):
+        return "end", x + width - pad_right
+    if align == "center":
+        return "middle", x + width / 2
+    return "start", x + pad_left
+
+
+def _border_line(
+    side: int, x: float, y: float, w: float, h: float, width: float
+) -> Tuple[float, float, float, float]:
+    """
+    End points of a border line of ``width`` drawn inside the cell box.
+
+    ``side`` follows the CSS shorthand order: 0 top, 1 right, 2 bottom,
+    3 left.
+    """
+    inset = width / 2
+    if side == 0:
+        return x, y + inset, x + w, y + inset
+    if side == 1:
+        return x + w - inset, y, x + w - inset, y + h
+    if side == 2:
+        return x, y + h - inset, x + w, y + h - inset
+    return x + inset, y, x + inset, y + h
+
+
+def layout_to_svg(layout: Dict[str, Any]) -> str:
+    """
+    Build an SVG document from the table layout read by ``_SVG_LAYOUT_JS``.
+
+    Backgrounds become rects, cell text becomes ``<text>`` elements that share
+    one CSS class per distinct font/color, and every cell border side with a
+    non-zero width becomes a line, so the size grows with the amount of text
+    rather than the pixel area. The container's rounded corners clip the
+    content as ``overflow: hidden`` does in the page. Its box shadow is left
+    out, matching the PNG element screenshot, which is clipped to the element
+    box. Gradients (e.g. data bars) are drawn with their base background
+    color.
+    Text that overflows its cell (``max-width`` with ``text-overflow:
+    ellipsis`` in the stylesheet) is clipped to the cell's content box; SVG
+    has no ellipsis, so it is cut at the edge instead.
+    """
+    width = math.ceil(layout["width"])
+    height = math.ceil(layout["height"])
+    radius = layout.get("radius", 0)
+    rounded = f' rx="{_num(radius)}"' if radius > 0 else ""
+    body: List[str] = []
+    clips: List[str] = []
+
+    if layout["background"] != "rgba(0, 0, 0, 0)":
+        body.append(
+            f'<rect width="{width}" height="{height}"{rounded} '
+            f'fill="{layout["background"]}"/>'
+        )
+    if radius > 0:
+        clips.append(
+            f'<clipPath id="frame"><rect width="{width}" height="{height}"'
+            f"{rounded}/></clipPath>"
+        )
+        body.append('<g clip-path="url(#frame)">')
+    for x, y, w, h, color in layout["fills"]:
+        body.append(
+            f'<rect x="{_num(x)}" y="{_num(y)}" width="{_num(w)}" '
+            f'height="{_num(h)}" fill="{color}"/>'
+        )
+
+    classes: Dict[Tuple[str, str, str, str], str] = {}
+    for cell in layout["cells"]:
+        (x, y, w, h, text, color, font_size, font_family, font_weight, align,
+         pad_left, pad_right, borders, overflows) = cell
+        for side, (border_color, border_width) in enumerate(borders):
+            if border_width <= 0:
+                continue
+            x1, y1, x2, y2 = _border_line(side, x, y, w, h, border_width)
+            body.append(
+                f'<line x1="{_num(x1)}" y1="{_num(y1)}" '
+                f'x2="{_num(x2)}" y2="{_num(y2)}" stroke="{border_color}" '
+                f'stroke-width="{_num(border_width)}"/>'
+            )
+        text = " ".join(text.split())
+        if not text:
+            continue
+        key = (color, font_size, font_family, font_weight)
+        name = classes.setdefault(key, f"t{len(classes)}")
+        clip = ""
+        if overflows:
+            # 与浏览器一致：溢出的文本从内容区左侧开始，超出右边界的部分被裁掉
+            anchor, text_x = "start", x + pad_left
+            clip_id = f"c{len(clips)}"
+            clip_width = max(w - pad_left - pad_right, 0)
+            clips.append(
+                f'<clipPath id="{clip_id}">'
+                f'<rect x="{_num(text_x)}" y="{_num(y)}" '
+                f'width="{_num(clip_width)}" height="{_num(h)}"/></clipPath>'
+            )
+            clip = f' clip-path="url(#{clip_id})"'
+        else:
+            anchor, text_x = _text_anchor(align, x, w, pad_left, pad_right)
+        body.append(
+            f'<text class="{name}" x="{_num(text_x)}" y="{_num(y + h / 2)}" '
+            f'text-anchor="{anchor}"{clip}>{escape(text, quote=False)}</text>'
+        )
+
+    if radius > 0:
+        body.append("</g>")
+
+    border_color, border_width = layout["border"]
+    if border_width > 0:
+        inset = _num(border_width / 2)
+        border_radius = (
+            f' rx="{_num(radius - border_width / 2)}"'
+            if radius > border_width / 2
+            else ""
+        )
+        body.append(
+            f'<rect x="{inset}" y="{inset}" '
+            f'width="{_num(width - border_width)}" '
+            f'height="{_num(height - border_width)}"{border_radius} '
+            f'fill="none" stroke="{border_color}" '
+            f'stroke-width="{_num(border_width)}"/>'
+        )
+
+    css = "".join(
+        f".{name}{{fill:{color};font:{weight} {size} {escape(family)};"
+        "dominant-baseline:central}"
+        for (color, size, family, weight), name in classes.items()
+    )
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        f'width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">'
+        f"<style>{css}</style>"
+        + (f"<defs>{''.join(clips)}</defs>" if clips else "")
+        + "".join(body)
+        + "</svg>"
+    )
+
+
+async def export_svg(
+    page: Any, output_path: Optional[Union[str, Path]] = None
+) -> bytes:
+    """Export the table on ``page`` as SVG; return the UTF-8 encoded bytes."""
+    data = layout_to_svg(await page.evaluate(_SVG_LAYOUT_JS)).encode("utf-8")
+    if output_path is not None:
+        Path(output_path).write_bytes(data)
+    return data
+
+
+def pdf_page_size(content_width: float) -> Tuple[int, int]:
+    """
+    Page size in CSS pixels.
+
+    At least A4 wide and wide enough for the table, with the A-series aspect.
+    """
+    width = max(PDF_MIN_PAGE_WIDTH, math.ceil(content_width))
+    return width, round(width * PDF_PAGE_ASPECT)
+
+
+async def print_pdf(
+    page: Any, output_path: Optional[Union[str, Path]] = None
+) -> bytes:
+    """
+    Print the table on ``page`` to a paginated PDF.
+
+    The page width follows the table width so wide tables are not clipped;
+    long tables break between rows and repeat the header on every page.
+    """
+    width, height = pdf_page_size(await page.evaluate(_PAGE_WIDTH_JS))
+    options: Dict[str, Any] = {
+        "width": f"{width}px",
+        "height": f"{height}px",
+        "print_background": True,
+        "margin": PDF_MARGIN,
+    }
+    if output_path is not None:
+        options["path"] = str(output_path)
+    pdf: bytes = await page.pdf(**options)
+    return pdf
@@ -0,0 +1,247 @@
+"""
+Pages pre-loaded with a style's stylesheet and fonts, reused across renders
+"""
+
+import asyncio
+import dataclasses
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from .core import (
+    DEFAULT_VIEWPORT_HEIGHT,
+    DEFAULT_VIEWPORT_WIDTH,
+    FILE_NAVIGATION_THRESHOLD,
+    _NEXT_FRAME_JS,
+    _capture_loaded_page,
+    _chinese_font_family,
+    _prepare_page,
+    _resolve_style,
+    get_chinese_fonts,
+)
+from .stats import RenderStats, measure_stage
+from .styles import TableStyle
+from .template import render_page_html
+
+_BODY_OPEN = re.compile(r"<body[^>]*>")
+_SHELL_END = "\n</body>\n</html>\n"
+
+# 替换 body 内容后等待字体就绪；样式表与字体已在预热时加载，通常立即完成
+_INJECT_JS = """
+html => {
+    document.body.innerHTML = html;
+    return document.fonts.ready.then(() => true);
+}
+"""
+_CLEAR_JS = "() => { document.body.innerHTML = ''; }"
+# @font-face 字体默认在首次使用时才加载，预热时主动加载全部字体
+_LOAD_FONTS_JS = """
+() => Promise.all(
+    [...document.fonts].map(font => font.load().catch(() => null))
+).then(() => true)
+"""
+
+
+def split_page(html_content: str) -> Tuple[str, str]:
+    """
+    Split a rendered page into its shell key and body content.
+
+    The key is everything up to and including the ``<body>`` tag, i.e. the
+    stylesheet, fonts and layout class; pages with the same key can be
+    reused by swapping only the body content.
+    """
+    match = _BODY_OPEN.search(html_content)
+    end = html_content.rfind("</body>")
+    if match is None or end < match.end():
+        raise ValueError("HTML document has no <body> element")
+    return html_content[:match.end()], html_content[match.end():end]
+
+
+def style_shells(style: Optional[Union[str, TableStyle]]) -> List[str]:
+    """
+    Shell keys a style renders single tables with.
+
+    One without embedded fonts and, when Chinese fonts are installed, one with
+    them (tables containing Chinese switch to that font family).
+    """
+    style = _resolve_style(style)
+    shells = [split_page(render_page_html([], style))[0]]
+    font_files = get_chinese_fonts()
+    if font_files:
+        cjk_style = dataclasses.replace(
+            style, font_family=_chinese_font_family(font_files)
+        )
+        shells.append(
+            split_page(render_page_html([], cjk_style, font_files))[0]
+        )
+    return shells
+
+
+class WarmPagePool:
+    """
+    Idle pages of one browser, each holding a style's stylesheet and fonts.
+
+    A capture takes an idle page whose shell matches the rendered HTML, swaps
+    in the table markup, captures it and clears the page again, so it skips
+    page creation, stylesheet parsing and font loading. Pages for a shell that
+    has no idle page are created on demand and kept afterwards.
+
+    Args:
+        browser: Running Playwright browser the pages belong to
+        device_scale_factor: Pixel density of the pages; captures at other
+                             densities use a fresh page
+        offline: Block network access on the pages (see ``df_to_image``)
+        max_idle: Idle pages kept per shell
+        max_shells: Distinct shells kept; idle pages of the least recently
+                    used shell are closed beyond this
+    """
+
+    def __init__(
+        self,
+        browser: Any,
+        device_scale_factor: float = 1.0,
+        offline: bool = False,
+        max_idle: int = 4,
+        max_shells: int = 16
+    ) -> None:
+        if max_idle < 1:
+            raise ValueError(f"max_idle must be at least 1: {max_idle}")
+        self.browser = browser
+        self.device_scale_factor = device_scale_factor
+        self.offline = offline
+        self.max_idle = max_idle
+        self.max_shells = max_shells
+        self._idle: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self.created = 0
+        self.reused = 0
+
+    @property
+    def idle_pages(self) -> int:
+        return sum(len(pages) for pages in self._idle.values())
+
+    def accepts(self, html_content: str, device_scale_factor: float) -> bool:
+        """
+        Whether ``capture`` can serve this render.
+
+        Huge documents are loaded from a file on a new page instead.
+        """
+        return (device_scale_factor == self.device_scale_factor
+                and len(html_content) < FILE_NAVIGATION_THRESHOLD)
+
+    async def warm(
+        self,
+        styles: Sequence[Union[str, TableStyle]],
+        pages_per_style: int = 1
+    ) -> None:
+        """Create ``pages_per_style`` idle pages per shell of ``styles``."""
+        shells = list(
+            dict.fromkeys(
+                shell for style in styles for shell in style_shells(style)
+            )
+        )
+        pages = await asyncio.gather(
+            *(
+                self._new_page(shell)
+                for shell in shells
+                for _ in range(pages_per_style)
+            )
+        )
+        for index, page in enumerate(pages):
+            await self._release(
+                shells[index // pages_per_style], page, healthy=True
+            )
+
+    async def _new_page(self, shell: str) -> Any:
+        page = await self.browser.new_page(
+            device_scale_factor=self.device_scale_factor
+        )
+        try:
+            await _prepare_page(page, self.offline)
+            await page.set_content(shell + _SHELL_END)
+            await page.evaluate(_LOAD_FONTS_JS)
+        except BaseException:
+            await page.close()
+            raise
+        self.created += 1
+        return page
+
+    async def _acquire(
+        self, shell: str, stats: Optional[RenderStats] = None
+    ) -> Any:
+        pages = self._idle.get(shell)
+        if pages:
+            self._idle.move_to_end(shell)
+            self.reused += 1
+            if stats is not None:
+                stats.page_reused = True
+            return pages.pop()
+        return await self._new_page(shell)
+
+    async def _release(self, shell: str, page: Any, healthy: bool) -> None:
+        if healthy:
+            try:
+                await page.evaluate(_CLEAR_JS)
+            except Exception:
+                healthy = False
+        pages = self._idle.setdefault(shell, [])
+        self._idle.move_to_end(shell)
+        if healthy and len(pages) < self.max_idle:
+            pages.append(page)
+        else:
+            await self._close_page(page)
+        while len(self._idle) > self.max_shells:
+            _, evicted = self._idle.popitem(last=False)
+            for stale in evicted:
+                await self._close_page(stale)
+
+    @staticmethod
+    async def _close_page(page: Any) -> None:
+        try:
+            await page.close()
+        except Exception:
+            pass  # 浏览器已关闭或崩溃
+
+    async def capture(
+        self,
+        html_content: str,
+        output_path: Optional[Union[str, Path]],
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        format: str = "png",
+        stats: Optional[RenderStats] = None
+    ) -> bytes:
+        """
+        Capture ``html_content`` on a warm page.
+
+        The result is the same as a capture on a new page.
+        """
+        shell, body = split_page(html_content)
+        with measure_stage(stats, "warm_page"):
+            page = await self._acquire(shell, stats)
+
+        healthy = False
+        try:
+            await page.set_viewport_size({
+                "width": width or DEFAULT_VIEWPORT_WIDTH,
+                "height": height or DEFAULT_VIEWPORT_HEIGHT,
+            })
+            with measure_stage(stats, "set_content"):
+                await page.evaluate(_INJECT_JS, body)
+            # 表格标记不引用外部资源，等待下一帧绘制即可
+            with measure_stage(stats, "settle"):
+                await page.evaluate(_NEXT_FRAME_JS)
+            result = await _capture_loaded_page(
+                page, output_path, width, height, format, stats
+            )
+            healthy = True
+            return result
+        finally:
+            await self._release(shell, page, healthy)
+
+    async def close(self) -> None:
+        """Close every idle page."""
+        idle, self._idle = self._idle, OrderedDict()
+        for pages in idle.values():
+            for page in pages:
+                await self._close_page(page)
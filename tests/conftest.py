@@ -0,0 +1,124 @@
+"""
+Shared pytest options and fixtures for the test suite
+"""
+
+import asyncio
+
+import pytest
+
+
+class FakeBrowser:
+    """Stands in for a Playwright browser; ``crash()`` fires "disconnected"."""
+
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def is_connected(self):
+        return self.connected
+
+    def crash(self):
+        self.connected = False
+        self.handlers["disconnected"](self)
+
+    async def close(self):
+        self.closed = True
+        self.connected = False
+
+
+class FakeChromium:
+    def __init__(self):
+        self.browsers = []
+
+    async def launch(self):
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+
+    async def stop(self):
+        pass
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("snapshots", "golden-image snapshot tests")
+    group.addoption(
+        "--snapshots",
+        action="store_true",
+        default=False,
+        help=(
+            "Run the golden-image snapshot tests (needs Chromium and the "
+            "goldens recorded on this host)"
+        ),
+    )
+    group.addoption(
+        "--update-snapshots",
+        action="store_true",
+        default=False,
+        help=(
+            "Re-render the snapshot corpus and overwrite the golden images "
+            "and timings"
+        ),
+    )
+    group.addoption(
+        "--snapshot-time-factor",
+        type=float,
+        default=1.5,
+        help=(
+            "Fail when a render takes longer than this multiple of its "
+            "recorded time"
+        ),
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "snapshot: golden-image test, only run with --snapshots or "
+        "--update-snapshots",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # 金标准图片依赖主机上的 Chromium 和字体，需显式开启
+    if config.getoption("--snapshots") or config.getoption(
+        "--update-snapshots"
+    ):
+        return
+    skip = pytest.mark.skip(reason="snapshot tests need --snapshots")
+    for item in items:
+        if "snapshot" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def fake_browser():
+    return FakeBrowser()
+
+
+@pytest.fixture
+def make_renderer(monkeypatch):
+    """
+    Factory for a started Renderer on fake browsers; captures run ``capture``.
+
+    Call it inside the event loop the renderer is used on.
+    """
+    from dataframe2image import renderer as renderer_module
+
+    def make(capture, **options):
+        monkeypatch.setattr(renderer_module, "_capture_image", capture)
+        renderer = renderer_module.Renderer(**options)
+        renderer._playwright = FakePlaywright()
+        renderer._semaphore = asyncio.Semaphore(renderer.max_concurrency)
+        renderer._launch_lock = asyncio.Lock()
+        return renderer
+
+    return make
@@ -0,0 +1,109 @@
+"""
+Tests for sprite/atlas batch rendering helpers
+"""
+
+import contextlib
+import io
+
+import pandas as pd
+import pytest
+
+from dataframe2image import core
+from dataframe2image.core import _crop_box, _prepare_dataframe, _resolve_style
+from dataframe2image.exceptions import CaptureError
+from dataframe2image.styles import THEMES
+from dataframe2image.template import build_table_context, render_page_html
+
+
+def test_batch_page_contains_one_slot_per_table():
+    style = _resolve_style("blue")
+    tables = [
+        build_table_context(pd.DataFrame({"a": [i, i + 1]})) for i in range(3)
+    ]
+
+    html = render_page_html(tables, style, layout="batch")
+
+    assert '<body class="batch">' in html
+    assert html.count('class="table-slot"') == 3
+    assert html.count('class="table-container"') == 3
+
+
+def test_crop_box_scales_and_clamps():
+    assert _crop_box([10.2, 20.5, 30.1, 5.0], 2, (1000, 1000)) == (
+        20,
+        41,
+        81,
+        51,
+    )
+    assert _crop_box([-1, 0, 50, 50], 1, (40, 40)) == (0, 0, 40, 40)
+
+
+def test_resolved_style_does_not_leak_into_themes():
+    original_family = THEMES["light"].font_family
+    style = _resolve_style("light", thousand_separator=True)
+    _prepare_dataframe(pd.DataFrame({"名称": ["产品"]}), style)
+
+    assert THEMES["light"].thousand_separator is False
+    assert THEMES["light"].font_family == original_family
+
+
+@pytest.fixture
+def fake_batch_browser(monkeypatch):
+    """Count browser launches; each batch page captures a blank sheet."""
+    from PIL import Image
+
+    browsers = []
+
+    class Browser:
+        closed = False
+
+        def is_connected(self):
+            return not self.closed
+
+        async def close(self):
+            self.closed = True
+
+    class Chromium:
+        async def launch(self, **kwargs):
+            browsers.append(Browser())
+            return browsers[-1]
+
+    @contextlib.asynccontextmanager
+    async def fake_playwright():
+        yield type("Playwright", (), {"chromium": Chromium()})()
+
+    async def fake_capture(browser, html_content, width, scale, offline):
+        if "boom" in html_content:
+            raise RuntimeError("page failed")
+        count = html_content.count('class="table-slot"')
+        buffer = io.BytesIO()
+        Image.new("RGB", (100, 20 * count), "white").save(buffer, "PNG")
+        boxes = [[0, 20 * i, 100, 20] for i in range(count)]
+        return buffer.getvalue(), boxes
+
+    monkeypatch.setattr(core, "_async_playwright", fake_playwright)
+    monkeypatch.setattr(core, "_capture_batch_screenshot", fake_capture)
+    return browsers
+
+
+def test_batches_share_one_browser(tmp_path, fake_batch_browser):
+    dfs = [pd.DataFrame({"a": [i]}) for i in range(5)]
+    paths = [tmp_path / f"t{i}.png" for i in range(5)]
+
+    core.dfs_to_images(dfs, paths, batch_size=2)
+
+    assert all(path.exists() for path in paths)
+    assert len(fake_batch_browser) == 1
+    assert fake_batch_browser[0].closed
+
+
+def test_failed_batch_still_closes_browser(tmp_path, fake_batch_browser):
+    dfs = [pd.DataFrame({"a": [1]}), pd.DataFrame({"a": ["boom"]})]
+    paths = [tmp_path / "ok.png", tmp_path / "boom.png"]
+
+    with pytest.raises(CaptureError):
+        core.dfs_to_images(dfs, paths, batch_size=1)
+
+    assert (tmp_path / "ok.png").exists()
+    assert len(fake_batch_browser) == 1
+    assert fake_batch_browser[0].closed
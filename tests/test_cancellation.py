@@ -0,0 +1,135 @@
+"""
+Tests for render timeouts, batch cancellation and streamed batch results
+(with a fake browser)
+"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from dataframe2image import core as core_module
+from dataframe2image import df_to_image
+from dataframe2image import renderer as renderer_module
+from dataframe2image.exceptions import RenderTimeoutError
+from dataframe2image.renderer import RenderJob
+
+
+def _frame(rows):
+    return pd.DataFrame({"a": range(rows)})
+
+
+async def _sleepy_capture(html, output_path, specs, *args, **kwargs):
+    # 行数决定"渲染"耗时：每行 10ms
+    await asyncio.sleep(html.count("<tr>") * 0.01)
+    return html.count("<tr>").to_bytes(2, "big")
+
+
+def test_render_timeout_aborts_capture(make_renderer, monkeypatch):
+    aborted = []
+
+    async def capture(*args, **kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            aborted.append(True)
+            raise
+
+    async def scenario():
+        renderer = make_renderer(capture, job_timeout=0.5)
+        with pytest.raises(RenderTimeoutError, match="0.5s"):
+            await renderer.render(_frame(2))
+        assert renderer.active == 0
+        # 单次调用的 timeout 优先于 job_timeout
+        monkeypatch.setattr(renderer_module, "_capture_image", _sleepy_capture)
+        assert await renderer.render(_frame(2), timeout=5)
+
+    asyncio.run(scenario())
+    assert aborted == [True]
+
+
+def test_batch_streams_results_in_completion_order(make_renderer):
+    progress = []
+
+    async def scenario():
+        renderer = make_renderer(_sleepy_capture, max_concurrency=3)
+        jobs = [_frame(30), _frame(1), (_frame(10), None)]
+        async with renderer.render_batch(
+            jobs, on_result=lambda r: progress.append(r.index)
+        ) as batch:
+            streamed = [result.index async for result in batch]
+            assert (batch.total, batch.done, batch.failed) == (3, 3, 0)
+        return streamed
+
+    assert asyncio.run(scenario()) == [1, 2, 0]
+    assert progress == [1, 2, 0]
+
+
+def test_batch_reports_timeouts_and_errors_per_job(make_renderer):
+    async def scenario():
+        renderer = make_renderer(_sleepy_capture, max_concurrency=2)
+        jobs = [
+            _frame(50),
+            RenderJob(_frame(1), options={"format": "bmp"}),
+            RenderJob(_frame(2), options={"timeout": 5}),
+        ]
+        return await renderer.render_batch(jobs, timeout=0.1).wait()
+
+    slow, invalid, fast = asyncio.run(scenario())
+    assert isinstance(slow.error, RenderTimeoutError)
+    assert isinstance(invalid.error, ValueError)
+    assert fast.ok and fast.data == (3).to_bytes(2, "big") and fast.seconds > 0
+
+
+def test_cancel_stops_batch(make_renderer):
+    async def scenario():
+        renderer = make_renderer(_sleepy_capture, max_concurrency=2)
+        jobs = (_frame(rows) for rows in [1, 100, 100, 100, 100])
+        batch = renderer.render_batch(jobs)
+        results = []
+        async for result in batch:
+            results.append(result)
+            batch.cancel()
+        # 第一个结果产出前，空闲的工作协程已取走下一个任务
+        assert batch.total is None and batch.started == 3
+        assert renderer.active == 0
+        return results
+
+    first, *rest = asyncio.run(scenario())
+    assert first.ok
+    assert len(rest) == 2
+    assert all(r.cancelled and not r.ok and r.data is None for r in rest)
+
+
+def test_unconsumed_results_pause_the_batch(make_renderer):
+    async def scenario():
+        renderer = make_renderer(_sleepy_capture, max_concurrency=2)
+        async with renderer.render_batch(
+            [_frame(1) for _ in range(20)]
+        ) as batch:
+            await asyncio.sleep(0.3)
+            # 队列中最多 2 个结果，另有 2 个工作协程等待入队
+            assert batch.done <= 4 and batch.started <= 4
+            first = await batch.__anext__()
+        return first, batch
+
+    first, batch = asyncio.run(scenario())
+    assert first.ok and batch.started < 20
+
+
+def test_batch_rejects_invalid_jobs(make_renderer):
+    async def scenario():
+        renderer = make_renderer(_sleepy_capture)
+        await renderer.render_batch([_frame(1), "not a frame"]).wait()
+
+    with pytest.raises(TypeError, match="Invalid render job"):
+        asyncio.run(scenario())
+
+
+def test_df_to_image_timeout(monkeypatch, tmp_path):
+    async def capture(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(core_module, "_capture_image", capture)
+    with pytest.raises(RenderTimeoutError):
+        df_to_image(_frame(2), tmp_path / "out.png", timeout=0.05)
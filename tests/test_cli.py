@@ -0,0 +1,218 @@
+"""
+Tests for the command-line input handling
+"""
+
+import json
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from dataframe2image import renderer as renderer_module
+from dataframe2image.cli import (
+    build_parser,
+    expand_inputs,
+    iter_frames,
+    main,
+    output_stems,
+)
+
+
+def _write_csv(path, rows=10):
+    pd.DataFrame(
+        {"a": range(rows), "b": list("xy") * (rows // 2), "c": 1.5}
+    ).to_csv(path, index=False)
+
+
+def test_expand_inputs_handles_globs_and_directories(tmp_path):
+    for name in ["b.csv", "a.csv", "notes.md"]:
+        (tmp_path / name).write_text("a\n1\n")
+
+    assert [p.name for p in expand_inputs([str(tmp_path)])] == [
+        "a.csv",
+        "b.csv",
+    ]
+    assert [
+        p.name
+        for p in expand_inputs(
+            [str(tmp_path / "*.csv"), str(tmp_path / "a.csv")]
+        )
+    ] == ["a.csv", "b.csv"]
+
+
+def test_expand_inputs_reports_unmatched_patterns(tmp_path):
+    (tmp_path / "a.csv").write_text("a\n1\n")
+    (tmp_path / "empty_dir").mkdir()
+    unmatched = []
+
+    paths = expand_inputs(
+        [
+            str(tmp_path / "*.csv"),
+            str(tmp_path / "*.parquet"),
+            str(tmp_path / "empty_dir"),
+        ],
+        unmatched,
+    )
+
+    assert [p.name for p in paths] == ["a.csv"]
+    assert unmatched == [
+        str(tmp_path / "*.parquet"),
+        str(tmp_path / "empty_dir"),
+    ]
+
+
+def test_iter_frames_streams_chunks_with_column_and_row_limits(tmp_path):
+    path = tmp_path / "data.csv"
+    _write_csv(path)
+
+    frames = list(
+        iter_frames(path, columns=["a", "c"], max_rows=7, rows_per_image=3)
+    )
+
+    assert [len(df) for df in frames] == [3, 3, 1]
+    assert all(list(df.columns) == ["a", "c"] for df in frames)
+
+
+def test_iter_frames_without_chunking_yields_one_frame(tmp_path):
+    path = tmp_path / "data.csv"
+    _write_csv(path)
+
+    frames = list(iter_frames(path))
+
+    assert len(frames) == 1 and len(frames[0]) == 10
+
+
+def test_output_stems_tell_same_named_inputs_apart(tmp_path):
+    inputs = [
+        tmp_path / "a" / "x.csv",
+        tmp_path / "b" / "x.csv",
+        tmp_path / "y.csv",
+        tmp_path / "y.parquet",
+        tmp_path / "z.csv",
+    ]
+
+    assert list(output_stems(inputs).values()) == [
+        "a_x",
+        "b_x",
+        "y_csv",
+        "y_parquet",
+        "z",
+    ]
+
+
+def test_parser_defaults():
+    args = build_parser().parse_args(["in.csv", "--no-index", "-j", "2"])
+
+    assert args.index is False and args.jobs == 2
+    assert args.thousand_separator is None and args.style == "light"
+
+
+class FakeRenderer:
+    def __init__(self, **options):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def render(self, df, output_path, **options):
+        return b"png"
+
+
+def test_main_reports_skipped_files_and_unmatched_patterns(
+    monkeypatch, tmp_path, capsys
+):
+    monkeypatch.setattr(renderer_module, "Renderer", FakeRenderer)
+    _write_csv(tmp_path / "data.csv")
+    (tmp_path / "header_only.csv").write_text("a,b\n")
+    (tmp_path / "zero_bytes.csv").write_text("")
+    report = tmp_path / "report.json"
+
+    status = main(
+        [
+            str(tmp_path / "*.csv"),
+            "-o",
+            str(tmp_path / "out"),
+            "--report",
+            str(report),
+        ]
+    )
+    assert status == 0
+    results = {
+        r["source"].rsplit("/", 1)[-1]: r
+        for r in json.loads(report.read_text())
+    }
+    assert (
+        results["data.csv"]["rows"] == 10
+        and results["data.csv"]["skipped"] is None
+    )
+    assert (
+        results["header_only.csv"]["skipped"]
+        and results["zero_bytes.csv"]["skipped"]
+    )
+    assert "1 succeeded, 0 failed, 2 skipped" in capsys.readouterr().out
+
+    assert (
+        main([str(tmp_path / "*.parquet"), "-o", str(tmp_path / "out")]) == 1
+    )
+    assert "No input files match" in capsys.readouterr().err
+
+
+def test_main_fails_inputs_whose_output_is_taken(monkeypatch, tmp_path):
+    monkeypatch.setattr(renderer_module, "Renderer", FakeRenderer)
+    for name in ["a_x.csv", "a/x.csv", "b/x.csv"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        _write_csv(tmp_path / name, rows=2)
+    report = tmp_path / "report.json"
+
+    status = main(
+        [
+            str(tmp_path / "a_x.csv"),
+            str(tmp_path / "a" / "x.csv"),
+            str(tmp_path / "b" / "x.csv"),
+            "-o",
+            str(tmp_path / "out"),
+            "--report",
+            str(report),
+        ]
+    )
+
+    assert status == 1
+    results = {
+        Path(r["source"]).relative_to(tmp_path).as_posix(): r
+        for r in json.loads(report.read_text())
+    }
+    assert Path(results["b/x.csv"]["output"]).name == "b_x.png"
+    assert results["a_x.csv"]["error"] is None
+    assert results["b/x.csv"]["error"] is None
+    assert "collides with" in results["a/x.csv"]["error"]
+
+
+def test_run_reads_chunks_off_the_event_loop(monkeypatch, tmp_path):
+    from dataframe2image import cli
+
+    monkeypatch.setattr(renderer_module, "Renderer", FakeRenderer)
+    _write_csv(tmp_path / "data.csv", rows=4)
+    threads = []
+
+    def frames(*args):
+        for df in iter_frames(*args):
+            threads.append(threading.current_thread())
+            yield df
+
+    monkeypatch.setattr(cli, "iter_frames", frames)
+
+    status = main(
+        [
+            str(tmp_path / "data.csv"),
+            "-o",
+            str(tmp_path / "out"),
+            "--rows-per-image",
+            "2",
+        ]
+    )
+
+    assert status == 0 and len(threads) == 2
+    assert threading.main_thread() not in threads
@@ -0,0 +1,60 @@
+"""
+Tests for vectorized conditional formatting
+"""
+
+import numpy as np
+import pandas as pd
+
+from dataframe2image import ColorScale, DataBar, Threshold, df_to_html
+from dataframe2image.conditional import (
+    conditional_css,
+    evaluate_conditional_formats,
+)
+
+
+def test_color_scale_buckets_by_column_range():
+    df = pd.DataFrame({"v": [0.0, 5.0, 10.0, np.nan], "name": list("abcd")})
+
+    classes = evaluate_conditional_formats(df, [ColorScale(buckets=4)])
+
+    assert [row[0] for row in classes] == ["cf0-0", "cf0-2", "cf0-3", ""]
+    assert all(row[1] == "" for row in classes)
+
+
+def test_rules_combine_and_target_columns():
+    df = pd.DataFrame({"a": [0, 50, 100], "b": [100, 200, 300]})
+    rules = [
+        DataBar(columns=["a"], buckets=2),
+        Threshold(">", 150, columns=["b"]),
+    ]
+
+    classes = evaluate_conditional_formats(df, rules)
+
+    assert classes == [["cf0-0", ""], ["cf0-1", "cf1-0"], ["cf0-1", "cf1-0"]]
+
+    # 同一单元格命中多条规则时，类名以单个空格连接
+    overlapping = evaluate_conditional_formats(
+        df, [DataBar(buckets=2), Threshold(">", 150)]
+    )
+    assert overlapping[2] == ["cf0-1", "cf0-1 cf1-0"]
+
+
+def test_css_is_bucketed_not_per_cell():
+    rules = [ColorScale(colors=["#000000", "#ffffff"], buckets=2)]
+    css = conditional_css(rules)
+
+    assert css.count("{") == 2
+    assert "#404040" in css and "#bfbfbf" in css
+
+
+def test_html_uses_classes_and_formats_raw_values():
+    df = pd.DataFrame({"sales": [1000, 2000000]})
+
+    html = df_to_html(df, thousand_separator=True,
+                      conditional_formats=[Threshold(">=", 1e6, bold=True)])
+
+    assert '<td class="cf0-0">2,000,000</td>' in html
+    # 未格式化的单元格不输出空的 class 属性
+    assert 'class=""' not in html and 'class=" ' not in html
+    assert "tbody tr td.cf0-0" in html
+    assert "style=" not in html.split("<body")[1]
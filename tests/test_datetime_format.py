@@ -0,0 +1,100 @@
+"""
+Tests for datetime and timedelta column formatting
+"""
+
+import pandas as pd
+
+from dataframe2image import TableStyle, df_to_html
+from dataframe2image.core import (
+    format_datetime_values,
+    preprocess_dataframe_for_formatting,
+)
+
+
+def test_date_only_columns_drop_midnight_times():
+    values = pd.Series(pd.to_datetime(["2024-01-01", None, "2024-03-05"]))
+
+    assert format_datetime_values(values).tolist() == [
+        "2024-01-01",
+        "",
+        "2024-03-05",
+    ]
+
+
+def test_datetime_default_and_timezone():
+    values = pd.Series(
+        pd.to_datetime(["2024-01-01 08:30", "2024-01-01 00:00"]).tz_localize(
+            "UTC"
+        )
+    )
+
+    assert format_datetime_values(values).tolist() == [
+        "2024-01-01 08:30:00 UTC",
+        "2024-01-01 00:00:00 UTC",
+    ]
+    assert format_datetime_values(
+        values, "%H:%M", timezone="Asia/Shanghai"
+    ).tolist() == ["16:30", "08:00"]
+
+
+def test_timedelta_formats():
+    values = pd.Series(pd.to_timedelta(["90min", "-2h", "1 days 3h", None]))
+
+    assert format_datetime_values(values).tolist() == [
+        "0 days 01:30:00", "-0 days 02:00:00", "1 days 03:00:00", "",
+    ]
+    assert format_datetime_values(values[:2]).tolist() == [
+        "01:30:00",
+        "-02:00:00",
+    ]
+    assert format_datetime_values(
+        values, "{total_hours}h{minutes:02d}"
+    ).tolist() == [
+        "1h30",
+        "-2h00",
+        "27h00",
+        "",
+    ]
+
+
+def test_timedelta_precision_follows_the_finest_unit():
+    def fmt(*values):
+        return format_datetime_values(
+            pd.Series(pd.to_timedelta(list(values)))
+        ).tolist()
+
+    assert fmt("1.5s", "2s") == ["00:00:01.500", "00:00:02.000"]
+    assert fmt("0.0005s", "1.25s") == ["00:00:00.000500", "00:00:01.250000"]
+    assert fmt("1ns") == ["00:00:00.000000001"]
+
+
+def test_per_column_formats_and_index():
+    df = pd.DataFrame(
+        {
+            "a": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+            "b": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+            "n": [20240101, 5],
+        },
+        index=pd.DatetimeIndex(
+            ["2024-01-01 09:00", "2024-01-01 10:00"], name="at"
+        ),
+    )
+
+    out = preprocess_dataframe_for_formatting(
+        df, True, {"a": "%Y%m%d", "at": "%H:%M"}
+    )
+
+    # 格式化后的日期字符串不会再被加上千分位
+    assert out["a"].tolist() == ["20240101", "20240102"]
+    assert out["b"].tolist() == ["2024-01-01", "2024-01-02"]
+    assert out["n"].tolist() == ["20,240,101", "5"]
+    assert out.index.tolist() == ["09:00", "10:00"] and out.index.name == "at"
+    assert df["a"].dtype.kind == "M"
+
+
+def test_style_formats_reach_html():
+    df = pd.DataFrame({"when": pd.to_datetime(["2024-05-01 12:00"])})
+
+    html = df_to_html(df, style=TableStyle(datetime_format="%d/%m/%Y"))
+
+    assert "01/05/2024" in html and "12:00" not in html
@@ -0,0 +1,91 @@
+"""
+Tests for composite grid layouts
+"""
+
+import pandas as pd
+import pytest
+
+from dataframe2image import TableStyle, core, layout_to_html, render_layout
+
+DF1 = pd.DataFrame({"region": ["east", "west"], "sales": [10, 20]})
+DF2 = pd.DataFrame({"cost": [1.5, 2.5]})
+DF3 = pd.DataFrame({"产品": ["苹果"], "数量": [3]})
+
+
+def test_grid_page_contains_all_tables_and_titles():
+    html = layout_to_html(
+        [[DF1, DF2], [DF3]],
+        titles=["Sales", None, "Products"],
+        title="Daily report",
+    )
+
+    assert html.count('class="table-container"') == 3
+    assert html.count('class="layout-row"') == 2
+    assert html.count('class="table-title"') == 2
+    assert "Daily report" in html and "Products" in html
+    # 一份样式表，中文表格触发的字体对整页生效
+    assert html.count("<style>") == 1
+
+
+def test_chinese_titles_load_the_chinese_font():
+    ascii_only = layout_to_html(
+        [[DF1, DF2]], titles=["Sales", "Cost"], title="Report"
+    )
+    assert "@font-face" not in ascii_only
+
+    for titles, title in [(["销售", None], None), (None, "日报")]:
+        html = layout_to_html([[DF1, DF2]], titles=titles, title=title)
+        assert "@font-face" in html and "方正兰亭圆简体" in html
+
+
+def test_titles_may_follow_the_grid_shape():
+    html = layout_to_html([[DF1, DF2], [DF3]], titles=[["A", "B"], ["C"]])
+    assert all(f'<div class="table-title">{t}</div>' in html for t in "ABC")
+
+
+def test_text_is_html_escaped():
+    df = pd.DataFrame(
+        {"<b>col</b>": ["<img src=x onerror=alert(1)>"]},
+        index=pd.Index(["<i>row</i>"], name="<u>idx</u>"),
+    )
+
+    html = layout_to_html(
+        [df],
+        titles=["<script>t</script>"],
+        title="a & b",
+        style=TableStyle(font_family="'Noto Sans', sans-serif"),
+    )
+
+    assert "<img" not in html and "&lt;img src=x" in html
+    for text in ["<b>", "<i>", "<u>", "<script>"]:
+        assert text not in html
+    assert "a &amp; b" in html
+    # 样式表不转义：字体名中的引号原样保留
+    assert "font-family: 'Noto Sans', sans-serif;" in html
+
+
+def test_flat_list_is_one_row():
+    html = layout_to_html([DF1, DF2])
+    assert html.count('class="layout-row"') == 1
+
+
+def test_invalid_layouts_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="titles"):
+        layout_to_html([[DF1, DF2]], titles=["only one"])
+    with pytest.raises(ValueError, match="empty"):
+        layout_to_html([[DF1, pd.DataFrame()]])
+    with pytest.raises(ValueError, match="SVG"):
+        render_layout([DF1], tmp_path / "t.svg", format="svg")
+
+
+def test_layout_is_captured_once(monkeypatch, tmp_path):
+    calls = []
+
+    async def fake_capture(html, output_path, specs, *args, **kwargs):
+        calls.append((html.count('class="table-container"'), output_path))
+        return b""
+
+    monkeypatch.setattr("dataframe2image.layout._capture_image", fake_capture)
+    render_layout([[DF1, DF2], [DF3]], tmp_path / "report.png")
+    assert calls == [(3, tmp_path / "report.png")]
+    assert core._CAPTURE_SELECTOR.startswith(".layout-grid")
@@ -0,0 +1,46 @@
+"""
+Tests that importing the package stays light
+"""
+
+import subprocess
+import sys
+
+HEAVY_MODULES = ("pandas", "numpy", "jinja2", "playwright", "PIL")
+
+
+def _loaded_after(code):
+    script = (
+        f"import sys\n{code}\n"
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_package_import_loads_no_heavy_dependencies():
+    assert _loaded_after("import dataframe2image") == set()
+
+
+def test_df_to_html_does_not_load_playwright():
+    loaded = _loaded_after(
+        "import pandas as pd\n"
+        "from dataframe2image import df_to_html\n"
+        "df_to_html(pd.DataFrame({'a': [1]}))"
+    )
+    assert "jinja2" in loaded
+    assert "playwright" not in loaded and "PIL" not in loaded
+
+
+def test_lazy_attributes_resolve():
+    import dataframe2image
+    from dataframe2image.core import df_to_image
+    from dataframe2image.template import TABLE_TEMPLATE, get_table_template
+
+    assert dataframe2image.df_to_image is df_to_image
+    assert TABLE_TEMPLATE is get_table_template()
+    assert set(dataframe2image.__all__) <= set(dir(dataframe2image))
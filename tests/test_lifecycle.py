@@ -0,0 +1,180 @@
+"""
+Tests for browser recycling, crash recovery and error classification
+"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from dataframe2image.exceptions import (
+    BrowserCrashedError,
+    CaptureError,
+    RenderError,
+    RenderTimeoutError,
+    classify_capture_error,
+)
+
+
+DF = pd.DataFrame({"a": [1, 2]})
+
+
+def test_classify_capture_error():
+
+    class TimeoutError(
+        Exception
+    ):  # noqa: A001 - mimics playwright's class name
+        pass
+
+    assert isinstance(
+        classify_capture_error(TimeoutError("30000ms")), RenderTimeoutError
+    )
+    assert isinstance(
+        classify_capture_error(
+            Exception("Target page, context or browser has been closed")
+        ),
+        BrowserCrashedError,
+    )
+    plain = classify_capture_error(Exception("net::ERR_FAILED"))
+    assert type(plain) is CaptureError
+    assert isinstance(plain, RenderError) and isinstance(plain, RuntimeError)
+
+
+def test_classify_uses_browser_connection(fake_browser):
+    fake_browser.connected = False
+    assert isinstance(
+        classify_capture_error(Exception("boom"), fake_browser),
+        BrowserCrashedError,
+    )
+
+
+def test_recycles_after_max_pages(make_renderer):
+    async def capture(html, output_path, specs, *args, browser=None, **kwargs):
+        return b"png"
+
+    async def scenario():
+        renderer = make_renderer(capture, max_pages_per_browser=2)
+        for _ in range(5):
+            await renderer.render(DF)
+        return renderer
+
+    renderer = asyncio.run(scenario())
+    browsers = renderer._playwright.chromium.browsers
+    assert renderer.recycles == 2
+    assert len(browsers) == 3
+    assert all(b.closed for b in browsers[:2]) and not browsers[2].closed
+
+
+def test_rss_is_sampled_every_few_renders(make_renderer, monkeypatch):
+    from dataframe2image import renderer as renderer_module
+
+    samples = []
+
+    async def capture(html, output_path, specs, *args, browser=None, **kwargs):
+        return b"png"
+
+    async def rss_bytes(browser):
+        samples.append(browser)
+        return 2048 * 1024 * 1024 if len(samples) == 2 else 1024
+
+    monkeypatch.setattr(renderer_module, "browser_rss_bytes", rss_bytes)
+
+    async def scenario():
+        renderer = make_renderer(capture, max_browser_rss_mb=1024)
+        for _ in range(25):
+            await renderer.render(DF)
+        return renderer
+
+    renderer = asyncio.run(scenario())
+    assert len(samples) == 2 and renderer.recycles == 1
+
+
+def test_recycled_browser_drains_before_closing(make_renderer):
+    seen = []
+
+    async def scenario():
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def capture(
+            html, output_path, specs, *args, browser=None, **kwargs
+        ):
+            seen.append(browser)
+            if len(seen) == 1:
+                started.set()
+                await release.wait()
+            # 第一个任务仍在旧浏览器上运行时，旧浏览器不能被关闭
+            assert not browser.closed
+            return b"png"
+
+        renderer = make_renderer(
+            capture, max_concurrency=2, max_pages_per_browser=1
+        )
+        slow = asyncio.ensure_future(renderer.render(DF))
+        await started.wait()
+        await renderer.render(DF)
+        release.set()
+        await slow
+        return renderer
+
+    renderer = asyncio.run(scenario())
+    first = renderer._playwright.chromium.browsers[0]
+    assert seen[0] is first and first.closed
+
+
+def test_crash_relaunches_and_retries_once(make_renderer):
+    calls = []
+
+    async def capture(html, output_path, specs, *args, browser=None, **kwargs):
+        calls.append(browser)
+        if len(calls) == 1:
+            browser.crash()
+            raise BrowserCrashedError(
+                "Failed to capture screenshot: Target crashed"
+            )
+        return b"png"
+
+    async def scenario():
+        renderer = make_renderer(capture)
+        return renderer, await renderer.render(DF)
+
+    renderer, result = asyncio.run(scenario())
+    assert result == b"png"
+    assert calls[0] is not calls[1]
+    assert renderer.counters() == {
+        "browser_launches": 2,
+        "browser_crashes": 1,
+        "browser_recycles": 0,
+        "renders_retried": 1,
+    }
+
+
+def test_crash_raises_after_retries_exhausted(make_renderer):
+    async def capture(html, output_path, specs, *args, browser=None, **kwargs):
+        raise BrowserCrashedError(
+            "Failed to capture screenshot: Target crashed"
+        )
+
+    async def scenario():
+        renderer = make_renderer(capture, retries=1)
+        await renderer.render(DF)
+
+    with pytest.raises(BrowserCrashedError):
+        asyncio.run(scenario())
+
+
+def test_other_capture_errors_are_not_retried(make_renderer):
+    calls = []
+
+    async def capture(html, output_path, specs, *args, browser=None, **kwargs):
+        calls.append(browser)
+        raise RenderTimeoutError(
+            "Failed to capture screenshot: Timeout 30000ms exceeded"
+        )
+
+    async def scenario():
+        renderer = make_renderer(capture)
+        await renderer.render(DF)
+
+    with pytest.raises(RenderTimeoutError):
+        asyncio.run(scenario())
+    assert len(calls) == 1
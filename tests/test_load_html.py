@@ -0,0 +1,57 @@
+"""
+Tests for choosing between set_content and file:// navigation
+"""
+
+import asyncio
+import os
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import pytest
+
+from dataframe2image import core
+
+
+class FakePage:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.content = None
+        self.url = None
+        self.loaded_from_disk = None
+
+    async def set_content(self, html):
+        self.content = html
+
+    async def goto(self, url):
+        self.url = url
+        path = url2pathname(urlparse(url).path)
+        with open(path, encoding="utf-8") as f:
+            self.loaded_from_disk = f.read()
+        if self.fail:
+            raise TimeoutError("Timeout 30000ms exceeded")
+
+
+def test_small_documents_use_set_content(monkeypatch):
+    monkeypatch.setattr(core, "FILE_NAVIGATION_THRESHOLD", 100)
+    page = FakePage()
+    asyncio.run(core._load_html(page, "<p>small</p>"))
+    assert page.content == "<p>small</p>" and page.url is None
+
+
+def test_large_documents_are_navigated_and_cleaned_up(monkeypatch):
+    monkeypatch.setattr(core, "FILE_NAVIGATION_THRESHOLD", 100)
+    html = "<p>" + "销售额" * 100 + "</p>"
+    page = FakePage()
+    asyncio.run(core._load_html(page, html))
+
+    assert page.content is None and page.url.startswith("file://")
+    assert page.loaded_from_disk == html
+    assert not os.path.exists(url2pathname(urlparse(page.url).path))
+
+
+def test_temp_file_is_removed_when_loading_fails(monkeypatch):
+    monkeypatch.setattr(core, "FILE_NAVIGATION_THRESHOLD", 1)
+    page = FakePage(fail=True)
+    with pytest.raises(TimeoutError):
+        asyncio.run(core._load_html(page, "<p>large</p>"))
+    assert not os.path.exists(url2pathname(urlparse(page.url).path))
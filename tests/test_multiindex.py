@@ -0,0 +1,56 @@
+"""
+Tests for MultiIndex rows and columns rendering
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from dataframe2image import df_to_html
+from dataframe2image.template import _level_runs, build_table_context
+
+
+def _pivot():
+    df = pd.DataFrame({
+        "region": ["East", "East", "East", "West", "West"],
+        "city": ["A", "A", "B", "C", "D"],
+        "year": [2023, 2024, 2024, 2023, 2024],
+        "metric": ["sales", "sales", "sales", "sales", "sales"],
+        "value": [1, 2, 3, 4, 5],
+    })
+    return df.pivot_table(
+        index=["region", "city"], columns=["metric", "year"], values="value"
+    )
+
+
+def test_level_runs_respect_parent_boundaries():
+    runs = _level_runs([np.array([0, 0, 0, 1, 1]), np.array([0, 0, 1, 1, 1])])
+
+    assert runs[0][0].tolist() == [0, 3] and runs[0][1].tolist() == [3, 2]
+    assert runs[1][0].tolist() == [0, 2, 3] and runs[1][1].tolist() == [
+        2,
+        1,
+        2,
+    ]
+
+
+def test_multiindex_rows_use_rowspan():
+    context = build_table_context(_pivot())
+
+    index_cells = [cells for cells, _, _ in context["data"]]
+    assert index_cells == [
+        [("East", 2), ("A", 1)],
+        [("B", 1)],
+        [("West", 2), ("C", 1)],
+        [("D", 1)],
+    ]
+
+
+def test_multiindex_columns_use_colspan():
+    html = df_to_html(_pivot())
+
+    assert '<th colspan="2">sales</th>' in html
+    assert re.search(r'<th class="index-header" rowspan="2">region</th>\s*'
+                     r'<th class="index-header" rowspan="2">city</th>', html)
+    assert "('East', 'A')" not in html
@@ -0,0 +1,85 @@
+"""
+Tests for offline (network-isolated) capture
+"""
+
+import asyncio
+
+from dataframe2image.core import (
+    OFFLINE_CHROMIUM_ARGS,
+    _block_network,
+    _launch_browser,
+    _prepare_page,
+    _wait_until_settled,
+)
+
+
+class FakeRoute:
+    def __init__(self, url):
+        self.request = type("Request", (), {"url": url})()
+        self.outcome = None
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+
+class FakePage:
+    def __init__(self):
+        self.calls = []
+
+    async def route(self, pattern, handler):
+        self.calls.append(("route", pattern))
+
+    async def evaluate(self, script):
+        self.calls.append(("evaluate",))
+        return True
+
+    async def wait_for_load_state(self, state):
+        self.calls.append(("wait_for_load_state", state))
+
+    async def wait_for_timeout(self, ms):
+        self.calls.append(("wait_for_timeout", ms))
+
+
+def _outcome(url):
+    route = FakeRoute(url)
+    asyncio.run(_block_network(route))
+    return route.outcome
+
+
+def test_only_local_requests_are_allowed():
+    assert _outcome("file:///usr/share/fonts/SimHei.TTF") == "continued"
+    assert _outcome("data:font/woff2;base64,AAAA") == "continued"
+    assert _outcome("https://fonts.googleapis.com/css") == "aborted"
+    assert _outcome("http://127.0.0.1:8080/") == "aborted"
+
+
+def test_offline_page_skips_network_waits():
+    page = FakePage()
+    asyncio.run(_prepare_page(page, offline=True))
+    asyncio.run(_wait_until_settled(page, offline=True))
+    assert page.calls == [("route", "**/*"), ("evaluate",)]
+
+    page = FakePage()
+    asyncio.run(_prepare_page(page))
+    asyncio.run(_wait_until_settled(page))
+    assert page.calls == [
+        ("wait_for_load_state", "networkidle"),
+        ("wait_for_timeout", 1000),
+    ]
+
+
+def test_offline_launch_uses_curated_flags():
+    launches = []
+
+    class Chromium:
+        async def launch(self, **kwargs):
+            launches.append(kwargs)
+
+    playwright = type("Playwright", (), {"chromium": Chromium()})()
+    asyncio.run(_launch_browser(playwright, offline=True))
+    asyncio.run(_launch_browser(playwright))
+    assert launches == [{"args": list(OFFLINE_CHROMIUM_ARGS)}, {}]
+    assert "--disable-gpu" in OFFLINE_CHROMIUM_ARGS
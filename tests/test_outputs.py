@@ -0,0 +1,85 @@
+"""
+Tests for deriving multiple outputs from a single capture
+"""
+
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from dataframe2image import outputs
+from dataframe2image.outputs import (
+    OutputSpec,
+    image_to_array,
+    normalize_outputs,
+    required_scale,
+    write_outputs,
+)
+
+
+def _png_bytes(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGBA", (width, height), (255, 0, 0, 255)).save(
+        buffer, format="PNG"
+    )
+    return buffer.getvalue()
+
+
+def test_output_spec_infers_format_from_suffix():
+    assert OutputSpec("table.jpg").format == "jpg"
+    assert OutputSpec("table.webp").format == "webp"
+    assert OutputSpec("table").format == "png"
+    with pytest.raises(ValueError):
+        OutputSpec("table.png", format="gif")
+
+
+def test_required_scale_ignores_thumbnails():
+    specs = normalize_outputs([
+        {"path": "a.png"},
+        {"path": "b.png", "scale": 2},
+        {"path": "c.png", "width": 50},
+    ])
+    assert required_scale(specs) == 2
+    assert required_scale(specs, device_scale_factor=3) == 3
+
+
+def test_write_outputs_resamples_from_one_capture(tmp_path):
+    screenshot = _png_bytes(200, 100)  # 100x50 CSS pixels captured at 2x
+    specs = normalize_outputs([
+        {"path": tmp_path / "full.png"},
+        {"path": tmp_path / "hidpi.png", "scale": 2},
+        {"path": tmp_path / "thumb.jpg", "width": 40},
+    ])
+
+    write_outputs(screenshot, specs, capture_scale=2)
+
+    assert Image.open(tmp_path / "full.png").size == (100, 50)
+    assert (tmp_path / "hidpi.png").read_bytes() == screenshot
+    thumb = Image.open(tmp_path / "thumb.jpg")
+    assert thumb.format == "JPEG"
+    assert thumb.size == (40, 20)
+
+
+def test_memmap_is_written_in_row_bands(monkeypatch, tmp_path):
+    pixels = np.random.default_rng(0).integers(
+        0, 256, (37, 10, 4), dtype=np.uint8
+    )
+    image = Image.fromarray(pixels)
+    crops = []
+    crop = Image.Image.crop
+    monkeypatch.setattr(
+        Image.Image,
+        "crop",
+        lambda self, box: crops.append(box) or crop(self, box),
+    )
+    # 每批 8 行：37 行分 5 批写入，不整体复制一份
+    monkeypatch.setattr(outputs, "MEMMAP_CHUNK_BYTES", 8 * 10 * 4)
+
+    mapped = image_to_array(image, tmp_path / "pixels.raw")
+
+    assert isinstance(mapped, np.memmap)
+    np.testing.assert_array_equal(mapped, pixels)
+    assert [box[1] for box in crops] == [0, 8, 16, 24, 32] and crops[-1][
+        3
+    ] == 37
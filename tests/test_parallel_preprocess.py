@@ -0,0 +1,90 @@
+"""
+Tests for column-parallel preprocessing
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataframe2image import core
+from dataframe2image.core import (
+    _format_thousands,
+    format_number_with_thousand_separator,
+    preprocess_dataframe_for_formatting,
+)
+
+
+def _wide_frame(rows=20, cols=12):
+    rng = np.random.default_rng(0)
+    data = {}
+    for j in range(cols):
+        if j % 3 == 0:
+            data[f"n{j}"] = rng.integers(0, 10_000_000, rows)
+        elif j % 3 == 1:
+            data[f"year_{j}"] = rng.integers(1990, 2030, rows)
+        else:
+            data[f"d{j}"] = pd.date_range("2024-01-01", periods=rows, freq="h")
+    return pd.DataFrame(data)
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_parallel_matches_serial(monkeypatch, backend):
+    monkeypatch.setattr(core, "PARALLEL_MIN_CELLS", 0)
+    df = _wide_frame()
+
+    serial = preprocess_dataframe_for_formatting(df, True)
+    parallel = preprocess_dataframe_for_formatting(
+        df, True, workers=3, backend=backend
+    )
+
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+@pytest.mark.parametrize("name", ["amount", "Year of sale", 0])
+@pytest.mark.parametrize(
+    "values",
+    [
+        [5, -999, 1000, 1999, 2100, 2101, -5000, 12_345_678],
+        np.array([3, 1500, 65_000], dtype=np.uint32),
+        [0.5, -0.0, 999.99, 1500.0, 1500.25, 2020.0, -1234.5, np.nan],
+        np.array([1234.5, 12.25, np.nan], dtype=np.float32),
+        [True, False],
+        pd.array([1500, None], dtype="Int64"),
+    ],
+    ids=["int", "uint", "float", "float32", "bool", "nullable"],
+)
+def test_vectorized_thousands_match_per_value_formatting(values, name):
+    series = pd.Series(values)
+
+    expected = series.apply(
+        lambda x: format_number_with_thousand_separator(x, name)
+    )
+
+    assert list(_format_thousands(series, name)) == list(expected)
+
+
+def test_small_frames_stay_serial(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("small frames must not be dispatched to a pool")
+
+    monkeypatch.setattr(core, "_format_columns_parallel", fail)
+    preprocess_dataframe_for_formatting(_wide_frame(), True, workers=4)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="backend"):
+        preprocess_dataframe_for_formatting(
+            _wide_frame(), True, workers=2, backend="gpu"
+        )
+
+
+def test_executors_are_shared_and_shut_down(monkeypatch):
+    monkeypatch.setattr(core, "PARALLEL_MIN_CELLS", 0)
+    preprocess_dataframe_for_formatting(_wide_frame(), True, workers=2)
+    executor = core._preprocess_executor("thread", 2)
+    assert core._preprocess_executor("thread", 2) is executor
+
+    core.shutdown_preprocess_executors()
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+    assert core._preprocess_executor("thread", 2) is not executor
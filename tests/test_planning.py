@@ -0,0 +1,104 @@
+"""
+Tests for render planning and budgets
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataframe2image import (
+    BudgetExceededError,
+    RenderBudget,
+    df_to_html,
+    df_to_image,
+    plan_render,
+)
+from dataframe2image import core
+
+
+def _frame(rows):
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "amount": np.linspace(0, 1_000_000, rows).round(2),
+        "region": ["华东地区", "north"] * (rows // 2) + ["x"] * (rows % 2),
+    })
+
+
+def test_plan_scales_with_rows_and_matches_html_size():
+    small = plan_render(_frame(100))
+    large = plan_render(_frame(10_000))
+
+    assert small.row_height == large.row_height
+    assert large.height - large.header_height == pytest.approx(
+        100 * (small.height - small.header_height)
+    )
+    assert large.estimated_seconds > small.estimated_seconds
+
+    actual = len(df_to_html(_frame(2_000)).encode("utf-8"))
+    estimated = plan_render(_frame(2_000)).html_bytes
+    assert 0.7 < estimated / actual < 1.3
+
+
+def test_device_scale_factor_scales_pixels():
+    plan = plan_render(_frame(10), device_scale_factor=2.0)
+    assert plan.pixel_width == 2 * plan.width
+    assert plan.to_dict()["megapixels"] == round(
+        plan.pixel_width * plan.pixel_height / 1e6, 3
+    )
+
+
+def test_budget_finds_largest_fitting_row_count():
+    plan = plan_render(_frame(1_000))
+    budget = RenderBudget(
+        max_rows=250, max_height=int(plan.with_rows(300).pixel_height)
+    )
+    assert budget.max_rows_within(plan) == 250
+    assert budget.violations(plan.with_rows(250)) == []
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    calls = []
+
+    async def fake_capture(html, output_path, specs, *args, **kwargs):
+        calls.append((output_path, html.count("<tr>")))
+        return b""
+
+    async def fake_tiles(frames, *args):
+        calls.extend((path, len(frame)) for frame, path in frames)
+
+    monkeypatch.setattr(core, "_capture_image", fake_capture)
+    monkeypatch.setattr(core, "_capture_tiles", fake_tiles)
+    return calls
+
+
+def test_reject_happens_before_rendering(captured, tmp_path):
+    with pytest.raises(BudgetExceededError) as info:
+        df_to_image(
+            _frame(1_000),
+            tmp_path / "t.png",
+            budget=RenderBudget(max_rows=100),
+        )
+    assert info.value.violations == ["rows 1000 > 100"]
+    assert captured == []
+
+
+def test_truncate_and_tile(captured, tmp_path):
+    df_to_image(
+        _frame(1_000),
+        tmp_path / "t.png",
+        budget=RenderBudget(max_rows=100, action="truncate"),
+    )
+    assert captured == [(tmp_path / "t.png", 101)]  # 表头一行 + 100 行数据
+
+    captured.clear()
+    df_to_image(
+        _frame(250),
+        tmp_path / "t.png",
+        budget=RenderBudget(max_rows=100, action="tile"),
+    )
+    assert captured == [
+        (tmp_path / "t_part001.png", 100),
+        (tmp_path / "t_part002.png", 100),
+        (tmp_path / "t_part003.png", 50),
+    ]
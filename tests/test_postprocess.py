@@ -0,0 +1,147 @@
+"""
+Tests for raw-pixel output and post-processing hooks
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+from dataframe2image import (
+    Background,
+    Border,
+    Watermark,
+    df_to_image,
+    df_to_pixels,
+)
+from dataframe2image import core
+from dataframe2image.outputs import normalize_outputs, write_outputs
+from dataframe2image.postprocess import apply_postprocess
+
+
+def _png_bytes(width, height, color=(255, 0, 0, 255)):
+    buffer = io.BytesIO()
+    Image.new("RGBA", (width, height), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def fake_capture(monkeypatch):
+
+    async def capture(
+        html_content,
+        output_path,
+        width=None,
+        height=None,
+        format="png",
+        device_scale_factor=1.0,
+        stats=None,
+        browser=None,
+        offline=False,
+        pages=None,
+    ):
+        data = _png_bytes(
+            round(40 * device_scale_factor), round(20 * device_scale_factor)
+        )
+        if output_path is not None:
+            with open(output_path, "wb") as f:
+                f.write(data)
+        return data
+
+    monkeypatch.setattr(core, "_capture_table_screenshot", capture)
+
+
+DF = pd.DataFrame({"a": [1, 2]})
+
+
+def test_hooks_scale_with_capture():
+    image = Image.new("RGBA", (40, 20), (0, 0, 0, 0))
+
+    result = apply_postprocess(
+        image, [Background("white", padding=2), Border(1, "blue")], scale=2
+    )
+
+    assert result.size == (40 + 8 + 4, 20 + 8 + 4)
+    assert result.getpixel((0, 0)) == (0, 0, 255, 255)
+    assert result.getpixel((3, 3)) == (255, 255, 255, 255)
+
+
+def test_watermark_and_callables():
+    image = Image.new("RGBA", (200, 60), (255, 255, 255, 255))
+
+    stamped = apply_postprocess(
+        image, [Watermark("draft", opacity=1.0), lambda im: im.convert("RGB")]
+    )
+
+    assert stamped.mode == "RGB" and stamped.size == image.size
+    pixels = np.asarray(stamped)
+    # 文字在右下角，左上角保持原样
+    assert pixels[-20:, -60:].min() < 128 and pixels[:20, :60].min() == 255
+    with pytest.raises(ValueError):
+        Watermark("x", position="middle")
+    with pytest.raises(TypeError):
+        apply_postprocess(image, ["not a hook"])
+
+
+def test_write_outputs_applies_hooks_once(tmp_path):
+    specs = normalize_outputs(
+        [
+            {"path": tmp_path / "full.png"},
+            {"path": tmp_path / "thumb.png", "width": 26},
+        ]
+    )
+
+    write_outputs(
+        _png_bytes(40, 20),
+        specs,
+        capture_scale=2,
+        postprocess=[Border(1, "black")],
+    )
+
+    assert Image.open(tmp_path / "full.png").size == (22, 12)
+    assert Image.open(tmp_path / "thumb.png").size == (26, 14)
+
+
+def test_df_to_pixels(fake_capture, tmp_path):
+    image = df_to_pixels(DF, postprocess=[Border(2)])
+    assert (
+        isinstance(image, Image.Image)
+        and image.mode == "RGBA"
+        and image.size == (44, 24)
+    )
+
+    array = df_to_pixels(DF, kind="array", mode="RGB", device_scale_factor=2)
+    assert array.shape == (40, 80, 3) and tuple(array[0, 0]) == (255, 0, 0)
+
+    mapped = df_to_pixels(
+        DF, kind="array", memmap_path=tmp_path / "pixels.raw"
+    )
+    assert isinstance(mapped, np.memmap) and mapped.shape == (20, 40, 4)
+    assert (tmp_path / "pixels.raw").stat().st_size == 20 * 40 * 4
+
+    with pytest.raises(ValueError):
+        df_to_pixels(DF, kind="bytes")
+    with pytest.raises(ValueError):
+        df_to_pixels(DF, memmap_path=tmp_path / "x.raw")
+
+
+def test_df_to_image_postprocess(fake_capture, tmp_path):
+    output = tmp_path / "table.png"
+
+    df_to_image(DF, output, postprocess=[Background("white", padding=5)])
+
+    assert Image.open(output).size == (50, 30)
+    with pytest.raises(ValueError, match="postprocess"):
+        df_to_image(
+            DF, tmp_path / "t.pdf", format="pdf", postprocess=[Border()]
+        )
+
+
+def test_webp_is_encoded_as_webp(fake_capture, tmp_path):
+    output = tmp_path / "table.webp"
+
+    df_to_image(DF, output, format="webp")
+
+    assert Image.open(output).format == "WEBP"
@@ -0,0 +1,168 @@
+"""
+Tests for the HTTP render service (with a fake browser pool)
+"""
+
+import asyncio
+import io
+import time
+
+import pandas as pd
+import pytest
+from PIL import Image
+
+pytest.importorskip("aiohttp")
+from aiohttp.test_utils import TestClient, TestServer  # noqa: E402
+
+from dataframe2image import serve as serve_module  # noqa: E402
+from dataframe2image.exceptions import RenderTimeoutError  # noqa: E402
+from dataframe2image.serve import create_app  # noqa: E402
+
+
+class FakePool:
+    """Stands in for RendererPool; returns a tiny PNG after a given delay."""
+
+    capacity = 1
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def render(self, df, output_path=None, **options):
+        self.calls.append((df, options))
+        await asyncio.sleep(self.delay)
+        buffer = io.BytesIO()
+        Image.new("RGB", (4, 2), "white").save(
+            buffer, format=options.get("format", "png").upper()
+        )
+        return buffer.getvalue()
+
+
+def _run(app, scenario):
+    async def _main():
+        async with TestClient(TestServer(app)) as client:
+            return await scenario(client)
+    return asyncio.run(_main())
+
+
+def test_render_json_and_csv_payloads():
+    pool = FakePool()
+
+    async def scenario(client):
+        resp = await client.post(
+            "/render",
+            json={
+                "data": {"columns": ["a", "b"], "data": [[1, 2], [3, 4]]},
+                "options": {
+                    "style": "dark",
+                    "format": "webp",
+                    "show_index": False,
+                },
+            },
+        )
+        assert resp.status == 200 and resp.content_type == "image/webp"
+        assert Image.open(io.BytesIO(await resp.read())).format == "WEBP"
+
+        resp = await client.post(
+            "/render?width=640&thousand_separator=true",
+            data=b"a,b\n1,2\n",
+            headers={"Content-Type": "text/csv"},
+        )
+        assert resp.status == 200 and resp.content_type == "image/png"
+
+    _run(create_app(pool), scenario)
+    (df, options), (_, csv_options) = pool.calls
+    assert df.shape == (2, 2) and options == {
+        "style": "dark",
+        "format": "png",
+        "show_index": False,
+    }
+    assert csv_options == {
+        "width": 640,
+        "thousand_separator": True,
+        "format": "png",
+    }
+
+
+def test_bad_requests_are_rejected_with_400():
+    async def scenario(client):
+        resp = await client.post(
+            "/render", json={"data": [{"a": 1}], "options": {"colour": "red"}}
+        )
+        assert resp.status == 400
+        resp = await client.post(
+            "/render", data=b"x", headers={"Content-Type": "text/plain"}
+        )
+        assert resp.status == 400
+        for style in (
+            {"border_color": "red} body { background: url(http://x/)"},
+            {"font_size": "12px; color: red"},
+        ):
+            resp = await client.post(
+                "/render",
+                json={"data": [{"a": 1}], "options": {"style": style}},
+            )
+            assert resp.status == 400
+            assert "Invalid style" in (await resp.json())["error"]
+
+    _run(create_app(FakePool()), scenario)
+
+
+def test_backpressure_and_timeouts():
+    pool = FakePool(delay=0.3)
+
+    async def scenario(client):
+        payload = {"data": [{"a": 1}]}
+        responses = await asyncio.gather(
+            *(client.post("/render", json=payload) for _ in range(3))
+        )
+        statuses = sorted(r.status for r in responses)
+        metrics = await (await client.get("/metrics")).json()
+        health = await (await client.get("/healthz")).json()
+        return statuses, metrics, health
+
+    statuses, metrics, health = _run(
+        create_app(pool, max_queue=1, timeout=0.1), scenario
+    )
+    assert statuses == [429, 504, 504]
+    assert metrics["rejected_total"] == 1 and metrics["timeouts_total"] == 2
+    assert health["status"] == "ok"
+
+
+def test_renderer_timeouts_map_to_504():
+    class TimingOutPool(FakePool):
+        async def render(self, df, output_path=None, **options):
+            raise RenderTimeoutError("Render did not finish within 5s")
+
+    async def scenario(client):
+        resp = await client.post("/render", json={"data": [{"a": 1}]})
+        metrics = await (await client.get("/metrics")).json()
+        return resp.status, metrics
+
+    status, metrics = _run(create_app(TimingOutPool()), scenario)
+    assert status == 504 and metrics["timeouts_total"] == 1
+
+
+def test_payload_parsing_does_not_block_the_loop(monkeypatch):
+    def slow_parse(content_type, body):
+        time.sleep(0.3)
+        return pd.read_csv(io.BytesIO(body))
+
+    monkeypatch.setattr(serve_module, "_frame_from_body", slow_parse)
+
+    async def scenario(client):
+        render = asyncio.ensure_future(
+            client.post(
+                "/render", data=b"a\n1\n", headers={"Content-Type": "text/csv"}
+            )
+        )
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        health = await client.get("/healthz")
+        health_seconds = time.perf_counter() - start
+        return health.status, health_seconds, (await render).status
+
+    health_status, health_seconds, render_status = _run(
+        create_app(FakePool()), scenario
+    )
+    assert health_status == 200 and health_seconds < 0.2
+    assert render_status == 200
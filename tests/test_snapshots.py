@@ -0,0 +1,223 @@
+"""
+Golden-image regression tests with render-time budgets
+
+Every case of ``CORPUS`` is rendered in every theme of ``THEMES`` and compared
+with ``tests/snapshots/<case>-<theme>.png``. Images may differ by antialiasing
+noise (see ``PIXEL_THRESHOLD`` / ``MAX_DIFF_RATIO``) but not by layout. The
+render time of each case is compared with ``tests/snapshots/timings.json``.
+
+Goldens depend on the installed Chromium and fonts, so the cases are opt-in:
+they are skipped unless ``--snapshots`` (``make snapshots``) is given. Record
+the goldens on the host that runs the checks (e.g. the CI image):
+
+    pytest tests/test_snapshots.py --update-snapshots
+
+and commit ``tests/snapshots/``. With ``--snapshots`` the cases are skipped
+when Chromium is not installed, and a case without a golden image or recorded
+time fails, so a host without goldens cannot pass silently.
+"""
+
+import io
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+from dataframe2image import RenderStats
+from dataframe2image.styles import THEMES
+
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"
+TIMINGS_FILE = SNAPSHOT_DIR / "timings.json"
+
+# 感知容差：单个像素任一通道差值超过阈值才算不同，不同像素占比超过上限才失败
+PIXEL_THRESHOLD = 24
+MAX_DIFF_RATIO = 0.002
+# 渲染耗时的绝对余量（秒），避免极短的渲染因调度抖动而失败
+TIME_SLACK = 0.25
+
+
+def _corpus():
+    rng = np.random.default_rng(7)
+    nan_heavy = pd.DataFrame(
+        rng.normal(0, 1000, (12, 5)).round(2), columns=list("abcde")
+    )
+    nan_heavy = nan_heavy.mask(rng.random(nan_heavy.shape) < 0.5)
+    return {
+        "ascii": (
+            pd.DataFrame(
+                {
+                    "product": ["apple", "banana", "cherry", "date"],
+                    "price": [1.25, 0.5, 3.75, 2.0],
+                    "stock": [120, 45, 8, 300],
+                }
+            ),
+            {},
+        ),
+        "cjk": (
+            pd.DataFrame(
+                {
+                    "产品": ["苹果", "香蕉", "樱桃"],
+                    "地区": ["华东", "华北", "华南"],
+                    "销量": [1200, 850, 430],
+                }
+            ),
+            {},
+        ),
+        "wide": (
+            pd.DataFrame(
+                rng.integers(0, 100, (3, 40)),
+                columns=[f"col_{i}" for i in range(40)],
+            ),
+            {},
+        ),
+        "tall": (
+            pd.DataFrame(
+                {
+                    "id": range(300),
+                    "value": rng.integers(0, 10_000, 300),
+                    "label": [f"row {i}" for i in range(300)],
+                }
+            ),
+            {},
+        ),
+        "nan_heavy": (nan_heavy, {}),
+        "thousands": (
+            pd.DataFrame(
+                {
+                    "year": [2022, 2023, 2024],
+                    "revenue": [1234567.5, 2345678.25, 3456789.0],
+                    "units": [15000, 27500, 1000000],
+                }
+            ),
+            {"thousand_separator": True},
+        ),
+    }
+
+
+CORPUS = _corpus()
+CASES = [(case, theme) for case in CORPUS for theme in sorted(THEMES)]
+
+
+def image_difference(actual, expected):
+    """
+    Fraction of pixels that differ noticeably between two images.
+
+    Returns 1.0 when the sizes differ, since that means the layout changed.
+    """
+    if actual.size != expected.size:
+        return 1.0
+    a = np.asarray(actual.convert("RGBA"), dtype=np.int16)
+    b = np.asarray(expected.convert("RGBA"), dtype=np.int16)
+    changed = np.abs(a - b).max(axis=2) > PIXEL_THRESHOLD
+    return float(changed.mean())
+
+
+def _chromium_available():
+    try:
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as p:
+            return os.path.exists(p.chromium.executable_path)
+    except Exception:
+        return False
+
+
+@pytest.fixture(scope="module")
+def renderer():
+    if not _chromium_available():
+        pytest.skip("Playwright Chromium is not installed")
+    from dataframe2image.renderer import SyncRenderer
+
+    # 离线渲染：不受网络影响，结果和耗时更稳定
+    with SyncRenderer(max_concurrency=1, offline=True) as renderer:
+        # 预热一次，避免首个用例计入浏览器冷启动
+        renderer.render(CORPUS["ascii"][0])
+        yield renderer
+
+
+@pytest.fixture(scope="module")
+def timings(request):
+    recorded = (
+        json.loads(TIMINGS_FILE.read_text()) if TIMINGS_FILE.exists() else {}
+    )
+    updated = dict(recorded)
+    yield recorded, updated
+    if request.config.getoption("--update-snapshots") and updated != recorded:
+        SNAPSHOT_DIR.mkdir(exist_ok=True)
+        TIMINGS_FILE.write_text(
+            json.dumps(updated, indent=2, sort_keys=True) + "\n"
+        )
+
+
+@pytest.mark.snapshot
+@pytest.mark.parametrize(
+    "case, theme", CASES, ids=[f"{c}-{t}" for c, t in CASES]
+)
+def test_snapshot(request, renderer, timings, case, theme):
+    df, options = CORPUS[case]
+    golden = SNAPSHOT_DIR / f"{case}-{theme}.png"
+    update = request.config.getoption("--update-snapshots")
+    recorded, updated = timings
+    if not update:
+        if not golden.exists():
+            pytest.fail(
+                f"No golden image {golden.name}; "
+                "record it with --update-snapshots"
+            )
+        if golden.stem not in recorded:
+            pytest.fail(
+                f"No recorded render time for {golden.stem} "
+                f"in {TIMINGS_FILE.name}; record it with --update-snapshots"
+            )
+
+    stats = RenderStats()
+    png = renderer.render(df, style=theme, stats=stats, **options)
+
+    if update:
+        SNAPSHOT_DIR.mkdir(exist_ok=True)
+        golden.write_bytes(png)
+        updated[golden.stem] = round(stats.total_seconds, 4)
+        return
+
+    difference = image_difference(
+        Image.open(io.BytesIO(png)), Image.open(golden)
+    )
+    if difference > MAX_DIFF_RATIO:
+        (SNAPSHOT_DIR / f"{golden.stem}.actual.png").write_bytes(png)
+    assert difference <= MAX_DIFF_RATIO, (
+        f"{golden.name}: {difference:.2%} of pixels differ "
+        f"(see {golden.stem}.actual.png)"
+    )
+
+    baseline = recorded[golden.stem]
+    budget = (
+        baseline * request.config.getoption("--snapshot-time-factor")
+        + TIME_SLACK
+    )
+    assert stats.total_seconds <= budget, (
+        f"{golden.name}: render took {stats.total_seconds:.3f}s, "
+        f"budget {budget:.3f}s (recorded {baseline:.3f}s)"
+    )
+
+
+def test_image_difference_tolerates_noise():
+    base = np.full((20, 30, 3), 200, dtype=np.uint8)
+    noisy = base.copy()
+    noisy[0, 0] += 10  # 抗锯齿级别的差异
+    changed = base.copy()
+    changed[:5] = 0
+
+    assert (
+        image_difference(Image.fromarray(noisy), Image.fromarray(base)) == 0.0
+    )
+    assert image_difference(
+        Image.fromarray(changed), Image.fromarray(base)
+    ) == pytest.approx(0.25)
+    assert (
+        image_difference(Image.fromarray(base[:19]), Image.fromarray(base))
+        == 1.0
+    )
@@ -0,0 +1,23 @@
+"""
+Tests for render instrumentation
+"""
+
+import pandas as pd
+
+from dataframe2image import RenderStats, df_to_html
+
+
+def test_df_to_html_reports_stages_and_sizes():
+    stats = RenderStats(trace_memory=True)
+
+    html = df_to_html(
+        pd.DataFrame({"a": [1000, 2000]}), thousand_separator=True, stats=stats
+    )
+
+    assert stats.html_bytes == len(html.encode("utf-8"))
+    assert {"preprocess", "detect_chinese", "render_html"} <= set(stats.stages)
+    assert stats.total_seconds >= sum(stats.stages.values()) * 0.99
+    assert stats.peak_memory_bytes > 0
+    metrics = stats.to_dict()
+    assert metrics["browser_reused"] is False
+    assert "stage.render_html" in metrics
@@ -0,0 +1,86 @@
+"""
+Tests for the thread-safe SyncRenderer facade (with a fake Renderer)
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from dataframe2image import renderer as renderer_module
+from dataframe2image.renderer import SyncRenderer
+
+
+class FakeRenderer:
+    def __init__(self, max_concurrency=4, delay=0.02, **options):
+        self.max_concurrency = max_concurrency
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.threads = set()
+        self.started = self.closed = False
+
+    async def start(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.started = True
+        return self
+
+    async def close(self):
+        self.closed = True
+
+    async def render(self, df, output_path=None, **options):
+        self.threads.add(threading.current_thread().name)
+        self.active += 1
+        try:
+            async with self._semaphore:
+                await asyncio.sleep(self.delay)
+                return f"{len(df)}".encode()
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def fake_renderer(monkeypatch):
+    monkeypatch.setattr(renderer_module, "Renderer", FakeRenderer)
+
+
+def test_threads_share_one_loop_and_get_futures(fake_renderer):
+    with SyncRenderer(max_concurrency=2) as renderer:
+        future = renderer.submit(pd.DataFrame({"a": [1, 2, 3]}))
+        assert isinstance(future, Future)
+        assert future.result(5) == b"3"
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(
+                pool.map(
+                    lambda n: renderer.render(
+                        pd.DataFrame({"a": range(n)}), timeout=5
+                    ),
+                    range(1, 17),
+                )
+            )
+        assert results == [str(n).encode() for n in range(1, 17)]
+        assert renderer.renderer.threads == {"dataframe2image-renderer"}
+    assert renderer.renderer.closed
+
+
+def test_max_pending_blocks_submitters(fake_renderer):
+    renderer = SyncRenderer(max_concurrency=1, max_pending=2)
+    renderer.renderer.delay = 0.2
+    df = pd.DataFrame({"a": [1]})
+    try:
+        renderer.submit(df)
+        renderer.submit(df)
+        start = time.perf_counter()
+        renderer.submit(df).result(5)
+        # 第三个提交必须等到前面有任务完成
+        assert time.perf_counter() - start >= 0.3
+    finally:
+        renderer.close()
+
+
+def test_close_without_start_is_a_no_op(fake_renderer):
+    SyncRenderer().close()
@@ -0,0 +1,208 @@
+"""
+Tests for PDF and SVG export
+"""
+
+import asyncio
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+import pytest
+
+from dataframe2image import df_to_html, df_to_image
+from dataframe2image.vector import (
+    PDF_MIN_PAGE_WIDTH,
+    layout_to_svg,
+    pdf_page_size,
+    print_pdf,
+)
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+NO_BORDER = ["rgb(0, 0, 0)", 0]
+GREY = "rgb(221, 221, 221)"
+# 上、右、下、左；索引列另有 2px 右边框
+HEADER_BORDERS = [NO_BORDER, NO_BORDER, [GREY, 1], NO_BORDER]
+INDEX_BORDERS = [NO_BORDER, [GREY, 2], [GREY, 1], NO_BORDER]
+NO_BORDERS = [NO_BORDER] * 4
+
+LAYOUT = {
+    "width": 200.4,
+    "height": 60,
+    "background": "rgb(255, 255, 255)",
+    "border": ["rgb(221, 221, 221)", 1],
+    "fills": [[0, 0, 200, 30, "rgb(240, 240, 240)"]],
+    "cells": [
+        [
+            0,
+            0,
+            100,
+            30,
+            "name",
+            "rgb(0, 0, 0)",
+            "14px",
+            '"Noto Sans", sans-serif',
+            "700",
+            "left",
+            8,
+            8,
+            INDEX_BORDERS,
+            False,
+        ],
+        [
+            100,
+            0,
+            100,
+            30,
+            "value",
+            "rgb(0, 0, 0)",
+            "14px",
+            '"Noto Sans", sans-serif',
+            "700",
+            "left",
+            8,
+            8,
+            HEADER_BORDERS,
+            False,
+        ],
+        [
+            0,
+            30,
+            100,
+            30,
+            "A & <B>",
+            "rgb(51, 51, 51)",
+            "14px",
+            '"Noto Sans", sans-serif',
+            "400",
+            "left",
+            8,
+            8,
+            NO_BORDERS,
+            False,
+        ],
+        [
+            100,
+            30,
+            100,
+            30,
+            "1,234",
+            "rgb(51, 51, 51)",
+            "14px",
+            '"Noto Sans", sans-serif',
+            "400",
+            "right",
+            8,
+            8,
+            NO_BORDERS,
+            False,
+        ],
+    ],
+}
+
+
+def test_layout_to_svg_is_well_formed_and_compact():
+    root = ET.fromstring(layout_to_svg(LAYOUT))
+    assert root.get("width") == "201" and root.get("viewBox") == "0 0 201 60"
+
+    texts = root.findall(f"{SVG_NS}text")
+    assert [t.text for t in texts] == ["name", "value", "A & <B>", "1,234"]
+    # 相同字体和颜色的文本共享一个 CSS 类
+    assert {t.get("class") for t in texts} == {"t0", "t1"}
+    numeric = texts[3]
+    assert numeric.get("text-anchor") == "end" and numeric.get("x") == "192"
+    lines = root.findall(f"{SVG_NS}line")
+    # 两条表头下边框和索引列的右边框
+    assert len(lines) == 3
+    right = [line for line in lines if line.get("stroke-width") == "2"]
+    assert len(right) == 1
+    assert (right[0].get("x1"), right[0].get("x2")) == ("99", "99")
+    assert (right[0].get("y1"), right[0].get("y2")) == ("0", "30")
+
+
+def test_rounded_container_clips_content():
+    root = ET.fromstring(layout_to_svg(dict(LAYOUT, radius=6)))
+
+    background, border = root.findall(f"{SVG_NS}rect")
+    assert background.get("rx") == "6" and border.get("rx") == "5.5"
+    frame = root.find(f"{SVG_NS}defs/{SVG_NS}clipPath")
+    assert frame.get("id") == "frame"
+    group = root.find(f"{SVG_NS}g")
+    assert group.get("clip-path") == "url(#frame)"
+    assert len(group.findall(f"{SVG_NS}text")) == 4
+    assert "rx" not in layout_to_svg(LAYOUT)
+
+
+def test_overflowing_text_is_clipped_to_its_cell():
+    long_cell = [
+        0,
+        30,
+        100,
+        30,
+        "a very long label " * 5,
+        "rgb(51, 51, 51)",
+        "14px",
+        "sans-serif",
+        "400",
+        "right",
+        8,
+        8,
+        NO_BORDERS,
+        True,
+    ]
+    root = ET.fromstring(
+        layout_to_svg(dict(LAYOUT, cells=LAYOUT["cells"] + [long_cell]))
+    )
+
+    clips = root.findall(f"{SVG_NS}defs/{SVG_NS}clipPath")
+    assert len(clips) == 1
+    rect = clips[0].find(f"{SVG_NS}rect")
+    assert (rect.get("x"), rect.get("width")) == ("8", "84")
+    clipped = [t for t in root.findall(f"{SVG_NS}text") if t.get("clip-path")]
+    assert (
+        len(clipped) == 1
+        and clipped[0].get("clip-path") == f"url(#{clips[0].get('id')})"
+    )
+    assert (
+        clipped[0].get("text-anchor") == "start" and clipped[0].get("x") == "8"
+    )
+    # 未溢出的单元格不生成 clipPath
+    assert layout_to_svg(LAYOUT).count("clipPath") == 0
+
+
+def test_pdf_page_size_follows_table_width():
+    assert pdf_page_size(300)[0] == PDF_MIN_PAGE_WIDTH
+    width, height = pdf_page_size(2000.5)
+    assert width == 2001 and height > width
+
+
+def test_print_pdf_options(tmp_path):
+    class FakePage:
+        async def evaluate(self, script):
+            return 1500
+
+        async def pdf(self, **options):
+            self.options = options
+            return b"%PDF"
+
+    page = FakePage()
+    assert asyncio.run(print_pdf(page, tmp_path / "t.pdf")) == b"%PDF"
+    assert (
+        page.options["width"] == "1500px" and page.options["print_background"]
+    )
+    assert page.options["path"].endswith("t.pdf")
+
+
+def test_vector_formats_reject_derived_outputs(tmp_path):
+    df = pd.DataFrame({"a": [1]})
+    with pytest.raises(ValueError, match="outputs"):
+        df_to_image(
+            df,
+            tmp_path / "t.pdf",
+            format="pdf",
+            outputs=[{"path": tmp_path / "t.png"}],
+        )
+
+
+def test_template_repeats_header_when_printed():
+    html = df_to_html(pd.DataFrame({"a": [1]}))
+    assert "@media print" in html and "table-header-group" in html
@@ -0,0 +1,45 @@
+"""
+Tests for the measured viewport used before capture
+"""
+
+import asyncio
+
+from dataframe2image.core import MAX_VIEWPORT_HEIGHT, _fit_viewport
+
+
+class FakePage:
+    """Minimal stand-in for a Playwright page that reports a content size."""
+
+    def __init__(self, content_size, viewport=None):
+        self.content_size = content_size
+        self.viewport_size = viewport or {"width": 1200, "height": 1200}
+        self.resizes = []
+
+    async def evaluate(self, script):
+        return list(self.content_size)
+
+    async def set_viewport_size(self, size):
+        self.resizes.append(size)
+        self.viewport_size = size
+
+
+def test_wide_and_tall_tables_get_a_fitting_viewport():
+    page = FakePage((2500, 3000))
+
+    assert asyncio.run(_fit_viewport(page)) == (2500, 3000)
+    assert page.resizes == [{"width": 2500, "height": 3000}]
+
+
+def test_small_tables_keep_default_width_and_explicit_size_wins():
+    page = FakePage((300, 200))
+    assert asyncio.run(_fit_viewport(page)) == (1200, 200)
+
+    page = FakePage((300, 200), viewport={"width": 640, "height": 480})
+    assert asyncio.run(_fit_viewport(page, 640, 480)) == (640, 480)
+    assert page.resizes == []
+
+
+def test_viewport_height_is_capped():
+    page = FakePage((800, 10 * MAX_VIEWPORT_HEIGHT))
+
+    assert asyncio.run(_fit_viewport(page))[1] == MAX_VIEWPORT_HEIGHT
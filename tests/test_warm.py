@@ -0,0 +1,117 @@
+"""
+Tests for the warm page pool (with a fake browser)
+"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from dataframe2image import RenderStats, df_to_html
+from dataframe2image import warm as warm_module
+from dataframe2image.warm import WarmPagePool, split_page, style_shells
+
+
+class FakePage:
+    def __init__(self):
+        self.content = None
+        self.body = None
+        self.closed = False
+
+    async def set_content(self, html):
+        self.content = html
+
+    async def set_viewport_size(self, size):
+        pass
+
+    async def evaluate(self, script, arg=None):
+        if arg is not None:
+            self.body = arg
+        elif "innerHTML = ''" in script:
+            self.body = ""
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self, device_scale_factor=1.0):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    bodies = []
+
+    async def capture(page, output_path, width, height, format, stats):
+        bodies.append(page.body)
+        await asyncio.sleep(0)
+        return b"png"
+
+    monkeypatch.setattr(warm_module, "_capture_loaded_page", capture)
+    return bodies
+
+
+DF = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+
+
+def test_rendered_pages_match_style_shells():
+    for theme in ("light", "blue"):
+        shell, body = split_page(df_to_html(DF, style=theme))
+        assert shell in style_shells(theme)
+        assert "<table>" in body and "<style>" not in body
+
+
+def test_warm_pages_are_reused(captured):
+    browser = FakeBrowser()
+    html = df_to_html(DF, style="dark")
+
+    async def scenario():
+        pool = WarmPagePool(browser)
+        await pool.warm(["dark", "light"])
+        warmed = len(browser.pages)
+        stats = RenderStats()
+        for _ in range(3):
+            assert await pool.capture(html, None, stats=stats) == b"png"
+        return pool, warmed, stats
+
+    pool, warmed, stats = asyncio.run(scenario())
+    assert warmed == len(browser.pages) == pool.created
+    assert pool.reused == 3 and stats.page_reused
+    assert captured == [split_page(html)[1]] * 3
+    # 归还后页面被清空，等待下一次渲染
+    assert all(page.body in (None, "") for page in browser.pages)
+
+
+def test_unknown_shell_creates_page_on_demand(captured):
+    browser = FakeBrowser()
+    html = df_to_html(DF, style="green")
+
+    async def scenario():
+        pool = WarmPagePool(browser, max_idle=1)
+        await asyncio.gather(
+            pool.capture(html, None), pool.capture(html, None)
+        )
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert pool.created == 2 and pool.idle_pages == 1
+    assert sum(page.closed for page in browser.pages) == 1
+
+
+def test_accepts():
+    pool = WarmPagePool(FakeBrowser(), device_scale_factor=2.0)
+
+    assert pool.accepts("<html>", 2.0)
+    assert not pool.accepts("<html>", 1.0)
+    assert not pool.accepts("x" * warm_module.FILE_NAVIGATION_THRESHOLD, 2.0)
+
+
+def test_split_page_requires_body():
+    with pytest.raises(ValueError):
+        split_page("<div></div>")